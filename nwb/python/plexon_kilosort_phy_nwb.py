@@ -23,7 +23,8 @@ def run(
     phy_dir: Path,
     nwb_out_file: Path,
     session_description: str = "",
-    time_zone_name: str = "US/Eastern"
+    time_zone_name: str = "US/Eastern",
+    cache_plx_header: bool = False
 ):
     """Write a new NWB file, combining data and config from several sources."""
 
@@ -37,7 +38,8 @@ def run(
     # This is an expensive call.
     # It takes 1-10 minutes to parse and index the Plexon file block headers.
     # We try to do this once and reuse the same reader and its internal IO object as needed, below.
-    plexon_reader = PlexonReader(plx_file=plx_file)
+    # With cache_plx_header, later runs can load the parsed headers from a cache file next to the .plx file.
+    plexon_reader = PlexonReader(plx_file=plx_file, cache_header=cache_plx_header)
     session_start_time = plexon_reader.get_recording_datetime(zone_name=time_zone_name)
     session_id = Path(plx_file).stem
     print(f"Session {session_id} from {session_start_time}")
@@ -151,6 +153,9 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
                         type=str,
                         help="time zone to add to dates that are parsed from strings, if needed",
                         default="US/Eastern")
+    parser.add_argument("--cache-plx-header",
+                        action="store_true",
+                        help="save parsed .plx block headers next to the .plx file, and reuse them on later runs")
 
     cli_args = parser.parse_args(argv)
 
@@ -234,7 +239,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             phy_dir,
             nwb_out_file,
             session_description=cli_args.session_description,
-            time_zone_name=cli_args.time_zone_name
+            time_zone_name=cli_args.time_zone_name,
+            cache_plx_header=cli_args.cache_plx_header
         )
         return 0
     except Exception:
@@ -1,9 +1,12 @@
 from typing import Any
 from datetime import datetime
+from pathlib import Path
+import pickle
 from dateutil import tz
 
 import numpy as np
 
+import neo
 from neo.rawio import PlexonRawIO
 
 
@@ -13,14 +16,79 @@ class PlexonReader():
     Header parsing is actually pretty slow, something like 1-10 minutes for Gold Lab sessions.
     This is because .plx files have millions of small data blocks written out in unsorted order.
     Parsing all the block headers is worth the time because then we can seek to the block we want.
+
+    With cache_header, the parsed headers and block index get saved to a cache file next to the .plx file,
+    or in cache_dir, and later runs load that instead of parsing again.  The cache file is only used when the
+    .plx file size and modification time, and the neo version, are the same as when it was saved.
     """
 
-    def __init__(self, plx_file):
+    cache_file_suffix = ".neo-header"
+
+    def __init__(self, plx_file, cache_header: bool = False, cache_dir: str = None):
         self.plexon_raw_io = PlexonRawIO(filename=plx_file)
+
+        if cache_header:
+            plx_path = Path(plx_file)
+            if cache_dir is None:
+                cache_file = Path(plx_path.parent, plx_path.name + self.cache_file_suffix)
+            else:
+                cache_file = Path(cache_dir, plx_path.name + self.cache_file_suffix)
+            if self.load_header(cache_file):
+                print(f"Loaded Plexon block headers from {cache_file}")
+                return
+
         print(f"Start reading Plexon block headers: {datetime.now()}")
         self.plexon_raw_io.parse_header()
         print(f"Finished reading Plexon block headers: {datetime.now()}")
 
+        if cache_header:
+            self.save_header(cache_file)
+            print(f"Saved Plexon block headers to {cache_file}")
+
+    def get_cache_key(self) -> dict[str, Any]:
+        """Describe the .plx file and neo version so we can tell if a cache file still goes with them."""
+        plx_stat = Path(self.plexon_raw_io.filename).stat()
+        return {
+            "neo_version": neo.__version__,
+            "size": plx_stat.st_size,
+            "mtime_ns": plx_stat.st_mtime_ns,
+        }
+
+    def save_header(self, cache_file: Path):
+        """Save the parsed state of the neo PlexonRawIO, except for memory maps of the .plx file itself."""
+        state = {}
+        memmaps = {}
+        for name, value in vars(self.plexon_raw_io).items():
+            if isinstance(value, np.memmap):
+                memmaps[name] = (value.dtype.str, value.offset, value.shape)
+            else:
+                state[name] = value
+
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump({"key": self.get_cache_key(), "state": state, "memmaps": memmaps}, f)
+
+    def load_header(self, cache_file: Path) -> bool:
+        """Restore the parsed state of the neo PlexonRawIO from a cache file, if it's still valid."""
+        if not cache_file.exists():
+            return False
+
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception as error:
+            print(f"Ignoring unreadable Plexon header cache {cache_file}: {error}")
+            return False
+
+        if cached["key"] != self.get_cache_key():
+            return False
+
+        vars(self.plexon_raw_io).update(cached["state"])
+        for name, (dtype, offset, shape) in cached["memmaps"].items():
+            memmap = np.memmap(self.plexon_raw_io.filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+            setattr(self.plexon_raw_io, name, memmap)
+        return True
+
     def get_recording_datetime(self, zone_name: str = "US/Eastern") -> datetime:
         if hasattr(self.plexon_raw_io, "raw_annotations"):
             neo_metadata = self.plexon_raw_io.raw_annotations["blocks"][0]
@@ -0,0 +1,82 @@
+"""Micro-benchmark for receiving and decoding Open Ephys ZMQ messages.
+
+This uses the OpenEphysZmqServer test stand-in to send continuous data, ttl events, or spikes,
+and times how long the OpenEphysZmqClient takes to receive and decode them, as messages/second.
+Sending time is not included.
+
+python zmq_benchmark.py --kind continuous --message-count 100000 --samples-per-message 640
+"""
+
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+from pyramid.neutral_zone.readers.open_ephys_zmq import OpenEphysZmqServer, OpenEphysZmqClient
+
+
+def send_message(server: OpenEphysZmqServer, kind: str, index: int, samples_per_message: int, data: np.ndarray):
+    if kind == "continuous":
+        server.send_continuous_data(data, "benchmark", index % 64, index * samples_per_message, 40000)
+    elif kind == "event":
+        server.send_ttl_event(index % 8, index % 2, index, "benchmark", 42, index)
+    elif kind == "spike":
+        server.send_spike(data.reshape([4, -1]), "benchmark", 42, "electrode", index, index % 4, [1, 1, 1, 1])
+
+
+def run_benchmark(
+    kind: str = "continuous",
+    message_count: int = 100000,
+    batch_size: int = 100,
+    samples_per_message: int = 640,
+    host: str = "127.0.0.1",
+    data_port: int = 10101
+) -> float:
+    """Send and receive messages in batches, smaller than ZMQ's default high water mark, and return messages/second."""
+    data = np.random.rand(samples_per_message).astype(np.float32)
+    with OpenEphysZmqServer(host, data_port) as server:
+        with OpenEphysZmqClient(host, data_port, timeout_ms=100) as client:
+            # Wait for the subscription to connect, so that messages don't get dropped.
+            received = {}
+            while not received:
+                send_message(server, kind, 0, samples_per_message, data)
+                received = client.poll_and_receive_data()
+
+            receive_count = 0
+            receive_seconds = 0.0
+            while receive_count < message_count:
+                for index in range(batch_size):
+                    send_message(server, kind, index, samples_per_message, data)
+
+                start_time = time.perf_counter()
+                for index in range(batch_size):
+                    if client.poll_and_receive_data():
+                        receive_count += 1
+                receive_seconds += time.perf_counter() - start_time
+
+    return receive_count / receive_seconds
+
+
+def main(argv: list[str] = None) -> int:
+    parser = ArgumentParser(description="Benchmark receiving Open Ephys ZMQ messages.")
+    parser.add_argument("--kind", "-k", type=str, default="continuous", choices=["continuous", "event", "spike"])
+    parser.add_argument("--message-count", "-n", type=int, default=100000)
+    parser.add_argument("--batch-size", "-b", type=int, default=100)
+    parser.add_argument("--samples-per-message", "-s", type=int, default=640)
+    parser.add_argument("--data-port", "-p", type=int, default=10101)
+    cli_args = parser.parse_args(argv)
+
+    messages_per_second = run_benchmark(
+        cli_args.kind,
+        cli_args.message_count,
+        cli_args.batch_size,
+        cli_args.samples_per_message,
+        data_port=cli_args.data_port
+    )
+    print(f"Received {cli_args.kind} messages at {messages_per_second:.0f} messages/second.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
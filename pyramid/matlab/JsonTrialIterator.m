@@ -30,6 +30,63 @@ classdef JsonTrialIterator < handle
                 return
             end
             trial = jsondecode(trialJson);
+
+            % Lines with base64 array encoding hold arrays as structs with dtype, shape, and data.
+            if isfield(trial, 'array_encoding') && strcmp(trial.array_encoding, 'base64')
+                if isfield(trial, 'numeric_events')
+                    for name = fieldnames(trial.numeric_events)'
+                        trial.numeric_events.(name{1}) = decodeArray(trial.numeric_events.(name{1}));
+                    end
+                end
+                if isfield(trial, 'signals')
+                    for name = fieldnames(trial.signals)'
+                        trial.signals.(name{1}).signal_data = decodeArray(trial.signals.(name{1}).signal_data);
+                    end
+                end
+                trial = rmfield(trial, 'array_encoding');
+            end
         end
     end
 end
+
+function array = decodeArray(encoded)
+% Decode a base64, little-endian, row-major array to a double matrix, like jsondecode gives for text arrays.
+shape = encoded.shape(:)';
+if any(shape == 0)
+    array = [];
+    return
+end
+
+switch encoded.dtype(2:end)
+    case 'f8'
+        matlabType = 'double';
+    case 'f4'
+        matlabType = 'single';
+    case 'i8'
+        matlabType = 'int64';
+    case 'i4'
+        matlabType = 'int32';
+    case 'i2'
+        matlabType = 'int16';
+    case 'i1'
+        matlabType = 'int8';
+    case 'u8'
+        matlabType = 'uint64';
+    case 'u4'
+        matlabType = 'uint32';
+    case 'u2'
+        matlabType = 'uint16';
+    case 'u1'
+        matlabType = 'uint8';
+    otherwise
+        error("Unsupported base64 array dtype %s.", encoded.dtype);
+end
+
+values = double(typecast(matlab.net.base64decode(encoded.data), matlabType));
+if isscalar(shape)
+    array = values(:);
+else
+    % Rows are contiguous in the encoded data, so fill in transposed and transpose back.
+    array = reshape(values, fliplr(shape))';
+end
+end
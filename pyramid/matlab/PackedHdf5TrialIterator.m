@@ -0,0 +1,183 @@
+classdef PackedHdf5TrialIterator < handle
+    % Read a Pyramid "packed" HDF5 trial file, one trial at a time.
+    %
+    % The packed layout has per-trial columns for trial times and
+    % enhancements, plus one concatenated dataset per buffer with per-trial
+    % offsets and counts.  This reads the per-trial columns up front, then
+    % reads just the rows for each trial from the concatenated datasets.
+
+    properties (SetAccess = private)
+        % The HDF5 file to read from incrementally.
+        trialFile
+
+        % Per-trial columns for trial times and enhancement categories.
+        columns
+
+        % Struct arrays with per-trial offsets and counts for each buffer.
+        numericEvents
+        signals
+
+        % Struct array with per-trial values and presence for each enhancement.
+        enhancements
+
+        % Current trial index, representing iteration state.
+        index = 0
+    end
+
+    methods
+
+        function obj = PackedHdf5TrialIterator(trialFile)
+            % Set up to read packed HDF5 columns as trials.
+            arguments
+                trialFile {mustBeFile}
+            end
+            obj.trialFile = trialFile;
+
+            obj.columns.start_time = obj.readColumn('/trials/start_time');
+            obj.columns.end_time = obj.readColumn('/trials/end_time');
+            obj.columns.wrt_time = obj.readColumn('/trials/wrt_time');
+            obj.columns.enhancement_categories = string(obj.readColumn('/trials/enhancement_categories'));
+
+            obj.numericEvents = obj.readBufferIndexes('/numeric_events');
+            obj.signals = obj.readBufferIndexes('/signals');
+
+            obj.enhancements = struct('name', {}, 'values', {}, 'present', {});
+            info = h5info(trialFile, '/enhancements');
+            for group = info.Groups'
+                name = group.Name(numel('/enhancements')+2:end);
+                values = obj.readColumn([group.Name '/values']);
+                if iscell(values) || isstring(values)
+                    values = string(values);
+                end
+
+                % HDF5 bool columns from h5py are enums, which Matlab reads as 'FALSE' and 'TRUE' names.
+                present = obj.readColumn([group.Name '/present']);
+                if iscell(present) || isstring(present)
+                    present = strcmp(present, 'TRUE');
+                end
+                obj.enhancements(end + 1) = struct('name', name, 'values', values, 'present', logical(present));
+            end
+        end
+
+        function trial = next(obj)
+            % Read one trial from the next row of the packed columns.
+            obj.index = obj.index + 1;
+            if obj.index > numel(obj.columns.start_time)
+                % Empty result signals end of trials.
+                trial = [];
+                return
+            end
+
+            ii = obj.index;
+            trial = struct();
+            trial.start_time = obj.columns.start_time(ii);
+            trial.end_time = nanToEmpty(obj.columns.end_time(ii));
+            trial.wrt_time = obj.columns.wrt_time(ii);
+
+            % Count -1 means the trial doesn't have the named buffer.
+            for buffer = obj.numericEvents
+                if buffer.counts(ii) >= 0
+                    trial.numeric_events.(buffer.name) = obj.readRows(buffer, ii);
+                end
+            end
+
+            for buffer = obj.signals
+                if buffer.counts(ii) >= 0
+                    trial.signals.(buffer.name).signal_data = obj.readRows(buffer, ii);
+                    trial.signals.(buffer.name).sample_frequency = nanToEmpty(buffer.sample_frequency(ii));
+                    trial.signals.(buffer.name).first_sample_time = nanToEmpty(buffer.first_sample_time(ii));
+                    trial.signals.(buffer.name).channel_ids = buffer.channel_ids;
+                end
+            end
+
+            % Enhancements are typed numbers or JSON, with a separate presence column.
+            for enhancement = obj.enhancements
+                if ~enhancement.present(ii)
+                    continue
+                end
+                value = enhancement.values(ii);
+                if isstring(value)
+                    trial.enhancements.(enhancement.name) = jsondecode(char(value));
+                else
+                    trial.enhancements.(enhancement.name) = value;
+                end
+            end
+
+            categories = obj.columns.enhancement_categories(ii);
+            if strlength(categories) > 0
+                trial.enhancement_categories = jsondecode(char(categories));
+            end
+        end
+    end
+
+    methods (Access = private)
+
+        function values = readColumn(obj, dataPath)
+            % Read a whole dataset, or [] when it's empty.
+            info = h5info(obj.trialFile, dataPath);
+            if any(info.Dataspace.Size == 0)
+                values = [];
+            else
+                values = h5read(obj.trialFile, dataPath);
+            end
+        end
+
+        function indexes = readBufferIndexes(obj, groupPath)
+            % Read per-trial offsets and counts for each buffer in a group.
+            indexes = struct( ...
+                'name', {}, ...
+                'path', {}, ...
+                'width', {}, ...
+                'offsets', {}, ...
+                'counts', {}, ...
+                'sample_frequency', {}, ...
+                'first_sample_time', {}, ...
+                'channel_ids', {});
+            info = h5info(obj.trialFile, groupPath);
+            for group = info.Groups'
+                buffer.name = group.Name(numel(groupPath)+2:end);
+                buffer.path = group.Name;
+                dataInfo = h5info(obj.trialFile, [group.Name '/data']);
+                buffer.width = dataInfo.Dataspace.Size(1);
+                buffer.offsets = double(obj.readColumn([group.Name '/offsets']));
+                buffer.counts = double(obj.readColumn([group.Name '/counts']));
+
+                % Signals also have per-trial sample info and shared channel ids.
+                buffer.sample_frequency = [];
+                buffer.first_sample_time = [];
+                buffer.channel_ids = [];
+                if any(strcmp({group.Datasets.Name}, 'sample_frequency'))
+                    buffer.sample_frequency = obj.readColumn([group.Name '/sample_frequency']);
+                    buffer.first_sample_time = obj.readColumn([group.Name '/first_sample_time']);
+                end
+                for attribute = group.Attributes'
+                    if strcmp(attribute.Name, 'channel_ids')
+                        buffer.channel_ids = attribute.Value;
+                    end
+                end
+
+                indexes(end + 1) = buffer; %#ok<AGROW>
+            end
+        end
+
+        function data = readRows(obj, buffer, trialIndex)
+            % Read one trial's rows from a buffer's concatenated data.
+            count = buffer.counts(trialIndex);
+            if count < 1
+                data = [];
+                return
+            end
+
+            % HDF5 dimensions appear reversed in Matlab, with one column per row.
+            start = [1, buffer.offsets(trialIndex) + 1];
+            data = double(h5read(obj.trialFile, [buffer.path '/data'], start, [buffer.width, count])');
+        end
+    end
+end
+
+function value = nanToEmpty(value)
+% Pyramid writes NaN for missing values like a trial's end_time.
+if isnan(value)
+    value = [];
+end
+end
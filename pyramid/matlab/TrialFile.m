@@ -31,7 +31,11 @@ classdef TrialFile
             [~, ~, extension] = fileparts(obj.trialFile);
             switch extension
                 case {".hdf", ".h5", ".hdf5", ".he5"}
-                    iterator = Hdf5TrialIterator(obj.trialFile);
+                    if obj.isPackedHdf5()
+                        iterator = PackedHdf5TrialIterator(obj.trialFile);
+                    else
+                        iterator = Hdf5TrialIterator(obj.trialFile);
+                    end
                 case {".json", ".jsonl"}
                     iterator = JsonTrialIterator(obj.trialFile);
                 otherwise
@@ -39,6 +43,17 @@ classdef TrialFile
             end
         end
 
+        function isPacked = isPackedHdf5(obj)
+            % Check for the format attribute of a "packed" HDF5 trial file.
+            info = h5info(obj.trialFile, '/');
+            isPacked = false;
+            for attribute = info.Attributes'
+                if strcmp(attribute.Name, 'format')
+                    isPacked = strcmp(string(attribute.Value), "packed");
+                end
+            end
+        end
+
         function trials = read(obj, filterFun)
             % Read trials into a Matlab struct array, one at a time.
             %
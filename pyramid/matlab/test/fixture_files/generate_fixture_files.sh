@@ -16,8 +16,11 @@ hatch run test:cov -k test_trial_file
 tmp_dir=/tmp/pytest-of-$(whoami)/pytest-current
 cp $tmp_dir/test_hdf5_empty_trial_filecurrent/trial_file.hdf5 ./empty_trials.hdf5
 cp $tmp_dir/test_hdf5_sample_trialscurrent/trial_file.hdf5 ./sample_trials.hdf5
+cp $tmp_dir/test_packed_hdf5_empty_trial_filecurrent/trial_file.packed.hdf5 ./empty_trials.packed.hdf5
+cp $tmp_dir/test_packed_hdf5_sample_trialscurrent/trial_file.packed.hdf5 ./sample_trials.packed.hdf5
 cp $tmp_dir/test_json_empty_trial_filecurrent/trial_file.json ./empty_trials.json
 cp $tmp_dir/test_json_sample_trialscurrent/trial_file.json ./sample_trials.json
+cp $tmp_dir/test_json_base64_sample_trialscurrent/trial_file.json ./sample_trials.base64.json
 
 # We can commit these results to the repo in this folder, to support automated Matlab testing.
 # We can regenerate and update these files as needed, when the Python trial file code changes.
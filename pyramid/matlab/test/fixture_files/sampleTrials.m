@@ -2,8 +2,9 @@
 % This is used as a fixture to support testing Matlab TrialFiles.
 %
 % This file was created manually, to match the contents of
-% sample_trials.json and sample_trials.hdf5.  See also
-% generate_fixture_files.sh for where those originals came from.
+% sample_trials.json, sample_trials.base64.json, sample_trials.hdf5, and
+% sample_trials.packed.hdf5.  See also generate_fixture_files.sh for where
+% those originals came from.
 function trials = sampleTrials()
 
 % Numeric event data, reused in different trials.
@@ -31,3 +31,11 @@ assert(isequal(class(trialFile.openIterator()), 'JsonTrialIterator'));
 expectedTrials = sampleTrials();
 filterFun = @(trial) ~isempty(trial.enhancements);
 assert(isequal(trialFile.read(filterFun), expectedTrials(4:5)), 'Sample trial file should produce expected trials with filter.');
+
+
+%% Sample Trial File with base64 arrays
+sampleTrialFile = 'fixture_files/sample_trials.base64.json';
+trialFile = TrialFile(sampleTrialFile);
+assert(isequal(class(trialFile.openIterator()), 'JsonTrialIterator'));
+expectedTrials = sampleTrials();
+assert(isequal(trialFile.read(), expectedTrials), 'Sample trial file with base64 arrays should produce expected trials.');
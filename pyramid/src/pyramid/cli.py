@@ -55,6 +55,10 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
                         nargs="+",
                         default=["~/pyramid"],
                         help="List of paths to search for files (YAML config, data, etc.)")
+    parser.add_argument("--workers", "-w",
+                        type=int,
+                        default=1,
+                        help="Number of worker processes to use in convert mode, for offline data files")
     parser.add_argument("--version", "-v",
                         action="version",
                         version=version_string)
@@ -88,7 +92,10 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
                     reader_overrides=cli_args.readers,
                     search_path=cli_args.search_path
                 )
-                context.run_without_plots(cli_args.trial_file)
+                if cli_args.workers > 1:
+                    context.run_without_plots_in_parallel(cli_args.trial_file, cli_args.workers)
+                else:
+                    context.run_without_plots(cli_args.trial_file)
                 exit_code = 0
             except Exception:
                 logging.error(f"Error running conversion:", exc_info=True)
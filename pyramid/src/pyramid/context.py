@@ -2,15 +2,19 @@ from typing import Any, Self
 from pathlib import Path
 import time
 import logging
+import asyncio
 from contextlib import ExitStack
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 import yaml
 import graphviz
 
 from pyramid.file_finder import FileFinder
 from pyramid.model.model import Buffer
+from pyramid.model.signals import SignalChunk
 from pyramid.neutral_zone.readers.readers import Reader, ReaderRoute, ReaderRouter, Transformer, ReaderSyncConfig, ReaderSyncRegistry
 from pyramid.neutral_zone.readers.delay_simulator import DelaySimulatorReader
+from pyramid.neutral_zone.readers.prefetch import PrefetchReader
 from pyramid.trials.trials import TrialDelimiter, TrialExtractor, TrialEnhancer, TrialExpression
 from pyramid.trials.trial_file import TrialFile
 from pyramid.plotters.plotters import Plotter, PlotFigureController
@@ -30,6 +34,9 @@ class PyramidContext():
     sync_registry: ReaderSyncRegistry
     plot_figure_controller: PlotFigureController
     file_finder: FileFinder
+    experiment_config: dict[str, Any] = field(default=None, compare=False)
+    subject_config: dict[str, Any] = field(default=None, compare=False)
+    plot_latencies: list[float] = field(default_factory=list, compare=False)
 
     @classmethod
     def from_yaml_and_reader_overrides(
@@ -124,15 +131,28 @@ class PyramidContext():
             trial_extractor=trial_extractor,
             sync_registry=reader_sync_registry,
             plot_figure_controller=plot_figure_controller,
-            file_finder=file_finder
+            file_finder=file_finder,
+            experiment_config=experiment_config,
+            subject_config=subject_config
         )
 
-    def run_without_plots(self, trial_file: str) -> None:
+    def run_without_plots(
+        self,
+        trial_file: str,
+        write_from: int = 0,
+        stop_after: int = None,
+        seek_time: float = None
+    ) -> None:
         """Run without plots as fast as the data allow.
 
         Similar to run_with_plots(), below.
         It seemed nicer to have separate code paths, as opposed to lots of conditionals in one uber-function.
         run_without_plots() should run without touching any GUI code, avoiding potential host graphics config issues.
+
+        By default this writes all trials to the trial_file.
+        Pass write_from and/or stop_after to populate all the trials but only write trials numbered in
+        [write_from, stop_after] -- this is how run_without_plots_in_parallel() converts one partition of a session.
+        Pass seek_time to have all readers skip data before that time, instead of reading from the beginning.
         """
         with ExitStack() as stack:
             # All these "context managers" will clean up automatically when the "with" exits.
@@ -140,6 +160,10 @@ class PyramidContext():
             for reader in self.readers.values():
                 stack.enter_context(reader)
 
+            if seek_time is not None:
+                for router in self.routers.values():
+                    router.seek(seek_time)
+
             # Extract trials indefinitely, as they come.
             while self.start_router.still_going():
                 got_start_data = self.start_router.route_next()
@@ -155,10 +179,15 @@ class PyramidContext():
                             router.update_drift_estimate(new_trial.end_time)
 
                         self.trial_extractor.populate_trial(new_trial, trial_number, self.experiment, self.subject)
-                        writer.append_trial(new_trial)
+                        if trial_number >= write_from:
+                            writer.append_trial(new_trial)
                         self.trial_delimiter.discard_before(new_trial.start_time)
                         self.trial_extractor.discard_before(new_trial.start_time)
 
+                        if stop_after is not None and trial_number >= stop_after:
+                            self.log_router_copies()
+                            return
+
             # Make a best effort to catch the last trial -- which would have no "next trial" to delimit it.
             for router in self.routers.values():
                 router.route_next()
@@ -170,13 +199,146 @@ class PyramidContext():
                 self.trial_extractor.populate_trial(last_trial, last_trial_number, self.experiment, self.subject)
                 writer.append_trial(last_trial)
 
-    def run_with_plots(self, trial_file: str, plot_update_period: float = 0.025) -> None:
+            self.log_router_copies()
+
+    def delimit_trials(self) -> list[float]:
+        """Read through the start reader only and return the raw start time of each trial, including the last trial.
+
+        This is a relatively fast first pass over a session, which only reads the start reader and doesn't
+        populate trials.  It lets run_without_plots_in_parallel() partition the session into trial ranges.
+        """
+        start_buffer = self.trial_delimiter.start_buffer
+        raw_start_times = [self.trial_delimiter.start_time]
+        with self.start_router.reader:
+            while self.start_router.still_going():
+                got_start_data = self.start_router.route_next()
+                if got_start_data:
+                    new_trials = self.trial_delimiter.next()
+                    for new_trial in new_trials.values():
+                        # Each trial ends where the next one starts.
+                        raw_start_times.append(start_buffer.reference_time_to_raw(new_trial.end_time))
+                        self.trial_delimiter.discard_before(new_trial.start_time)
+        return raw_start_times
+
+    def run_without_plots_in_parallel(self, trial_file: str, workers: int, overlap_trials: int = 1) -> None:
+        """Run without plots, like run_without_plots(), using multiple processes for separate parts of a session.
+
+        This only works for offline data, like files, which can be read through more than once.
+        It takes a first pass through the start reader to find trial start times, then splits the trials into
+        contiguous ranges, one per worker process.  Each worker sets up its own readers, extractor, etc. from
+        the same experiment and subject config and writes the trials for its range to a separate trial file.
+        Finally, this merges the workers' trial files, in order, into the given trial_file.
+
+        Each worker starts delimiting trials overlap_trials before its range.  It populates these overlap trials
+        without writing them, so that state like reader clock drift estimates can catch up to what it would be
+        in a single, serial run.  The merged trial_file should then be the same as from run_without_plots().
+        Workers have their readers seek() to the start of their first overlap trial, to avoid reading and buffering
+        data from earlier in the session.  Readers that need an index to seek, like .plx files, prepare it once
+        here, with get_seek_index(), and share it with the workers.
+
+        Since workers start without any clock drift estimates, merged trials only match a serial run when the
+        overlap trials contain sync events for each reader with a sync config, and when clock drift is smaller than
+        the overlap trials.  When sync events are sparse, choose overlap_trials to span at least one sync event.
+
+        Partition trial files are named after the trial_file, with a part tag before the format suffixes,
+        like "trials.part0.json" or "trials.part0.packed.hdf5".
+        """
+        if self.experiment_config is None:
+            raise ValueError("Parallel conversion needs a context created from experiment config, eg from_dict().")
+
+        first_pass = PyramidContext.from_dict(self.experiment_config, self.subject_config, file_finder=self.file_finder)
+        raw_start_times = first_pass.delimit_trials()
+        trial_count = len(raw_start_times)
+        logging.info(f"Converting {trial_count} trials with {workers} workers.")
+
+        seek_indexes = {}
+        for reader_name, reader in first_pass.readers.items():
+            if reader.can_seek():
+                seek_index = reader.get_seek_index()
+                if seek_index is not None:
+                    seek_indexes[reader_name] = seek_index
+
+        trial_path = Path(self.file_finder.find(trial_file))
+        partition_stem = trial_path.stem
+        partition_suffix = trial_path.suffix
+        if Path(partition_stem).suffix.lower() == ".packed":
+            # Keep ".packed" next to the file suffix, so partitions use the same trial file format.
+            partition_suffix = Path(partition_stem).suffix + partition_suffix
+            partition_stem = Path(partition_stem).stem
+
+        partition_files = []
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = []
+                partition_size = -(-trial_count // workers)
+                for write_from in range(0, trial_count, partition_size):
+                    write_until = min(write_from + partition_size, trial_count)
+                    if write_until < trial_count:
+                        stop_after = write_until - 1
+                    else:
+                        # The last partition runs to the end and includes the last trial.
+                        stop_after = None
+                    first_trial = max(0, write_from - overlap_trials)
+                    partition_name = f"{partition_stem}.part{len(partition_files)}{partition_suffix}"
+                    partition_file = trial_path.with_name(partition_name)
+                    partition_files.append(partition_file.as_posix())
+                    future = executor.submit(
+                        convert_partition,
+                        self.experiment_config,
+                        self.subject_config,
+                        self.file_finder,
+                        partition_file.as_posix(),
+                        raw_start_times[first_trial],
+                        first_trial,
+                        write_from,
+                        stop_after,
+                        seek_indexes
+                    )
+                    futures.append(future)
+
+                # Raise any worker errors here.
+                for future in futures:
+                    future.result()
+
+            with TrialFile.for_file_suffix(trial_path.as_posix()) as writer:
+                for partition_file in partition_files:
+                    partition = TrialFile.for_file_suffix(partition_file)
+                    for trial in partition.read_trials():
+                        writer.append_trial(trial)
+        finally:
+            # Clean up partitions whether or not all the workers succeeded.
+            for partition_file in partition_files:
+                TrialFile.for_file_suffix(partition_file).delete()
+
+    def run_with_plots(
+        self,
+        trial_file: str,
+        plot_update_period: float = 0.025
+    ) -> None:
         """Run with plots and interactive GUI updates.
 
         Similar to run_without_plots(), above.
         It seemed nicer to have separate code paths, as opposed to lots of conditionals in one uber-function.
         run_without_plots() should run without touching any GUI code, avoiding potential host graphics config issues.
+
+        This runs an asyncio event loop, instead of polling readers and the GUI in turn.
+        Readers deliver data as awaitables, via Reader.read_next_async(), and GUI events are processed every
+        plot_update_period seconds, on a separate task.  The loop awaits the start reader until its data are ready,
+        without sleeping or polling in between -- readers that can await their data source, like sockets, wake the
+        loop as data arrive, and other readers wait in a thread executor.  Closing the figures cancels any pending
+        read, so the run can end without waiting for more data.
+
+        For each trial plotted this records the latency, in seconds, from when the delimiting data arrived from the
+        start reader to when the new trial was plotted, in plot_latencies.
         """
+        asyncio.run(self.run_with_plots_async(trial_file, plot_update_period))
+
+    async def run_with_plots_async(
+        self,
+        trial_file: str,
+        plot_update_period: float = 0.025
+    ) -> None:
+        """The asyncio implementation of run_with_plots(), above."""
         with ExitStack() as stack:
             # All these "context managers" will clean up automatically when the "with" exits.
             writer = stack.enter_context(TrialFile.for_file_suffix(self.file_finder.find(trial_file)))
@@ -184,35 +346,22 @@ class PyramidContext():
                 stack.enter_context(reader)
             stack.enter_context(self.plot_figure_controller)
 
-            # Extract trials indefinitely, as they come.
-            next_gui_update = time.time()
-            while self.start_router.still_going() and self.plot_figure_controller.stil_going():
-                if time.time() > next_gui_update:
-                    self.plot_figure_controller.update()
-                    next_gui_update += plot_update_period
-
-                got_start_data = self.start_router.route_next()
-
-                if got_start_data:
-                    new_trials = self.trial_delimiter.next()
-                    for trial_number, new_trial in new_trials.items():
-                        # Let all readers catch up to the trial end time.
-                        for router in self.routers.values():
-                            router.route_until(new_trial.end_time)
-
-                        # Re-estimate clock drift for all readers using latest events from reference and other readers.
-                        for router in self.routers.values():
-                            router.update_drift_estimate(new_trial.end_time)
-
-                        self.trial_extractor.populate_trial(new_trial, trial_number, self.experiment, self.subject)
-                        writer.append_trial(new_trial)
-                        self.plot_figure_controller.plot_next(new_trial, trial_number)
-                        self.trial_delimiter.discard_before(new_trial.start_time)
-                        self.trial_extractor.discard_before(new_trial.start_time)
+            # Process GUI events on a fixed cadence, independent of when data arrive.
+            gui_task = asyncio.create_task(self.update_plots_periodically(plot_update_period))
+            trials_task = asyncio.create_task(self.extract_and_plot_trials(writer))
+            try:
+                # Run until the start reader is done, or the GUI is closed.
+                done, _ = await asyncio.wait([gui_task, trials_task], return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            finally:
+                gui_task.cancel()
+                trials_task.cancel()
+                await asyncio.gather(gui_task, trials_task, return_exceptions=True)
 
             # Make a best effort to catch the last trial -- which would have no "next trial" to delimit it.
             for router in self.routers.values():
-                router.route_next()
+                await router.route_next_async()
             # Re-estimate clock drift for all readers using last events from reference and other readers.
             for router in self.routers.values():
                 router.update_drift_estimate()
@@ -222,6 +371,60 @@ class PyramidContext():
                 writer.append_trial(last_trial)
                 self.plot_figure_controller.plot_next(last_trial, last_trial_number)
 
+            self.log_router_copies()
+            self.log_plot_latencies()
+
+    async def extract_and_plot_trials(self, writer: TrialFile) -> None:
+        """Extract and plot trials indefinitely, as they come, until the start reader is done."""
+        while self.start_router.still_going():
+            got_start_data = await self.start_router.route_next_async()
+            if not got_start_data:
+                continue
+
+            arrival_time = self.start_router.last_arrival_time
+            new_trials = self.trial_delimiter.next()
+            for trial_number, new_trial in new_trials.items():
+                # Let all readers catch up to the trial end time.
+                for router in self.routers.values():
+                    await router.route_until_async(new_trial.end_time)
+
+                # Re-estimate clock drift for all readers using latest events from reference and other readers.
+                for router in self.routers.values():
+                    router.update_drift_estimate(new_trial.end_time)
+
+                self.trial_extractor.populate_trial(new_trial, trial_number, self.experiment, self.subject)
+                writer.append_trial(new_trial)
+                self.plot_figure_controller.plot_next(new_trial, trial_number)
+                self.trial_delimiter.discard_before(new_trial.start_time)
+                self.trial_extractor.discard_before(new_trial.start_time)
+
+            if new_trials:
+                # Show new trials now, rather than waiting for the next periodic update.
+                self.plot_figure_controller.update()
+                plot_latency = time.perf_counter() - arrival_time
+                self.plot_latencies.extend([plot_latency] * len(new_trials))
+
+    async def update_plots_periodically(self, plot_update_period: float) -> None:
+        """Let figure windows process interactive UI events every plot_update_period seconds, until closed."""
+        while self.plot_figure_controller.stil_going():
+            self.plot_figure_controller.update()
+            await asyncio.sleep(plot_update_period)
+
+    def log_plot_latencies(self) -> None:
+        """Log the latency from arrival of trial-delimiting data to plotting of the trial."""
+        if self.plot_latencies:
+            mean_latency = sum(self.plot_latencies) / len(self.plot_latencies)
+            max_latency = max(self.plot_latencies)
+            logging.info(
+                f"Plotted {len(self.plot_latencies)} trials with latency from data arrival "
+                + f"mean {mean_latency * 1000:.3f} ms and max {max_latency * 1000:.3f} ms."
+            )
+
+    def log_router_copies(self) -> None:
+        """Log how much reader data each router had to copy, as opposed to passing it along as-is."""
+        for reader_name, router in self.routers.items():
+            logging.info(f"Router for reader {reader_name} copied {router.bytes_copied} bytes in {router.copy_count} copies.")
+
     def to_graphviz(self, graph_name: str, out_file: str):
         """Do introspection of loaded config and write out a graphviz "dot" file and overview image for viewing."""
 
@@ -322,6 +525,26 @@ class PyramidContext():
         dot.render(directory=out_path.parent, filename=file_name, outfile=out_path)
 
 
+def convert_partition(
+    experiment_config: dict[str, Any],
+    subject_config: dict[str, Any],
+    file_finder: FileFinder,
+    trial_file: str,
+    start_time: float,
+    trial_count: int,
+    write_from: int,
+    stop_after: int,
+    seek_indexes: dict[str, Any] = {}
+) -> None:
+    """Convert one partition of a session, in a worker process for PyramidContext.run_without_plots_in_parallel()."""
+    context = PyramidContext.from_dict(experiment_config, subject_config, file_finder=file_finder)
+    for reader_name, seek_index in seek_indexes.items():
+        context.readers[reader_name].set_seek_index(seek_index)
+    context.trial_delimiter.start_time = start_time
+    context.trial_delimiter.trial_count = trial_count
+    context.run_without_plots(trial_file, write_from, stop_after, seek_time=start_time)
+
+
 def configure_readers(
     readers_config: dict[str, dict],
     allow_simulate_delay: bool = False,
@@ -352,6 +575,8 @@ def configure_readers(
         )
         if simulate_delay:
             reader = DelaySimulatorReader(reader)
+        if reader_config.get("prefetch", False):
+            reader = PrefetchReader(reader, max_queue_size=reader_config.get("prefetch_queue_size", 10))
         readers[reader_name] = reader
 
         # Configure default, pass-through routes for the reader.
@@ -385,12 +610,16 @@ def configure_readers(
 
         # Create a buffer to receive data from each route.
         reader_buffers = {}
+        max_signal_duration = reader_config.get("max_signal_duration", None)
         for route in named_routes.values():
             initial_data = initial_results[route.reader_result_name]
             if initial_data is not None:
                 data_copy = initial_data.copy()
                 for transformer in route.transformers:
                     data_copy = transformer.transform(data_copy)
+                if max_signal_duration is not None and isinstance(data_copy, SignalChunk):
+                    # Optionally limit how many seconds of signal data the buffer will hold.
+                    data_copy.max_duration = max_signal_duration
                 reader_buffers[route.buffer_name] = Buffer(data_copy)
 
         # Configure sync events for correcting clock drift for this reader.
@@ -476,12 +705,14 @@ def configure_trials(
 
         enhancers[enhancer] = when_expression
 
+    use_views = trials_config.get("use_views", False)
     trial_extractor = TrialExtractor(
         wrt_buffer=named_buffers[wrt_buffer_name],
         wrt_value=wrt_value,
         wrt_value_index=wrt_value_index,
         named_buffers=other_buffers,
-        enhancers=enhancers
+        enhancers=enhancers,
+        use_views=use_views
     )
 
     return (trial_delimiter, trial_extractor, start_buffer_name)
@@ -2,7 +2,7 @@ from typing import Any, Self
 from dataclasses import dataclass
 import numpy as np
 
-from pyramid.model.model import BufferData
+from pyramid.model.model import BufferData, append_rows
 
 
 @dataclass
@@ -17,59 +17,276 @@ class NumericEventList(BufferData):
      - m is at least 2 (timestamps and values in columns):
        - column 0 holds the event timestamps
        - columns 1+ hold one or more values per event
+
+    event_data is a view of the live rows within a larger backing array, event_buffer.
+    The backing array has spare capacity so that append() and discard_before() don't have to copy the whole list.
+
+    Events are usually in time order, which allows time range queries to use binary search instead of masking.
+    The list checks and remembers whether its events are sorted by time, and keeps this up to date as events
+    are appended and discarded.  Code that modifies event times in event_data directly, rather than via
+    methods like shift_times(), should assign a new array to event_data so the list will check again.
+
+    For a read-only view from view_time_range(), shift_times() doesn't modify event_data.  Instead it adds to a
+    pending time_offset, which time accessors like get_times() apply as they go.  Code that reads event times
+    directly should use get_event_data() to get event_data with the pending offset applied.
     """
 
+    def __post_init__(self):
+        # The backing array is set up lazily, the first time we append or discard.
+        self.event_buffer = None
+        self.start_index = 0
+        self.end_index = 0
+        self.live_view = None
+
+        # Once read-only views have been handed out by view_time_range(), don't overwrite the lent rows.
+        # These are the rows of the backing array before lent_until, until discard_before() drops them.
+        self.views_lent = False
+        self.lent_until = 0
+
+        # Time shift to apply to event_data times, pending for read-only views.
+        self.time_offset = 0.0
+
+        # Whether events are sorted by time is checked lazily, and remembered for a particular event_data.
+        self.times_sorted = None
+        self.sorted_view = None
+
+    def set_live_rows(self, event_buffer: np.ndarray, start_index: int, end_index: int) -> None:
+        """Update the backing array and live row range, and the event_data view of these."""
+        if event_buffer is not self.event_buffer:
+            # Views lent from the old backing array won't be overwritten by writes to the new one.
+            self.views_lent = False
+            self.lent_until = 0
+        self.event_buffer = event_buffer
+        self.start_index = start_index
+        self.end_index = end_index
+        if start_index == 0 and end_index == event_buffer.shape[0]:
+            self.event_data = event_buffer
+        else:
+            self.event_data = event_buffer[start_index:end_index]
+        self.live_view = self.event_data
+
+    def adopt_event_data(self) -> None:
+        """Use event_data as the backing array, in case event_data was reassigned from outside."""
+        if self.event_data is not self.live_view:
+            times_sorted = self.is_sorted()
+            self.set_live_rows(self.event_data, 0, self.event_data.shape[0])
+            self.remember_sorted(times_sorted)
+
+    def is_sorted(self) -> bool:
+        """Check whether events are in time order, remembering the answer until event_data changes."""
+        if self.sorted_view is not self.event_data:
+            if self.event_count() > 1:
+                times = self.event_data[:, 0]
+                self.times_sorted = bool(np.all(times[1:] >= times[:-1]))
+            else:
+                self.times_sorted = True
+            self.sorted_view = self.event_data
+        return self.times_sorted
+
+    def remember_sorted(self, times_sorted: bool) -> None:
+        """Record whether the current event_data is in time order, when this is already known."""
+        self.times_sorted = times_sorted
+        self.sorted_view = self.event_data
+
     def __eq__(self, other: object) -> bool:
         """Compare event_data arrays as-a-whole instead of element-wise."""
         if isinstance(other, self.__class__):
-            return (self.event_data.size == 0 and other.event_data.size == 0) or np.array_equal(self.event_data, other.event_data)
+            return (
+                (self.event_data.size == 0 and other.event_data.size == 0)
+                or np.array_equal(self.get_event_data(), other.get_event_data())
+            )
         else:
             return False    
 
+    def get_event_data(self) -> np.ndarray:
+        """Get event_data with any pending time_offset applied -- a copy of event_data, when there's an offset."""
+        if self.time_offset:
+            return self.copy_event_data()
+        return self.event_data
+
+    def copy_event_data(self, rows_in_range: slice | np.ndarray = slice(None)) -> np.ndarray:
+        """Copy the selected rows of event_data, with any pending time_offset applied."""
+        range_event_data = self.event_data[rows_in_range, :]
+        if isinstance(rows_in_range, slice):
+            range_event_data = range_event_data.copy()
+        if self.time_offset:
+            range_event_data[:, 0] += self.time_offset
+        return range_event_data
+
     def copy(self) -> Self:
         """Implementing BufferData superclass."""
-        return NumericEventList(self.event_data.copy())
-
-    def get_time_selector(self, start_time: float, end_time: float) -> np.ndarray:
-        if start_time is None:
-            tail_selector = np.repeat(True, self.event_data.shape[0])
-        else:
-            tail_selector = self.event_data[:, 0] >= start_time
+        event_list = NumericEventList(self.copy_event_data())
+        if self.sorted_view is self.event_data:
+            event_list.remember_sorted(self.times_sorted)
+        return event_list
 
-        if end_time is None:
-            head_selector = np.repeat(True, self.event_data.shape[0])
-        else:
-            head_selector = self.event_data[:, 0] < end_time
+    def get_time_selector(self, start_time: float, end_time: float) -> slice | np.ndarray:
+        """Select rows with times in the half-open interval [start_time, end_time).
 
-        return tail_selector & head_selector
+        When events are sorted by time this uses binary search and returns a slice, which selects a view of event_data.
+        Otherwise, this falls back to returning a boolean mask, which selects a copy.
+        The given times include any pending time_offset, which this takes off before comparing to event_data.
+        """
+        if self.time_offset:
+            if start_time is not None:
+                start_time -= self.time_offset
+            if end_time is not None:
+                end_time -= self.time_offset
+
+        if self.is_sorted():
+            if self.event_count() == 0:
+                return slice(0, 0)
+
+            times = self.event_data[:, 0]
+            if start_time is None:
+                start_index = 0
+            else:
+                start_index = int(np.searchsorted(times, start_time, side="left"))
+
+            if end_time is None:
+                end_index = times.size
+            else:
+                end_index = max(start_index, int(np.searchsorted(times, end_time, side="left")))
+
+            return slice(start_index, end_index)
+
+        selector = np.ones(self.event_count(), dtype=bool)
+        if start_time is not None:
+            selector &= self.event_data[:, 0] >= start_time
+        if end_time is not None:
+            selector &= self.event_data[:, 0] < end_time
+        return selector
 
     def copy_time_range(self, start_time: float = None, end_time: float = None) -> Self:
         """Implementing BufferData superclass."""
         rows_in_range = self.get_time_selector(start_time, end_time)
-        range_event_data = self.event_data[rows_in_range, :]
-        return NumericEventList(range_event_data)
+        range_event_list = NumericEventList(self.copy_event_data(rows_in_range))
+        if isinstance(rows_in_range, slice):
+            range_event_list.remember_sorted(True)
+        return range_event_list
 
     def append(self, other: Self) -> None:
-        """Implementing BufferData superclass."""
-        self.event_data = np.concatenate([self.event_data, other.event_data])
+        """Implementing BufferData superclass.
+
+        This writes the other list's events into spare capacity at the end of this list's backing array.
+        The backing array grows by doubling, as needed, so the cost of appending is amortized O(k).
+        """
+        if other.event_data.shape[0] == 0:
+            return
+
+        if self.time_offset:
+            self.ensure_writable()
+        self.adopt_event_data()
+        other_event_data = other.get_event_data()
+        times_sorted = (
+            self.is_sorted()
+            and other.is_sorted()
+            and (self.event_count() == 0 or other_event_data[0, 0] >= self.event_data[-1, 0])
+        )
+        (event_buffer, start_index, end_index) = append_rows(
+            self.event_buffer,
+            self.start_index,
+            self.end_index,
+            other_event_data,
+            allow_overwrite=not self.views_lent
+        )
+        self.set_live_rows(event_buffer, start_index, end_index)
+        self.remember_sorted(times_sorted)
 
     def discard_before(self, start_time: float) -> None:
-        """Implementing BufferData superclass."""
-        rows_to_keep = self.event_data[:, 0] >= start_time
-        self.event_data = self.event_data[rows_to_keep, :]
+        """Implementing BufferData superclass.
+
+        When events are sorted by time, this uses binary search to find the first event to keep, then
+        just advances the start of the live rows within the backing array, without copying.
+        Once all the rows lent out by view_time_range() have been discarded, append() can overwrite them again.
+        """
+        if self.event_count() == 0:
+            return
+
+        self.adopt_event_data()
+        raw_start_time = start_time - self.time_offset
+        times_sorted = self.is_sorted()
+        if times_sorted:
+            first_kept = int(np.searchsorted(self.event_data[:, 0], raw_start_time, side="left"))
+            keep_tail = True
+        else:
+            rows_to_keep = self.event_data[:, 0] >= raw_start_time
+            first_kept = int(rows_to_keep.argmax())
+            if not rows_to_keep[first_kept]:
+                first_kept = self.event_count()
+            keep_tail = rows_to_keep[first_kept:].all()
+
+        if keep_tail:
+            self.set_live_rows(self.event_buffer, self.start_index + first_kept, self.end_index)
+            self.remember_sorted(times_sorted or self.event_count() == 0)
+            if self.views_lent and self.start_index >= self.lent_until:
+                # Trial views of the discarded rows are no longer needed.
+                self.views_lent = False
+                self.lent_until = 0
+        else:
+            # Events are out of order, so fall back to copying the ones to keep.
+            kept_data = self.event_data[rows_to_keep, :]
+            self.set_live_rows(kept_data, 0, kept_data.shape[0])
 
     def shift_times(self, shift: float) -> None:
-        """Implementing BufferData superclass."""
-        if self.event_data.size > 0:
-            self.event_data[:, 0] += shift
+        """Implementing BufferData superclass.
+
+        For a read-only view, this adds to the pending time_offset instead of copying event_data.
+        """
+        if self.event_data.size > 0 and shift != 0:
+            if self.event_data.flags.writeable:
+                self.event_data[:, 0] += shift
+            else:
+                self.time_offset += shift
+
+    def view_time_range(self, start_time: float = None, end_time: float = None) -> Self:
+        """Implementing BufferData superclass.
+
+        When events are sorted by time, the new list's event_data is a read-only view of this list's event_data.
+        Shifting the new list's times only changes its pending time_offset, so this doesn't copy events.
+        Methods that modify the new list's event_data, like apply_offset_then_gain(), will copy it first.
+        The view stays valid until this list discards the viewed rows with discard_before().
+        """
+        self.adopt_event_data()
+        rows_in_range = self.get_time_selector(start_time, end_time)
+        if not isinstance(rows_in_range, slice):
+            return self.copy_time_range(start_time, end_time)
+
+        range_event_data = self.event_data[rows_in_range, :]
+        range_event_data.flags.writeable = False
+        self.views_lent = True
+        self.lent_until = max(self.lent_until, self.start_index + rows_in_range.stop)
+        range_event_list = NumericEventList(range_event_data)
+        range_event_list.remember_sorted(True)
+        range_event_list.time_offset = self.time_offset
+        return range_event_list
+
+    def ensure_writable(self) -> None:
+        """Make sure event_data can be modified in place, by copying it if it's a read-only view.
+
+        This applies any pending time_offset to the copy.
+        """
+        if not self.event_data.flags.writeable:
+            times_sorted = self.is_sorted()
+            event_data = self.copy_event_data()
+            self.time_offset = 0.0
+            self.set_live_rows(event_data, 0, event_data.shape[0])
+            self.remember_sorted(times_sorted)
 
     def get_end_time(self) -> float:
         """Implementing BufferData superclass."""
         if self.event_count():
-            return self.event_data[:, 0].max()
+            if self.is_sorted():
+                return self.event_data[-1, 0] + self.time_offset
+            else:
+                return self.event_data[:, 0].max() + self.time_offset
         else:
             return None
 
+    def byte_count(self) -> int:
+        """Implementing BufferData superclass."""
+        return self.event_data.nbytes
+
     def get_times_of(
         self,
         event_value: float,
@@ -87,9 +304,10 @@ class NumericEventList(BufferData):
         Pass in end_time restrict to events strictly before end_time.
         """
         rows_in_range = self.get_time_selector(start_time, end_time)
+        range_event_data = self.event_data[rows_in_range, :]
         value_column = value_index + 1
-        matching_rows = (self.event_data[:, value_column] == event_value)
-        return self.event_data[rows_in_range & matching_rows, 0]
+        matching_rows = (range_event_data[:, value_column] == event_value)
+        return range_event_data[matching_rows, 0] + self.time_offset
 
     def apply_offset_then_gain(self, offset: float = 0, gain: float = 1, value_index: int = 0) -> None:
         """Transform all event data by a constant gain and offset.
@@ -102,12 +320,18 @@ class NumericEventList(BufferData):
 
         This modifies the event_data of this object, in place.
         """
+        self.ensure_writable()
         value_column = value_index + 1
         self.event_data[:, value_column] += offset
         self.event_data[:, value_column] *= gain
 
     def get_times(self) -> np.ndarray:
-        """Get just the event times, ignoring event values."""
+        """Get just the event times, ignoring event values.
+
+        This returns a view of event_data, or a copy when there's a pending time_offset.
+        """
+        if self.time_offset:
+            return self.event_data[:, 0] + self.time_offset
         return self.event_data[:, 0]
 
     def event_count(self) -> int:
@@ -132,6 +356,8 @@ class NumericEventList(BufferData):
 
         By default this gets only the first value per event.
         Pass in value_index>0 to get a different value.
+
+        When events are sorted by time, this returns a view of event_data rather than a copy.
         """
         rows_in_range = self.get_time_selector(start_time, end_time)
         value_column = value_index + 1
@@ -160,5 +386,4 @@ class NumericEventList(BufferData):
             bottom_selector = self.event_data[:, value_column] < max
 
         rows_in_range = top_selector & bottom_selector
-        range_event_data = self.event_data[rows_in_range, :]
-        return NumericEventList(range_event_data)
+        return NumericEventList(self.copy_event_data(rows_in_range))
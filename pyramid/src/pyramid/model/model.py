@@ -3,6 +3,8 @@ from importlib import import_module
 from typing import Any, Self
 from inspect import signature
 
+import numpy as np
+
 from pyramid.file_finder import FileFinder
 
 class DynamicImport():
@@ -90,6 +92,82 @@ class BufferData():
         """Report the time of the latest data item still in the buffer."""
         raise NotImplementedError  # pragma: no cover
 
+    def byte_count(self) -> int:
+        """Report the size in bytes of the data values held by this object -- allows tracking copy overhead.
+
+        The default returns 0, for types that don't know their own size.
+        """
+        return 0
+
+    def view_time_range(self, start_time: float = None, end_time: float = None) -> Self:
+        """Like copy_time_range(), but may return a read-only view that shares memory with this object.
+
+        Implementations can override this to avoid copying data into each trial.
+        The default just calls copy_time_range().
+        """
+        return self.copy_time_range(start_time, end_time)
+
+
+def append_rows(
+    backing: np.ndarray,
+    start_index: int,
+    end_index: int,
+    rows: np.ndarray,
+    allow_overwrite: bool = True,
+    min_capacity: int = 16
+) -> tuple[np.ndarray, int, int]:
+    """Append rows to the live region [start_index, end_index) of a backing array, growing capacity as needed.
+
+    This lets BufferData types keep a logical view like backing[start_index:end_index] that can grow at the end
+    and shrink at the start without copying all the data each time.  New rows are written into spare capacity
+    after end_index, when available.  Otherwise, the live rows are moved down to the start of the backing array
+    (when at least half the backing array is spare) or into a new backing array with double the needed capacity.
+    Either way, the cost of appending is amortized O(k) in the number of appended rows.
+
+    Pass allow_overwrite=False when read-only views of the backing array have been handed out, for example to trials.
+    This prevents moving live rows down over old rows the views might still be using -- new rows will go into a new
+    backing array instead.  A backing array that is not writeable is never written to, either.
+
+    Returns a tuple of (backing, start_index, end_index) which may refer to a new backing array.
+    """
+    row_count = rows.shape[0]
+    live_count = end_index - start_index
+    needed = live_count + row_count
+
+    if rows.shape[1:] == backing.shape[1:]:
+        row_shape = backing.shape[1:]
+    elif live_count == 0:
+        # Nothing worth keeping, so adopt the shape of the new rows.
+        row_shape = rows.shape[1:]
+    else:
+        raise ValueError(f"Can't append rows of shape {rows.shape[1:]} to rows of shape {backing.shape[1:]}")
+    dtype = np.result_type(backing.dtype, rows.dtype)
+
+    capacity = backing.shape[0]
+    no_room_at_end = end_index + row_count > capacity
+    if (
+        dtype != backing.dtype
+        or row_shape != backing.shape[1:]
+        or not backing.flags.writeable
+        or needed > capacity
+        or (no_room_at_end and (2 * live_count > capacity or not allow_overwrite))
+    ):
+        # Move live rows into a new backing array with room to grow.
+        new_capacity = max(2 * needed, min_capacity)
+        new_backing = np.empty((new_capacity, *row_shape), dtype=dtype)
+        new_backing[0:live_count] = backing[start_index:end_index]
+        backing = new_backing
+        start_index = 0
+        end_index = live_count
+    elif no_room_at_end:
+        # Plenty of room overall, but it's at the start -- slide the live rows down.
+        backing[0:live_count] = backing[start_index:end_index]
+        start_index = 0
+        end_index = live_count
+
+    backing[end_index:end_index + row_count] = rows
+    return (backing, start_index, end_index + row_count)
+
 
 class Buffer():
     """Hold data in a sliding window of time, smoothing any timing mismatch between Readers and Trials.
@@ -2,7 +2,7 @@ from typing import Any, Self
 from dataclasses import dataclass
 import numpy as np
 
-from pyramid.model.model import BufferData
+from pyramid.model.model import BufferData, append_rows
 
 
 @dataclass
@@ -29,6 +29,48 @@ class SignalChunk(BufferData):
     channel_ids should have m elements, where m is the number of columns in signal_data.
     """
 
+    max_duration: float = None
+    """Optional limit on how many seconds of samples to retain when appending (default None, no limit).
+
+    When set, append() will discard the oldest samples as needed to keep the chunk within max_duration.
+    """
+
+    def __post_init__(self):
+        # The backing array is set up lazily, the first time we append or discard.
+        self.sample_buffer = None
+        self.start_index = 0
+        self.end_index = 0
+        self.live_view = None
+
+        # Once read-only views have been handed out by view_time_range(), don't overwrite the lent rows.
+        # These are the rows of the backing array before lent_until, until discard_before() drops them.
+        self.views_lent = False
+        self.lent_until = 0
+
+    def set_live_rows(self, sample_buffer: np.ndarray, start_index: int, end_index: int) -> None:
+        """Update the backing array and live row range, and the sample_data view of these.
+
+        Like NumericEventList, sample_data is a view of the live rows within a larger backing array, sample_buffer.
+        The backing array has spare capacity so that append() and discard_before() don't have to copy all the samples.
+        """
+        if sample_buffer is not self.sample_buffer:
+            # Views lent from the old backing array won't be overwritten by writes to the new one.
+            self.views_lent = False
+            self.lent_until = 0
+        self.sample_buffer = sample_buffer
+        self.start_index = start_index
+        self.end_index = end_index
+        if start_index == 0 and end_index == sample_buffer.shape[0]:
+            self.sample_data = sample_buffer
+        else:
+            self.sample_data = sample_buffer[start_index:end_index]
+        self.live_view = self.sample_data
+
+    def adopt_sample_data(self) -> None:
+        """Use sample_data as the backing array, in case sample_data was reassigned from outside."""
+        if self.sample_data is not self.live_view:
+            self.set_live_rows(self.sample_data, 0, self.sample_data.shape[0])
+
     def __eq__(self, other: object) -> bool:
         """Compare signal_data arrays as-a-whole instead of element-wise."""
         if isinstance(other, self.__class__):
@@ -41,6 +83,7 @@ class SignalChunk(BufferData):
                 and self.sample_frequency == other.sample_frequency
                 and self.first_sample_time == other.first_sample_time
                 and self.channel_ids == other.channel_ids
+                and self.max_duration == other.max_duration
             )
         else:
             return False
@@ -51,27 +94,19 @@ class SignalChunk(BufferData):
             self.sample_data.copy(),
             self.sample_frequency,
             self.first_sample_time,
-            self.channel_ids
+            self.channel_ids,
+            self.max_duration
         )
 
     def copy_time_range(self, start_time: float = None, end_time: float = None) -> Self:
-        """Implementing BufferData superclass."""
-        sample_times = self.get_times()
-        if start_time is None:
-            tail_selector = True
-        else:
-            tail_selector = sample_times >= start_time
+        """Implementing BufferData superclass.
 
-        if end_time is None:
-            head_selector = True
-        else:
-            head_selector = sample_times < end_time
-
-        rows_in_range = tail_selector & head_selector
-
-        range_sample_data = self.sample_data[rows_in_range, :]
+        Samples are evenly spaced, so this computes the range of sample indexes arithmetically.
+        """
+        (start_index, end_index) = self.get_sample_range(start_time, end_time)
+        range_sample_data = self.sample_data[start_index:end_index, :].copy()
         if range_sample_data.size > 0:
-            range_first_sample_time = sample_times[rows_in_range][0]
+            range_first_sample_time = self.first_sample_time + start_index / self.sample_frequency
         else:
             range_first_sample_time = None
         return SignalChunk(
@@ -82,8 +117,21 @@ class SignalChunk(BufferData):
         )
 
     def append(self, other: Self) -> None:
-        """Implementing BufferData superclass."""
-        self.sample_data = np.concatenate([self.sample_data, other.sample_data])
+        """Implementing BufferData superclass.
+
+        This writes the other chunk's samples into spare capacity at the end of this chunk's backing array.
+        The backing array grows by doubling, as needed, so the cost of appending is amortized O(k).
+        """
+        if other.sample_data.shape[0] > 0:
+            self.adopt_sample_data()
+            (sample_buffer, start_index, end_index) = append_rows(
+                self.sample_buffer,
+                self.start_index,
+                self.end_index,
+                other.sample_data,
+                allow_overwrite=not self.views_lent
+            )
+            self.set_live_rows(sample_buffer, start_index, end_index)
 
         if self.sample_frequency is None:
             self.sample_frequency = other.sample_frequency
@@ -91,15 +139,94 @@ class SignalChunk(BufferData):
         if self.first_sample_time is None:
             self.first_sample_time = other.first_sample_time
 
+        if self.max_duration is not None and self.sample_count() > 0:
+            self.discard_before(self.get_end_time() - self.max_duration)
+
+    def sample_index_at_or_after(self, time: float) -> int:
+        """Compute the index of the first sample at or after the given time -- or sample_count() if none.
+
+        Samples are evenly spaced, so this is arithmetic on first_sample_time and sample_frequency.
+        The result is nudged to agree exactly with get_times(), in case of floating point rounding.
+        """
+        sample_count = self.sample_count()
+        index = int(np.ceil((time - self.first_sample_time) * self.sample_frequency))
+        index = min(max(index, 0), sample_count)
+        while index > 0 and self.first_sample_time + (index - 1) / self.sample_frequency >= time:
+            index -= 1
+        while index < sample_count and self.first_sample_time + index / self.sample_frequency < time:
+            index += 1
+        return index
+
+    def view_time_range(self, start_time: float = None, end_time: float = None) -> Self:
+        """Implementing BufferData superclass.
+
+        The new chunk's sample_data is a read-only view of this chunk's sample_data.
+        Shifting the new chunk's times only changes its first_sample_time, so this never needs to copy samples.
+        Methods that modify the new chunk's samples, like apply_offset_then_gain(), will copy them first.
+        The view stays valid until this chunk discards the viewed samples with discard_before().
+        """
+        self.adopt_sample_data()
+        (start_index, end_index) = self.get_sample_range(start_time, end_time)
+        range_sample_data = self.sample_data[start_index:end_index, :]
+        range_sample_data.flags.writeable = False
+        self.views_lent = True
+        self.lent_until = max(self.lent_until, self.start_index + end_index)
+        if range_sample_data.size > 0:
+            range_first_sample_time = self.first_sample_time + start_index / self.sample_frequency
+        else:
+            range_first_sample_time = None
+        return SignalChunk(
+            range_sample_data,
+            self.sample_frequency,
+            range_first_sample_time,
+            self.channel_ids
+        )
+
+    def ensure_writable(self) -> None:
+        """Make sure sample_data can be modified in place, by copying it if it's a read-only view."""
+        if not self.sample_data.flags.writeable:
+            sample_data = self.sample_data.copy()
+            self.set_live_rows(sample_data, 0, sample_data.shape[0])
+
+    def get_sample_range(self, start_time: float = None, end_time: float = None) -> tuple[int, int]:
+        """Compute sample indexes [start_index, end_index) for samples in the half-open time range [start_time, end_time)."""
+        sample_count = self.sample_count()
+        if sample_count == 0:
+            return (0, 0)
+
+        if start_time is None:
+            start_index = 0
+        else:
+            start_index = self.sample_index_at_or_after(start_time)
+
+        if end_time is None:
+            end_index = sample_count
+        else:
+            end_index = max(start_index, self.sample_index_at_or_after(end_time))
+
+        return (start_index, end_index)
+
     def discard_before(self, start_time: float) -> None:
-        """Implementing BufferData superclass."""
-        sample_times = self.get_times()
-        rows_to_keep = sample_times >= start_time
-        self.sample_data = self.sample_data[rows_to_keep, :]
-        if self.sample_data.size > 0:
-            self.first_sample_time = sample_times[rows_to_keep][0]
+        """Implementing BufferData superclass.
+
+        This just advances the start of the live rows within the backing array, without copying.
+        Once all the samples lent out by view_time_range() have been discarded, append() can overwrite them again.
+        """
+        if self.sample_count() == 0:
+            self.first_sample_time = None
+            return
+
+        self.adopt_sample_data()
+        first_kept = self.sample_index_at_or_after(start_time)
+        if first_kept < self.sample_count():
+            self.first_sample_time = self.first_sample_time + first_kept / self.sample_frequency
         else:
             self.first_sample_time = None
+        self.set_live_rows(self.sample_buffer, self.start_index + first_kept, self.end_index)
+        if self.views_lent and self.start_index >= self.lent_until:
+            # Trial views of the discarded samples are no longer needed.
+            self.views_lent = False
+            self.lent_until = 0
 
     def shift_times(self, shift: float) -> None:
         """Implementing BufferData superclass."""
@@ -115,6 +242,10 @@ class SignalChunk(BufferData):
         else:
             return None
 
+    def byte_count(self) -> int:
+        """Implementing BufferData superclass."""
+        return self.sample_data.nbytes
+
     def apply_offset_then_gain(self, offset: float = 0, gain: float = 1, channel_id: str | int = None) -> None:
         """Transform sample data by a constant gain and offset.
 
@@ -125,6 +256,7 @@ class SignalChunk(BufferData):
 
         This modifies the signal_data in place.
         """
+        self.ensure_writable()
         if channel_id is None:
             channel_index = True
         else:
@@ -143,7 +275,7 @@ class SignalChunk(BufferData):
 
     def get_times(self) -> np.ndarray:
         """Get all the sample times, ignoring channel values."""
-        sample_indexes = np.array(range(self.sample_count()))
+        sample_indexes = np.arange(self.sample_count())
         sample_offsets = sample_indexes / self.sample_frequency
         sample_times = self.first_sample_time + sample_offsets
         return sample_times
@@ -0,0 +1,289 @@
+from types import TracebackType
+from typing import Self
+import bisect
+import logging
+import numpy as np
+
+from pyramid.file_finder import FileFinder
+from pyramid.model.model import BufferData
+from pyramid.model.events import NumericEventList
+from pyramid.model.signals import SignalChunk
+from pyramid.neutral_zone.readers.readers import Reader
+
+
+class NpyNumericEventReader(Reader):
+    """Read numeric events from a NumPy .npy file, memory-mapped and read in chunks of rows.
+
+    The .npy file should contain a 2D array with one event per row: [time, value [, value ...]].
+    """
+
+    def __init__(
+        self,
+        npy_file: str = None,
+        file_finder: FileFinder = FileFinder(),
+        result_name: str = "events",
+        rows_per_read: int = 10000,
+        sample_frequency: float = None,
+        offset: float = 0.0,
+        gain: float = 1.0,
+        value_index: int = 0
+    ) -> None:
+        """Create a new NpyNumericEventReader.
+
+        Args:
+            npy_file:           Path to the .npy file to read from.
+            file_finder:        Utility to find() files in the conigured Pyramid configured search path.
+                                Pyramid will automatically create and pass in the file_finder for you.
+            result_name:        Name of the Pyramid reader results (and default buffer name) to use.
+                                Default is "events".
+            rows_per_read:      How many rows of npy_file to read per call to read_next().
+                                Default is 10000 rows.
+            sample_frequency:   When the time column holds sample numbers instead of seconds, the frequency in Hz
+                                to divide by, to get seconds.  Default is None, times are already in seconds.
+            offset:             Offset to add to event values, before gain.  Default is 0.0.
+            gain:               Gain to multiply event values by, after offset.  Default is 1.0.
+            value_index:        Which event value to apply offset and gain to.  Default is 0, the first value.
+        """
+        self.npy_file = file_finder.find(npy_file)
+        self.result_name = result_name
+        self.rows_per_read = rows_per_read
+        self.sample_frequency = sample_frequency
+        self.offset = offset
+        self.gain = gain
+        self.value_index = value_index
+
+        self.event_array = None
+        self.current_row = None
+
+    def __eq__(self, other: object) -> bool:
+        """Compare .npy readers field-wise, to support use of this class in tests."""
+        if isinstance(other, self.__class__):
+            return (
+                self.npy_file == other.npy_file
+                and self.result_name == other.result_name
+                and self.rows_per_read == other.rows_per_read
+                and self.sample_frequency == other.sample_frequency
+                and self.offset == other.offset
+                and self.gain == other.gain
+                and self.value_index == other.value_index
+            )
+        else:  # pragma: no cover
+            return False
+
+    def __enter__(self) -> Self:
+        self.event_array = np.load(self.npy_file, mmap_mode="r")
+        if self.event_array.ndim != 2 or self.event_array.shape[1] < 2:
+            raise ValueError(f"Expected .npy events with shape (n, m>=2) but {self.npy_file} has {self.event_array.shape}.")
+        self.current_row = 0
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None
+    ) -> bool | None:
+        self.event_array = None
+
+    def read_next(self) -> dict[str, BufferData]:
+        if self.current_row >= self.event_array.shape[0]:
+            # Reached the end of the events, all done.
+            raise StopIteration
+
+        # Copy the next chunk of rows out of the memory map, converting to float64 like other event lists.
+        until_row = min(self.event_array.shape[0], self.current_row + self.rows_per_read)
+        event_data = np.array(self.event_array[self.current_row:until_row], dtype=np.float64)
+        self.current_row = until_row
+
+        if self.sample_frequency is not None:
+            event_data[:, 0] /= self.sample_frequency
+
+        event_list = NumericEventList(event_data)
+        if self.offset != 0.0 or self.gain != 1.0:
+            event_list.apply_offset_then_gain(self.offset, self.gain, self.value_index)
+
+        return {self.result_name: event_list}
+
+    def can_seek(self) -> bool:
+        """Implementing can_seek() from superclass.
+
+        Assuming events are sorted by time, seek() can use a binary search to find the first row to read.
+        """
+        return True
+
+    def seek(self, time: float) -> None:
+        """Skip events with times before the given time, in seconds."""
+        # Search in the file's own units, without copying the time column out of the memory map.
+        if self.sample_frequency is None:
+            from_time = time
+        else:
+            from_time = np.floor(time * self.sample_frequency)
+        from_row = bisect.bisect_left(self.event_array[:, 0], from_time)
+        self.current_row = max(self.current_row, from_row)
+
+    def get_initial(self) -> dict[str, BufferData]:
+        # Peek at the .npy header to get the column count, without reading the data.
+        try:
+            column_count = np.load(self.npy_file, mmap_mode="r").shape[1]
+        except Exception:
+            column_count = 2
+            logging.error(f"Unable to peek at .npy file {self.npy_file}, using default column count {column_count}.", exc_info=True)
+
+        return {
+            self.result_name: NumericEventList(np.empty([0, column_count]))
+        }
+
+
+class BinarySignalReader(Reader):
+    """Read signals from a raw binary file of interleaved samples, memory-mapped and read in chunks.
+
+    The file should contain samples for all channels, one sample time after another:
+    [sample 0 channel 0, sample 0 channel 1, ... sample 1 channel 0, sample 1 channel 1, ...].
+    This is the layout of Kilosort-style int16 .bin files, where channel_count corresponds to Kilosort's "NchanTOT"
+    and sample_frequency corresponds to Kilosort's "fs".
+    """
+
+    def __init__(
+        self,
+        bin_file: str = None,
+        file_finder: FileFinder = FileFinder(),
+        channel_count: int = 1,
+        dtype: str = "int16",
+        sample_frequency: float = 1.0,
+        first_sample_time: float = 0.0,
+        samples_per_read: int = 10000,
+        channel_ids: list[str | int] = None,
+        offset: float = 0.0,
+        gain: float = 1.0,
+        header_bytes: int = 0,
+        result_name: str = "samples"
+    ) -> None:
+        """Create a new BinarySignalReader.
+
+        Args:
+            bin_file:           Path to the binary file to read from.
+            file_finder:        Utility to find() files in the conigured Pyramid configured search path.
+                                Pyramid will automatically create and pass in the file_finder for you.
+            channel_count:      How many channels are interleaved in the file.  Default is 1.
+            dtype:              NumPy dtype of each sample in the file.  Default is "int16".
+            sample_frequency:   Frequency in Hz of samples in the file.  Default is 1.0.
+            first_sample_time:  Time in seconds of the first sample in the file.  Default is 0.0.
+            samples_per_read:   How many samples (per channel) to read per call to read_next().
+                                Default is 10000 samples.
+            channel_ids:        Identifiers to use for each channel.  Default is None, to use channel indexes.
+            offset:             Offset to add to samples, before gain.  Default is 0.0.
+            gain:               Gain to multiply samples by, after offset, for example to get uV.
+                                Default is 1.0.
+            header_bytes:       How many bytes to skip at the start of the file, before samples.  Default is 0.
+            result_name:        Name of the Pyramid reader results (and default buffer name) to use.
+                                Default is "samples".
+        """
+        self.bin_file = file_finder.find(bin_file)
+        self.channel_count = channel_count
+        self.dtype = dtype
+        self.sample_frequency = sample_frequency
+        self.first_sample_time = first_sample_time
+        self.samples_per_read = samples_per_read
+        if channel_ids is None:
+            channel_ids = list(range(channel_count))
+        self.channel_ids = channel_ids
+        self.offset = offset
+        self.gain = gain
+        self.header_bytes = header_bytes
+        self.result_name = result_name
+
+        self.sample_array = None
+        self.current_sample = None
+
+    def __eq__(self, other: object) -> bool:
+        """Compare binary readers field-wise, to support use of this class in tests."""
+        if isinstance(other, self.__class__):
+            return (
+                self.bin_file == other.bin_file
+                and self.channel_count == other.channel_count
+                and self.dtype == other.dtype
+                and self.sample_frequency == other.sample_frequency
+                and self.first_sample_time == other.first_sample_time
+                and self.samples_per_read == other.samples_per_read
+                and self.channel_ids == other.channel_ids
+                and self.offset == other.offset
+                and self.gain == other.gain
+                and self.header_bytes == other.header_bytes
+                and self.result_name == other.result_name
+            )
+        else:  # pragma: no cover
+            return False
+
+    def __enter__(self) -> Self:
+        # Map whole samples only, in case the file ends with a partial sample.
+        item_size = np.dtype(self.dtype).itemsize
+        with open(self.bin_file, "rb") as f:
+            f.seek(0, 2)
+            file_size = f.tell()
+        sample_count = max(0, file_size - self.header_bytes) // (item_size * self.channel_count)
+
+        if sample_count:
+            self.sample_array = np.memmap(
+                self.bin_file,
+                dtype=self.dtype,
+                mode="r",
+                offset=self.header_bytes,
+                shape=(sample_count, self.channel_count)
+            )
+        else:
+            self.sample_array = np.empty([0, self.channel_count], dtype=self.dtype)
+        self.current_sample = 0
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None
+    ) -> bool | None:
+        self.sample_array = None
+
+    def read_next(self) -> dict[str, BufferData]:
+        if self.current_sample >= self.sample_array.shape[0]:
+            # Reached the end of the samples, all done.
+            raise StopIteration
+
+        # Copy the next chunk of samples out of the memory map, converting to float64 to apply offset and gain.
+        until_sample = min(self.sample_array.shape[0], self.current_sample + self.samples_per_read)
+        sample_data = np.array(self.sample_array[self.current_sample:until_sample], dtype=np.float64)
+        if self.offset != 0.0:
+            sample_data += self.offset
+        if self.gain != 1.0:
+            sample_data *= self.gain
+
+        signal_chunk = SignalChunk(
+            sample_data,
+            self.sample_frequency,
+            self.first_sample_time + self.current_sample / self.sample_frequency,
+            self.channel_ids
+        )
+        self.current_sample = until_sample
+        return {self.result_name: signal_chunk}
+
+    def can_seek(self) -> bool:
+        """Implementing can_seek() from superclass.
+
+        Since samples are evenly spaced, seek() can compute the first sample to read from the sample frequency.
+        """
+        return True
+
+    def seek(self, time: float) -> None:
+        """Skip samples with times before the given time, in seconds."""
+        from_sample = int(np.floor((time - self.first_sample_time) * self.sample_frequency))
+        from_sample = min(max(0, from_sample), self.sample_array.shape[0])
+        self.current_sample = max(self.current_sample, from_sample)
+
+    def get_initial(self) -> dict[str, BufferData]:
+        return {
+            self.result_name: SignalChunk(
+                np.empty([0, self.channel_count]),
+                self.sample_frequency,
+                self.first_sample_time,
+                self.channel_ids
+            )
+        }
@@ -2,6 +2,7 @@ from types import TracebackType
 from typing import Self
 import logging
 import csv
+import itertools
 import numpy as np
 
 from pyramid.file_finder import FileFinder
@@ -14,7 +15,8 @@ from pyramid.neutral_zone.readers.readers import Reader
 class CsvNumericEventReader(Reader):
     """Read numeric events from a CSV of numbers.
 
-    Skips lines that contain non-numeric values.
+    Reads rows_per_read rows at a time (default 1) and converts them in bulk.
+    Skips rows that contain non-numeric values.
     """
 
     def __init__(
@@ -23,15 +25,18 @@ class CsvNumericEventReader(Reader):
         file_finder: FileFinder = FileFinder(),
         result_name: str = "events",
         dialect: str = 'excel',
+        rows_per_read: int = 1,
         **fmtparams
     ) -> None:
         self.csv_file = file_finder.find(csv_file)
         self.result_name = result_name
         self.dialect = dialect
+        self.rows_per_read = rows_per_read
         self.fmtparams = fmtparams
 
         self.file_stream = None
         self.csv_reader = None
+        self.line_num = None
 
     def __eq__(self, other: object) -> bool:
         """Compare CSV readers field-wise, to support use of this class in tests."""
@@ -40,6 +45,7 @@ class CsvNumericEventReader(Reader):
                 self.csv_file == other.csv_file
                 and self.result_name == other.result_name
                 and self.dialect == other.dialect
+                and self.rows_per_read == other.rows_per_read
                 and self.fmtparams == other.fmtparams
             )
         else:  # pragma: no cover
@@ -49,6 +55,7 @@ class CsvNumericEventReader(Reader):
         # See https://docs.python.org/3/library/csv.html#id3 for why this has newline=''
         self.file_stream = open(self.csv_file, mode='r', newline='')
         self.csv_reader = csv.reader(self.file_stream, self.dialect, **self.fmtparams)
+        self.line_num = 0
         return self
 
     def __exit__(
@@ -63,17 +70,23 @@ class CsvNumericEventReader(Reader):
         self.csv_reader = None
 
     def read_next(self) -> dict[str, BufferData]:
-        line_num = self.csv_reader.line_num
-        next_row = self.csv_reader.__next__()
-        try:
-            numeric_row = [float(element) for element in next_row]
-            return {
-                self.result_name: NumericEventList(np.array([numeric_row]))
-            }
-        except ValueError as error:
-            logging.info(f"Skipping CSV '{self.csv_file}' line {line_num} {next_row} because {error.args}")
+        (line_count, numeric_rows) = read_numeric_lines(
+            self.csv_reader,
+            self.rows_per_read,
+            self.csv_file,
+            self.line_num
+        )
+        if not line_count:
+            raise StopIteration
+
+        self.line_num += line_count
+        if not numeric_rows.shape[0]:
             return None
 
+        return {
+            self.result_name: NumericEventList(numeric_rows)
+        }
+
     def get_initial(self) -> dict[str, BufferData]:
         first_row = peek_at_csv(self.csv_file, self.dialect, **self.fmtparams)
         if first_row:
@@ -98,11 +111,57 @@ def peek_at_csv(csv_file: str, dialect: str, **fmtparams) -> list[str]:
         return []
 
 
+def read_numeric_lines(
+    csv_reader,
+    max_lines: int,
+    csv_file: str,
+    line_num: int
+) -> tuple[int, np.ndarray]:
+    """Read up to max_lines rows from a CSV reader and convert them in bulk into a 2D array of numbers.
+
+    This takes whole rows from the csv_reader, so quoted fields and other dialect details are handled the usual way,
+    even for quoted fields that span lines.  For multiple rows, this tries to convert all the rows at once with
+    NumPy, which is much faster than converting row by row.  If any row contains non-numeric values, or rows have
+    different lengths, this falls back to converting row by row, to skip and log the non-numeric rows.
+
+    Returns a tuple of the number of rows consumed from the reader, and an array of numeric rows converted.
+    The number of rows is 0 at the end of the file.  The array might have 0 rows, if all rows were skipped.
+    """
+    rows = list(itertools.islice(csv_reader, max_lines))
+    if not rows:
+        return (0, None)
+
+    line_count = len(rows)
+    if line_count > 1:
+        try:
+            numeric_rows = np.array(rows, dtype=np.float64)
+            if numeric_rows.ndim == 2 and numeric_rows.shape[1]:
+                return (line_count, numeric_rows)
+        except ValueError:
+            pass
+
+    numeric_rows = []
+    for offset, row in enumerate(rows):
+        if not row:
+            continue
+        try:
+            numeric_rows.append([float(element) for element in row])
+        except ValueError as error:
+            logging.info(f"Skipping CSV '{csv_file}' line {line_num + offset} {row} because {error.args}")
+            continue
+
+    if numeric_rows:
+        return (line_count, np.array(numeric_rows))
+    else:
+        return (line_count, np.empty([0, 0]))
+
+
 class CsvSignalReader(Reader):
     """Read numeric signals from a CSV of numbers.
 
     Expects a header line with channel ids.
-    Skips any other lines that contain non-numeric values.
+    Reads lines_per_chunk numeric rows at a time and converts them in bulk.
+    Skips any other rows that contain non-numeric values.
     """
 
     def __init__(
@@ -126,12 +185,14 @@ class CsvSignalReader(Reader):
 
         self.file_stream = None
         self.csv_reader = None
+        self.line_num = None
         self.channel_ids = None
 
     def __enter__(self) -> Self:
         # See https://docs.python.org/3/library/csv.html#id3 for why this has newline=''
         self.file_stream = open(self.csv_file, mode='r', newline='')
         self.csv_reader = csv.reader(self.file_stream, self.dialect, **self.fmtparams)
+        self.line_num = 0
         return self
 
     def __exit__(
@@ -146,31 +207,54 @@ class CsvSignalReader(Reader):
         self.csv_reader = None
 
     def read_next(self) -> dict[str, BufferData]:
+        return self.read_samples(self.lines_per_chunk)
+
+    def can_read_until(self) -> bool:
+        """Implementing can_read_until() from superclass.
+
+        Since samples are evenly spaced in time, read_until() can compute how many lines to read.
+        """
+        return True
+
+    def read_until(self, time: float) -> dict[str, BufferData]:
+        # Count samples up to and including the given time, from the next sample time.
+        sample_count = int(np.floor((time - self.next_sample_time) * self.sample_frequency)) + 1
+        if sample_count < 1:
+            return None
+
+        # Round up to whole chunks, so that chunk boundaries are the same as for read_next().
+        chunk_count = -(-sample_count // self.lines_per_chunk)
+        return self.read_samples(chunk_count * self.lines_per_chunk)
+
+    def read_samples(self, sample_count: int) -> dict[str, BufferData]:
+        """Read and parse the given number of numeric lines as one SignalChunk."""
         chunk = []
-        while len(chunk) < self.lines_per_chunk:
-            line_num = self.csv_reader.line_num 
-            try:
-                next_row = self.csv_reader.__next__()
-            except StopIteration:
+        row_count = 0
+        while row_count < sample_count:
+            (line_count, numeric_rows) = read_numeric_lines(
+                self.csv_reader,
+                sample_count - row_count,
+                self.csv_file,
+                self.line_num
+            )
+            if not line_count:
                 # We reached the end.  We still want to return the last, partial chunk below.
                 break
 
-            try:
-                numeric_row = [float(element) for element in next_row]
-                chunk.append(numeric_row)
-            except ValueError as error:
-                logging.info(f"Skipping CSV '{self.csv_file}' line {line_num} {next_row} because {error.args}")
-                continue
+            self.line_num += line_count
+            if numeric_rows.shape[0]:
+                chunk.append(numeric_rows)
+                row_count += numeric_rows.shape[0]
 
         if chunk:
             # We got a complete chunk, or the last, partial chunk.
             signal_chunk = SignalChunk(
-                np.array(chunk),
+                np.concatenate(chunk) if len(chunk) > 1 else chunk[0],
                 self.sample_frequency,
                 self.next_sample_time,
                 self.channel_ids
             )
-            self.next_sample_time += len(chunk) / self.sample_frequency
+            self.next_sample_time += row_count / self.sample_frequency
             return {self.result_name: signal_chunk}
         else:
             # We're really at the end, past the last chunk, signal stop to the caller.
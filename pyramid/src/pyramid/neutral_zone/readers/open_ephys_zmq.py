@@ -7,6 +7,13 @@ import json
 
 import numpy as np
 import zmq
+import zmq.asyncio
+
+try:
+    # orjson is optional, and faster than the standard json module for parsing message headers.
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 from pyramid.model.model import BufferData
 from pyramid.model.events import NumericEventList
@@ -23,6 +30,27 @@ from pyramid.neutral_zone.readers.readers import Reader
 #   https://github.com/open-ephys-plugins/zmq-interface/blob/main/Source/ZmqInterface.cpp#L359
 
 
+def frame_buffer(part: bytes | zmq.Frame) -> bytes | memoryview:
+    """Get the content of a message part, without copying if it's a zmq.Frame received with copy=False."""
+    if isinstance(part, zmq.Frame):
+        return part.buffer
+    return part
+
+
+def frame_string(part: bytes | zmq.Frame, encoding: str = 'utf-8') -> str:
+    """Decode a short string, like a message envelope, from a message part."""
+    if isinstance(part, zmq.Frame):
+        return part.bytes.decode(encoding=encoding)
+    return part.decode(encoding=encoding)
+
+
+def parse_header(part: bytes | zmq.Frame, encoding: str = 'utf-8') -> dict[str, Any]:
+    """Parse a JSON message header from a message part, using orjson when available."""
+    if orjson is not None and encoding == 'utf-8':
+        return orjson.loads(frame_buffer(part))
+    return json.loads(frame_string(part, encoding=encoding))
+
+
 def format_heartbeat(
     uuid: str,
     application: str = "Pyramid",
@@ -76,13 +104,15 @@ def format_continuous_data(
 
 
 def parse_continuous_data(
-    parts: list[bytes],
+    parts: list[bytes | zmq.Frame],
     dtype=np.float32,
     encoding: str = 'utf-8',
+    header_info: dict[str, Any] = None
 ) -> tuple[str, dict, np.ndarray]:
-    envelope = parts[0].decode(encoding=encoding)
-    header_info = json.loads(parts[1].decode(encoding=encoding))
-    data = np.frombuffer(parts[2], dtype=dtype)
+    envelope = frame_string(parts[0], encoding=encoding)
+    if header_info is None:
+        header_info = parse_header(parts[1], encoding=encoding)
+    data = np.frombuffer(frame_buffer(parts[2]), dtype=dtype)
     return (envelope, header_info, data)
 
 
@@ -141,13 +171,15 @@ def format_event(
 
 
 def parse_event(
-    parts: list[bytes],
-    encoding: str = 'utf-8'
+    parts: list[bytes | zmq.Frame],
+    encoding: str = 'utf-8',
+    header_info: dict[str, Any] = None
 ) -> tuple[str, dict, bytes]:
-    envelope = parts[0].decode(encoding=encoding)
-    header_info = json.loads(parts[1].decode(encoding=encoding))
+    envelope = frame_string(parts[0], encoding=encoding)
+    if header_info is None:
+        header_info = parse_header(parts[1], encoding=encoding)
     if len(parts) > 2:
-        return (envelope, header_info, parts[2])
+        return (envelope, header_info, frame_buffer(parts[2]))
     else:
         return (envelope, header_info, None)
 
@@ -197,16 +229,18 @@ def format_spike(
 
 
 def parse_spike(
-    parts: list[bytes],
+    parts: list[bytes | zmq.Frame],
     dtype=np.float32,
     encoding: str = 'utf-8',
+    header_info: dict[str, Any] = None
 ) -> tuple[str, dict, np.ndarray]:
-    envelope = parts[0].decode(encoding=encoding)
-    header_info = json.loads(parts[1].decode(encoding=encoding))
+    envelope = frame_string(parts[0], encoding=encoding)
+    if header_info is None:
+        header_info = parse_header(parts[1], encoding=encoding)
     spike_info = header_info.get("spike", {})
     num_channels = spike_info.get("num_channels", 1)
     num_samples = spike_info.get("num_samples", -1)
-    waveform = np.frombuffer(parts[2], dtype=dtype).reshape([num_channels, num_samples])
+    waveform = np.frombuffer(frame_buffer(parts[2]), dtype=dtype).reshape([num_channels, num_samples])
     return (envelope, header_info, waveform)
 
 
@@ -418,6 +452,8 @@ class OpenEphysZmqClient(ContextManager):
         self.heartbeat_socket = None
         self.data_poller = None
         self.heartbeat_poller = None
+        self.data_socket_async = None
+        self.data_poller_async = None
 
     def __enter__(self) -> Self:
         self.context = zmq.Context()
@@ -459,6 +495,8 @@ class OpenEphysZmqClient(ContextManager):
         self.data_poller = None
         self.heartbeat_socket = None
         self.heartbeat_poller = None
+        self.data_socket_async = None
+        self.data_poller_async = None
 
     def send_heartbeat(self) -> bool:
         if self.heartbeat_socket is None:
@@ -492,37 +530,73 @@ class OpenEphysZmqClient(ContextManager):
         if timeout_ms is None:
             timeout_ms = self.timeout_ms
 
+        # When messages are arriving quickly, the next one is probably already waiting and we can skip polling.
+        parts = self.receive_parts_nowait()
+        if parts is None and timeout_ms:
+            ready = dict(self.data_poller.poll(timeout_ms))
+            if self.data_socket in ready:
+                parts = self.receive_parts_nowait()
+
+        return self.parse_data_parts(parts)
+
+    async def poll_and_receive_data_async(self, timeout_ms: int = None) -> dict[str, Any]:
+        """Like poll_and_receive_data(), but await data without blocking the asyncio event loop while waiting."""
+        if timeout_ms is None:
+            timeout_ms = self.timeout_ms
+
+        if self.data_poller_async is None:
+            # Shadow the same data socket for use with asyncio -- this needs to happen within a running event loop.
+            self.data_socket_async = zmq.asyncio.Socket.from_socket(self.data_socket)
+            self.data_poller_async = zmq.asyncio.Poller()
+            self.data_poller_async.register(self.data_socket_async, zmq.POLLIN)
+
+        parts = self.receive_parts_nowait()
+        if parts is None and timeout_ms:
+            ready = dict(await self.data_poller_async.poll(timeout_ms))
+            if self.data_socket_async in ready:
+                parts = self.receive_parts_nowait()
+
+        return self.parse_data_parts(parts)
+
+    def receive_parts_nowait(self) -> list[zmq.Frame]:
+        """Receive a multipart message if one is waiting, as zmq.Frames that we can read without copying."""
+        try:
+            return self.data_socket.recv_multipart(zmq.NOBLOCK, copy=False)
+        except zmq.Again:
+            return None
+
+    def parse_data_parts(self, parts: list[bytes | zmq.Frame]) -> dict[str, Any]:
         results = {}
-        ready = dict(self.data_poller.poll(timeout_ms))
-        if self.data_socket in ready:
-            parts = self.data_socket.recv_multipart(zmq.NOBLOCK)
-            if parts:
-                header_info = json.loads(parts[1].decode(self.encoding))
-
-                data_type = header_info["type"]
-                if data_type == "data":
-                    (envelope, header_info, data) = parse_continuous_data(parts, encoding=self.encoding)
-                    results.update(header_info)
-                    results["envelope"] = envelope
-                    results["data"] = data
-
-                elif data_type == "event":
-                    (envelope, header_info, data) = parse_event(parts, encoding=self.encoding)
-                    if header_info.get("content", {}).get("type", None) == 3:  # ttl event
-                        (event_line, event_state, ttl_word) = ttl_data_from_bytes(data)
-                        results.update(header_info)
-                        results["envelope"] = envelope
-                        results["event_line"] = event_line
-                        results["event_state"] = event_state
-                        results["ttl_word"] = ttl_word
-
-                elif data_type == "spike":
-                    (envelope, header_info, waveform) = parse_spike(parts, encoding=self.encoding)
-                    results.update(header_info)
-                    results["envelope"] = envelope
-                    results["waveform"] = waveform
-                else:  # pragma: no cover
-                    logging.warning(f"OpenEphysZmqClient ignoring unknown data type: {data_type}")
+        if not parts:
+            return results
+
+        # Parse the header once, here, and pass it to the parse_* functions below.
+        header_info = parse_header(parts[1], self.encoding)
+
+        data_type = header_info["type"]
+        if data_type == "data":
+            (envelope, header_info, data) = parse_continuous_data(parts, encoding=self.encoding, header_info=header_info)
+            results.update(header_info)
+            results["envelope"] = envelope
+            results["data"] = data
+
+        elif data_type == "event":
+            (envelope, header_info, data) = parse_event(parts, encoding=self.encoding, header_info=header_info)
+            if header_info.get("content", {}).get("type", None) == 3:  # ttl event
+                (event_line, event_state, ttl_word) = ttl_data_from_bytes(data)
+                results.update(header_info)
+                results["envelope"] = envelope
+                results["event_line"] = event_line
+                results["event_state"] = event_state
+                results["ttl_word"] = ttl_word
+
+        elif data_type == "spike":
+            (envelope, header_info, waveform) = parse_spike(parts, encoding=self.encoding, header_info=header_info)
+            results.update(header_info)
+            results["envelope"] = envelope
+            results["waveform"] = waveform
+        else:  # pragma: no cover
+            logging.warning(f"OpenEphysZmqClient ignoring unknown data type: {data_type}")
 
         return results
 
@@ -548,6 +622,9 @@ class OpenEphysZmqReader(Reader):
         scheme: str = "tcp",
         timeout_ms: int = 10,
         encoding: str = 'utf-8',
+        max_messages_per_read: int = 100,
+        max_seconds_per_read: float = 0.005,
+        max_pending_blocks: int = 10,
     ) -> None:
         """Create a new OpenEphysZmqReader.
 
@@ -563,7 +640,9 @@ class OpenEphysZmqReader(Reader):
             heartbeat_port:         Open Ephys ZMQ Interface heartbeat port to connect to (may be None to disable)
             event_sample_frequency: acquisition stream clock or sample rate, to convert sample numbers to timestamps
             continuous_data:        dictionary of {channel_num: buffer_name} to select which continuous data channels
-                                    to keep and the buffer name for each one (default is None to not keep any)
+                                    to keep and the buffer name for each one (default is None to not keep any) --
+                                    channels mapped to the same buffer name are assembled into one multi-channel
+                                    buffer, with columns in the order listed
             events:                 name of the buffer to receive ttl events (default is None to not keep ttl events)
             spikes:                 name of the buffer to receive all spike events, or a dictionary of
                                     {electrode_name: buffer_name} to select which spike electrodes to keep and the buffer
@@ -573,6 +652,13 @@ class OpenEphysZmqReader(Reader):
             scheme:                 URL transport scheme to use when connecting to the Open Ephys ZMQ Interface
             timeout_ms:             how long to wait when polling for messages from the Open Ephys ZMQ Interface
             encoding:               binary encoding to use for string data
+            max_messages_per_read:  how many messages to receive per read_next(), when more are already waiting
+                                    (default 100) -- at high message rates, more per read means less overhead,
+                                    or use 1 to receive one message at a time
+            max_seconds_per_read:   how long to keep receiving waiting messages per read_next(), up to
+                                    max_messages_per_read (default 0.005)
+            max_pending_blocks:     for multi-channel buffers, how many incomplete blocks of samples to wait on before
+                                    assembling the oldest one anyway, with NaN for missing channels
         """
         self.client = OpenEphysZmqClient(
             host,
@@ -589,12 +675,30 @@ class OpenEphysZmqReader(Reader):
         self.events = events
         self.spikes = spikes
 
+        self.max_messages_per_read = max_messages_per_read
+        self.max_seconds_per_read = max_seconds_per_read
+
+        # Channels mapped to the same buffer name get assembled into one multi-channel buffer.
+        self.channel_groups = {}
+        if continuous_data:
+            for channel_num, name in continuous_data.items():
+                self.channel_groups.setdefault(name, []).append(int(channel_num))
+        self.max_pending_blocks = max_pending_blocks
+        self.pending_blocks = None
+        self.last_assembled = None
+        self.missing_channel_count = None
+        self.late_channel_count = None
+
         self.heartbeat_interval = heartbeat_interval
         self.last_heartbeat_attempt = None
 
     def __enter__(self) -> Self:
         self.client.__enter__()
         self.last_heartbeat_attempt = 0
+        self.pending_blocks = {name: {} for name in self.channel_groups.keys()}
+        self.last_assembled = {}
+        self.missing_channel_count = 0
+        self.late_channel_count = 0
         return self
 
     def __exit__(
@@ -609,13 +713,13 @@ class OpenEphysZmqReader(Reader):
         initial = {}
 
         if self.continuous_data:
-            for channel_num, name in self.continuous_data.items():
+            for name, channel_ids in self.channel_groups.items():
                 # An incomplete placeholder to be amended when the first data arrive.
                 initial[name] = SignalChunk(
-                    sample_data=np.empty([0, 1], dtype='float32'),
+                    sample_data=np.empty([0, len(channel_ids)], dtype='float32'),
                     sample_frequency=None,
                     first_sample_time=None,
-                    channel_ids=[int(channel_num)]
+                    channel_ids=list(channel_ids)
                 )
 
         if self.events:
@@ -634,17 +738,82 @@ class OpenEphysZmqReader(Reader):
         return initial
 
     def read_next(self) -> dict[str, BufferData]:
+        self.check_heartbeat()
+        client_results = self.client.poll_and_receive_data()
+        return self.drain_and_coalesce(client_results)
+
+    async def read_next_async(self) -> dict[str, BufferData]:
+        """Implementing Reader superclass.
+
+        Instead of blocking while polling for data, await data as they arrive at the data socket.
+        Keep waiting until data arrive or the next heartbeat is due, rather than returning empty after timeout_ms,
+        so that callers can await this without polling.
+        Heartbeat replies should already be waiting when due, so don't wait for them at all.
+        """
+        self.check_heartbeat(timeout_ms=0)
+        client_results = await self.client.poll_and_receive_data_async(timeout_ms=self.heartbeat_wait_ms())
+        return self.drain_and_coalesce(client_results)
+
+    def heartbeat_wait_ms(self) -> int:
+        """How long to wait for data before the next heartbeat is due, or -1 to wait indefinitely with no heartbeat."""
+        if self.client.heartbeat_socket is None:
+            return -1
+
+        next_heartbeat_time = self.last_heartbeat_attempt + self.heartbeat_interval
+        return max(1, int((next_heartbeat_time - time.time()) * 1000) + 1)
+
+    def drain_and_coalesce(self, client_results: dict[str, Any]) -> dict[str, BufferData]:
+        """Convert a first message to results, plus any more messages already waiting, up to the per-read budget.
+
+        Results with the same name are coalesced: continuous data into one SignalChunk per channel, and events or
+        spikes into one NumericEventList with multiple rows.  This way the router deals with one result per name.
+        """
+        if not client_results or self.max_messages_per_read <= 1:
+            return self.results_from_client(client_results)
+
+        pending = {}
+        message_count = 0
+        deadline = time.perf_counter() + self.max_seconds_per_read
+        while client_results:
+            message_count += 1
+            for name, data in self.results_from_client(client_results).items():
+                pending.setdefault(name, []).append(data)
+
+            if message_count >= self.max_messages_per_read or time.perf_counter() > deadline:
+                break
+
+            client_results = self.client.poll_and_receive_data(timeout_ms=0)
+
+        results = {}
+        for name, data_list in pending.items():
+            if len(data_list) == 1:
+                results[name] = data_list[0]
+            elif isinstance(data_list[0], SignalChunk):
+                first = data_list[0]
+                results[name] = SignalChunk(
+                    sample_data=np.concatenate([data.sample_data for data in data_list]),
+                    sample_frequency=first.sample_frequency,
+                    first_sample_time=first.first_sample_time,
+                    channel_ids=first.channel_ids
+                )
+            else:
+                results[name] = NumericEventList(np.concatenate([data.event_data for data in data_list]))
+        return results
+
+    def check_heartbeat(self, timeout_ms: int = None) -> None:
+        """Check for a reply to the previous heartbeat and send the next one, once per heartbeat_interval."""
         if self.client.heartbeat_socket is not None:
             now_time = time.time()
             heartbeat_elapsed = now_time - self.last_heartbeat_attempt
             if heartbeat_elapsed > self.heartbeat_interval:
-                heartbeat_reply = self.client.poll_and_receive_heartbeat()
+                heartbeat_reply = self.client.poll_and_receive_heartbeat(timeout_ms)
                 if self.last_heartbeat_attempt > 0 and not heartbeat_reply:
                     logging.warning(f"Open Ephys ZMQ Interface at {self.client.data_address} has not replied to heartbeat for  at least {heartbeat_elapsed} seconds.")
                 self.client.send_heartbeat()
                 self.last_heartbeat_attempt = now_time
 
-        client_results = self.client.poll_and_receive_data()
+    def results_from_client(self, client_results: dict[str, Any]) -> dict[str, BufferData]:
+        """Convert a message from the client to Pyramid BufferData results, as configured for this reader."""
         if not client_results:
             return None
 
@@ -658,12 +827,19 @@ class OpenEphysZmqReader(Reader):
                     sample_num = client_results["content"]["sample_num"]
                     sample_rate = client_results["content"]["sample_rate"]
                     sample_data = client_results["data"]
-                    results[name] = SignalChunk(
-                        sample_data=sample_data.reshape([-1, 1]),
-                        sample_frequency=sample_rate,
-                        first_sample_time=sample_num / sample_rate,
-                        channel_ids=[int(channel_num)]
-                    )
+                    if len(self.channel_groups[name]) > 1:
+                        assembled = self.assemble_channels(name, int(channel_num), sample_num, sample_rate, sample_data)
+                        if assembled is None:
+                            # Waiting for other channels of the same block.
+                            return results
+                        results[name] = assembled
+                    else:
+                        results[name] = SignalChunk(
+                            sample_data=sample_data.reshape([-1, 1]),
+                            sample_frequency=sample_rate,
+                            first_sample_time=sample_num / sample_rate,
+                            channel_ids=[int(channel_num)]
+                        )
 
         elif data_type == "event":
             if self.events:
@@ -698,3 +874,62 @@ class OpenEphysZmqReader(Reader):
             logging.warning(f"OpenEphysZmqReader ignoring unmapped data: {client_results}")
 
         return results
+
+    def assemble_channels(
+        self,
+        name: str,
+        channel_num: int,
+        sample_num: int,
+        sample_rate: float,
+        sample_data: np.ndarray
+    ) -> SignalChunk:
+        """Collect one channel's data for a multi-channel buffer, and return any blocks of samples now complete.
+
+        Open Ephys sends each channel in a separate message, with the same sample_num for channels sampled together.
+        Blocks are assembled in sample_num order into (n_samples x n_channels) SignalChunks.
+        When a block completes, any older blocks still pending are assumed to be missing channels.
+        These are assembled first, with NaN for the missing channels, as is the oldest pending block
+        once more than max_pending_blocks are pending.
+        Channels that arrive after their block was already assembled are dropped.
+        """
+        last_sample_num = self.last_assembled.get(name, None)
+        if last_sample_num is not None and sample_num <= last_sample_num:
+            self.late_channel_count += 1
+            logging.warning(f"OpenEphysZmqReader dropping late data for {name} channel {channel_num} at sample {sample_num}.")
+            return None
+
+        pending = self.pending_blocks[name]
+        block = pending.setdefault(sample_num, {})
+        block[channel_num] = sample_data
+
+        channel_ids = self.channel_groups[name]
+        pending_sample_nums = sorted(pending.keys())
+        ready_count = max(0, len(pending_sample_nums) - self.max_pending_blocks)
+        if len(block) == len(channel_ids):
+            ready_count = max(ready_count, pending_sample_nums.index(sample_num) + 1)
+
+        if not ready_count:
+            return None
+
+        ready_sample_nums = pending_sample_nums[:ready_count]
+        assembled = [self.assemble_block(name, pending.pop(ready), channel_ids) for ready in ready_sample_nums]
+        self.last_assembled[name] = ready_sample_nums[-1]
+        return SignalChunk(
+            sample_data=np.concatenate(assembled),
+            sample_frequency=sample_rate,
+            first_sample_time=ready_sample_nums[0] / sample_rate,
+            channel_ids=list(channel_ids)
+        )
+
+    def assemble_block(self, name: str, block: dict[int, np.ndarray], channel_ids: list[int]) -> np.ndarray:
+        """Stack channels from one block into columns, in channel_ids order, with NaN for missing channels."""
+        sample_count = max([data.size for data in block.values()])
+        sample_data = np.full([sample_count, len(channel_ids)], np.nan, dtype=np.float32)
+        for column, channel_id in enumerate(channel_ids):
+            data = block.get(channel_id, None)
+            if data is None:
+                self.missing_channel_count += 1
+                logging.warning(f"OpenEphysZmqReader filling in NaN for {name} missing channel {channel_id}.")
+            else:
+                sample_data[:data.size, column] = data
+        return sample_data
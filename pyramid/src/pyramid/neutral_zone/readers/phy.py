@@ -26,6 +26,7 @@ class PhyClusterEventReader(Reader):
         cluster_filter: str = None,
         result_name: str = "spikes",
         rows_per_read: int = 2000,
+        preload: bool = False,
         csv_dialect: str = 'excel',
         **csv_fmtparams
     ) -> None:
@@ -57,6 +58,9 @@ class PhyClusterEventReader(Reader):
             rows_per_read:          How many rows of spike_times_name and spike_clusters_name to read per call to read_next().
                                     This reader will read spike and cluster files incrementally to limit memory usage.
                                     Default is 2000 rows.
+            preload:                Whether to load all of spike_times_name and spike_clusters_name into memory on enter,
+                                    instead of memory-mapping them.  This uses more memory but makes each read cheaper.
+                                    Default is False, memory-map the files.
             csv_dialect:            Python csv module "dialect" to use when reading cluster CSV/TSV files
                                     Default is "excel".
             **csv_fmtparams         Python csv module "fmtparams" kwargs to use when reading cluster CSV/TSV files
@@ -77,6 +81,7 @@ class PhyClusterEventReader(Reader):
 
         self.result_name = result_name
         self.rows_per_read = rows_per_read
+        self.preload = preload
 
         self.csv_dialect = csv_dialect
         self.csv_fmtparams = csv_fmtparams
@@ -86,12 +91,14 @@ class PhyClusterEventReader(Reader):
         self.spike_clusters = None
         self.sample_rate = None
         self.clusters_to_keep = None
+        self.cluster_lookup = None
 
     def __enter__(self) -> Self:
         # Start reading spikes and clusters at the beginning.
         self.current_row = 0
-        self.spikes_times = np.load(self.spike_times_file, mmap_mode="r")
-        self.spike_clusters = np.load(self.spike_clusters_file, mmap_mode="r")
+        mmap_mode = None if self.preload else "r"
+        self.spikes_times = np.load(self.spike_times_file, mmap_mode=mmap_mode)
+        self.spike_clusters = np.load(self.spike_clusters_file, mmap_mode=mmap_mode)
 
         # Parse the spike sample rate to convert samples to seconds.
         with open(self.params_file, "r") as f:
@@ -137,6 +144,12 @@ class PhyClusterEventReader(Reader):
                 if keep:
                     self.clusters_to_keep.append(cluster_id)
 
+            # Precompute a lookup table of which cluster ids to keep, indexed by cluster id.
+            # The last entry is always False, for any cluster ids not mentioned in cluster info files.
+            lookup_size = max(self.clusters_to_keep, default=-1) + 2
+            self.cluster_lookup = np.zeros([lookup_size], dtype=bool)
+            self.cluster_lookup[self.clusters_to_keep] = True
+
         return self
 
     def __exit__(
@@ -155,6 +168,48 @@ class PhyClusterEventReader(Reader):
 
         # Read the next increment of spike times and corresponding cluster ids.
         until_row = min(self.spikes_times.size, self.current_row + self.rows_per_read)
+        return self.read_rows(until_row)
+
+    def can_read_until(self) -> bool:
+        """Implementing can_read_until() from superclass.
+
+        Since spike times are sorted, read_until() can use a binary search to find the last row to read,
+        instead of reading a fixed number of rows at a time.
+        """
+        return True
+
+    def read_until(self, time: float) -> dict[str, BufferData]:
+        """Read exactly the spikes with times up to and including the given time, in seconds."""
+        if self.current_row >= self.spikes_times.size:
+            # Reached the end of the spikes, all done.
+            raise StopIteration
+
+        # Search in the file's own sample units, to avoid converting the whole file to seconds.
+        all_times = self.spikes_times.reshape([-1])
+        until_sample = all_times.dtype.type(max(0, np.floor(time * self.sample_rate)))
+        until_row = np.searchsorted(all_times, until_sample, side="right")
+        if until_row <= self.current_row:
+            # No spikes yet, up to the given time.
+            return None
+
+        return self.read_rows(until_row)
+
+    def can_seek(self) -> bool:
+        """Implementing can_seek() from superclass.
+
+        Since spike times are sorted, seek() can use a binary search to find the first row to read.
+        """
+        return True
+
+    def seek(self, time: float) -> None:
+        """Skip spikes with times before the given time, in seconds."""
+        all_times = self.spikes_times.reshape([-1])
+        from_sample = all_times.dtype.type(max(0, np.floor(time * self.sample_rate)))
+        from_row = np.searchsorted(all_times, from_sample, side="left")
+        self.current_row = max(self.current_row, from_row)
+
+    def read_rows(self, until_row: int) -> dict[str, BufferData]:
+        """Read spikes from the current row up to the given row, and apply the cluster filter."""
         times = self.spikes_times[self.current_row:until_row] / self.sample_rate
         clusters = self.spike_clusters[self.current_row:until_row]
         self.current_row = until_row
@@ -165,7 +220,8 @@ class PhyClusterEventReader(Reader):
             selected_clusters = clusters
         else:
             # Take spikes from select clusters, only.
-            selector = np.in1d(clusters, self.clusters_to_keep)
+            # Cluster ids beyond the lookup table share its last entry, which is always False.
+            selector = self.cluster_lookup[np.minimum(clusters, self.cluster_lookup.size - 1)].reshape([-1])
             selected_times = times[selector]
             selected_clusters = clusters[selector]
 
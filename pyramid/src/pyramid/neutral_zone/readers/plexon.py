@@ -1,4 +1,6 @@
 import logging
+import hashlib
+from struct import unpack_from
 from types import TracebackType
 from typing import ContextManager, Self, Any
 from pathlib import Path
@@ -138,6 +140,20 @@ DataBlockHeader = np.dtype(
 )
 
 
+# Pyramid's own summary of data block headers, for indexing many blocks at once.
+BlockIndex = np.dtype(
+    [
+        ('offset', 'int64'),  # file offset of the block header
+        ('type', 'uint16'),
+        ('channel', 'uint16'),
+        ('unit', 'uint16'),
+        ('timestamp', 'int64'),  # full 5-byte timestamp
+        ('waveform_count', 'uint16'),
+        ('words_per_waveform', 'uint16'),
+    ]
+)
+
+
 class PlexonPlxRawReader(ContextManager):
     """Read a Pleoxn .plx file sequentially, block by block.
 
@@ -149,15 +165,47 @@ class PlexonPlxRawReader(ContextManager):
     ahead of time and presenting a view per data type and channel, rather than sequentially.
 
     Thanks to the neo author Samuel Garcia for implementing a .plx file model in pure Python!
+
+    Optionally, the raw reader can use a block index file, with the suffix ".pyramid-index", to remember where
+    each block is in the .plx file, along with its type, channel, unit, and timestamp.  The first run builds the index
+    by scanning all the block headers, which can take minutes for a large file.  Subsequent runs load the index
+    instead, and next_blocks() uses it to read batches of blocks without walking the headers again.
+    An index file is only used when the .plx file still has the same size, plus the same modification time or the
+    same hash of its first and last few bytes.
+
+    Optionally, the raw reader can memory-map the .plx file instead of reading it through a buffered stream.
+    Then block headers and waveforms come from NumPy views into the mapped file, rather than a new bytes object
+    and a system call per read.
     """
 
-    def __init__(self, plx_file: str) -> None:
+    index_file_suffix = ".pyramid-index"
+    index_file_version = 1
+    index_hash_bytes = 1024 * 1024
+    max_gap_bytes = 64 * 1024
+
+    def __init__(
+        self,
+        plx_file: str,
+        cache_block_index: bool = False,
+        block_index_dir: str = None,
+        use_mmap: bool = False
+    ) -> None:
         self.plx_file = plx_file
+        self.cache_block_index = cache_block_index
+        self.block_index_dir = block_index_dir
+        self.use_mmap = use_mmap
 
         self.plx_stream = None
+        self.plx_map = None
+        self.map_position = 0
         self.block_count = 0
         self.global_header = None
 
+        self.data_offset = None
+        self.block_index = None
+        self.block_ends = None
+        self.block_position = 0
+
         self.dsp_channel_headers = None
         self.gain_per_dsp_channel = None
         self.dsp_frequency = None
@@ -170,7 +218,11 @@ class PlexonPlxRawReader(ContextManager):
         self.frequency_per_slow_channel = None
 
     def __enter__(self) -> Self:
-        self.plx_stream = open(self.plx_file, 'br')
+        if self.use_mmap:
+            self.plx_map = memoryview(np.memmap(self.plx_file, dtype='uint8', mode='r'))
+            self.map_position = 0
+        else:
+            self.plx_stream = open(self.plx_file, 'br')
 
         self.global_header = self.consume_type_as_dict(GlobalHeader)
 
@@ -197,6 +249,11 @@ class PlexonPlxRawReader(ContextManager):
         self.gain_per_slow_channel = self.get_gain_per_slow_channel()
         self.frequency_per_slow_channel = self.get_frequency_per_slow_channel()
 
+        # Data blocks start after all the headers.
+        self.data_offset = self.tell()
+        if self.cache_block_index:
+            self.set_block_index(self.load_or_build_block_index())
+
         return self
 
     def __exit__(
@@ -209,9 +266,163 @@ class PlexonPlxRawReader(ContextManager):
             self.plx_stream.close()
         self.plx_stream = None
 
+        # The mapping itself closes once any views into it are released.
+        self.plx_map = None
+
+    def read_bytes(self, size: int) -> bytes | memoryview:
+        """Consume up to size bytes of the file -- from the buffered stream, or as a view into the mapped file."""
+        if self.plx_map is None:
+            return self.plx_stream.read(size)
+
+        start = self.map_position
+        self.map_position = min(start + size, len(self.plx_map))
+        return self.plx_map[start:self.map_position]
+
+    def tell(self) -> int:
+        """Get the current file offset."""
+        if self.plx_map is None:
+            return self.plx_stream.tell()
+        return self.map_position
+
+    def seek(self, offset: int) -> None:
+        """Set the current file offset."""
+        if self.plx_map is None:
+            self.plx_stream.seek(offset)
+        else:
+            self.map_position = offset
+
+    def get_index_file(self) -> Path:
+        """Choose the block index file for this .plx file, either next to the .plx file or in block_index_dir."""
+        plx_path = Path(self.plx_file)
+        index_name = plx_path.name + self.index_file_suffix
+        if self.block_index_dir is None:
+            return Path(plx_path.parent, index_name)
+        else:
+            return Path(self.block_index_dir, index_name)
+
+    def get_index_key(self, check_hash: bool = True) -> dict[str, Any]:
+        """Describe the .plx file so we can tell if an index file still goes with it."""
+        plx_stat = Path(self.plx_file).stat()
+        index_key = {
+            "version": self.index_file_version,
+            "size": plx_stat.st_size,
+            "mtime_ns": plx_stat.st_mtime_ns,
+        }
+        if check_hash:
+            hash = hashlib.sha256()
+            with open(self.plx_file, 'br') as f:
+                hash.update(f.read(self.index_hash_bytes))
+                f.seek(max(0, plx_stat.st_size - self.index_hash_bytes))
+                hash.update(f.read(self.index_hash_bytes))
+            index_key["hash"] = hash.hexdigest()
+        return index_key
+
+    def load_or_build_block_index(self, save: bool = True) -> np.ndarray:
+        """Load the block index from the index file, if still valid, otherwise scan the .plx file and write a new one.
+
+        Pass save=False to use an existing index file, if any, but not to write a new one.
+        """
+        index_file = self.get_index_file()
+        block_index = self.load_block_index(index_file)
+        if block_index is not None:
+            logging.info(f"Using block index {index_file}")
+            return block_index
+
+        logging.info(f"Building block index for {self.plx_file}")
+        block_index = self.build_block_index()
+        if not save:
+            return block_index
+
+        try:
+            self.save_block_index(index_file, block_index)
+            logging.info(f"Wrote block index {index_file}")
+        except OSError:
+            logging.warning(f"Unable to write block index {index_file}:", exc_info=True)
+        return block_index
+
+    def load_block_index(self, index_file: Path) -> np.ndarray:
+        """Load a block index from the given index file, or return None if missing or stale."""
+        if not index_file.exists():
+            return None
+
+        try:
+            with np.load(index_file) as index_data:
+                saved_key = {
+                    "version": int(index_data["version"]),
+                    "size": int(index_data["size"]),
+                    "mtime_ns": int(index_data["mtime_ns"]),
+                    "hash": str(index_data["hash"]),
+                }
+                block_index = index_data["block_index"]
+        except Exception:
+            logging.warning(f"Ignoring unreadable block index {index_file}:", exc_info=True)
+            return None
+
+        # Avoid hashing when the .plx file seems untouched, otherwise use the hash to allow for copies, etc.
+        index_key = self.get_index_key(check_hash=False)
+        if saved_key["version"] != index_key["version"] or saved_key["size"] != index_key["size"]:
+            return None
+        if saved_key["mtime_ns"] != index_key["mtime_ns"]:
+            if saved_key["hash"] != self.get_index_key()["hash"]:
+                return None
+        return block_index
+
+    def save_block_index(self, index_file: Path, block_index: np.ndarray) -> None:
+        """Write the given block index to an index file, keyed to the current .plx file."""
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(index_file, 'bw') as f:
+            np.savez(f, block_index=block_index, **self.get_index_key())
+
+    def build_block_index(self) -> np.ndarray:
+        """Scan all the block headers in the file to build a BlockIndex array -- then return to the first block."""
+        self.seek(self.data_offset)
+        indexes = []
+        blocks = self.next_blocks()
+        while blocks is not None:
+            indexes.append(blocks["index"])
+            blocks = self.next_blocks()
+        self.seek(self.data_offset)
+
+        if indexes:
+            return np.concatenate(indexes)
+        else:
+            return np.empty([0], dtype=BlockIndex)
+
+    def select_blocks(
+        self,
+        channels_per_type: dict[int, list[int]],
+        start_time: float = None,
+        end_time: float = None
+    ) -> None:
+        """Restrict next_blocks() to blocks of the given types and channels, overlapping [start_time, end_time).
+
+        This uses the block index, building one now if needed, so that next_blocks() can seek past other blocks.
+        channels_per_type should map block types to channel ids, like {1: [1, 2], 4: [257], 5: [0, 1]}.
+        Whole blocks are selected, so a signal block that starts before start_time may still be included.
+        """
+        if self.block_index is None:
+            self.set_block_index(self.build_block_index())
+
+        index = self.block_index
+        selected = np.zeros(index.shape, dtype=bool)
+        for block_type, channels in channels_per_type.items():
+            selected |= (index['type'] == block_type) & np.isin(index['channel'], list(channels))
+        if start_time is not None:
+            selected &= self.block_end_times(index) >= start_time
+        if end_time is not None:
+            selected &= self.block_times(index) < end_time
+        self.set_block_index(index[selected])
+
+    def set_block_index(self, block_index: np.ndarray) -> None:
+        """Use the given BlockIndex array in next_blocks(), instead of walking block headers."""
+        self.block_index = block_index
+        word_counts = block_index['waveform_count'].astype('int64') * block_index['words_per_waveform']
+        self.block_ends = block_index['offset'] + DataBlockHeader.itemsize + 2 * word_counts
+        self.block_position = 0
+
     def consume_type(self, dtype: np.dtype) -> np.ndarray:
         """Consume part of the file, using the given dtype to choose the data size and format."""
-        bytes = self.plx_stream.read(dtype.itemsize)
+        bytes = self.read_bytes(dtype.itemsize)
         if not bytes:
             return None
         return np.frombuffer(bytes, dtype)[0]
@@ -272,16 +483,153 @@ class PlexonPlxRawReader(ContextManager):
             gains[header['Channel']] = gain
         return gains
 
+    def next_blocks(self, max_bytes: int = 16 * 1024 * 1024) -> dict[str, Any]:
+        """Consume as many whole blocks as fit in max_bytes, return a block index along with the raw bytes.
+
+        This is an alternative to next_block() for consuming many blocks at once.
+        It reads a large byte range from the file and walks the block headers to find where each block starts.
+        Finding block starts is still per-block Python code, since each block starts where the previous one ends,
+        and block sizes vary.  Once the starts are known, all headers are decoded with one structured NumPy view,
+        and everything else can use NumPy operations on the whole index.
+
+        Returns a dict with:
+            "index":        BlockIndex array with one element per block
+            "data":         raw bytes for the blocks, as a NumPy uint8 array
+            "data_offset":  file offset of the first byte in "data"
+        Or returns None when there are no more blocks in the file.
+
+        When using a block index, this reads the next blocks from the index instead of walking block headers.
+        """
+        if self.block_index is not None:
+            return self.next_indexed_blocks(max_bytes)
+
+        data_offset = self.tell()
+        data = self.read_bytes(max_bytes)
+        if not data:
+            return None
+
+        # Each block's start depends on the previous block's size, so this is a sequential walk, one block at a time.
+        # Precomputing candidate sizes at every possible offset with NumPy does more work than it saves:
+        # there are many more possible offsets than actual blocks, about 18 times more for 16sp_lfp_with_2coords.plx.
+        header_size = DataBlockHeader.itemsize
+        data_size = len(data)
+        block_offsets = []
+        position = 0
+        while position + header_size <= data_size:
+            (waveform_count, words_per_waveform) = unpack_from("<HH", data, position + 12)
+            block_end = position + header_size + 2 * waveform_count * words_per_waveform
+            if block_end > data_size:
+                break
+            block_offsets.append(position)
+            position = block_end
+
+        if not block_offsets:
+            if data_size < max_bytes:
+                # The file ends with a partial block.
+                logging.warning(f"Ignoring {data_size} bytes of partial data block at the end of {self.plx_file}.")
+                return None
+            # The next block is bigger than max_bytes, try again with more.
+            self.seek(data_offset)
+            return self.next_blocks(max_bytes * 2)
+
+        # Leave the file at the start of the first block we didn't consume.
+        self.seek(data_offset + position)
+
+        data = np.frombuffer(data, dtype='uint8', count=position)
+        offsets = np.array(block_offsets, dtype='int64')
+        header_bytes = data[offsets[:, np.newaxis] + np.arange(header_size)]
+        headers = header_bytes.view(DataBlockHeader).reshape([-1])
+        return {
+            "index": self.index_headers(headers, offsets + data_offset),
+            "data": data,
+            "data_offset": data_offset
+        }
+
+    def next_indexed_blocks(self, max_bytes: int) -> dict[str, Any]:
+        """Like next_blocks(), but use the block index to choose which blocks and bytes to read."""
+        if self.block_position >= self.block_index.size:
+            return None
+
+        start = self.block_position
+        data_offset = self.block_index['offset'][start]
+        stop = np.searchsorted(self.block_ends, data_offset + max_bytes, side='right')
+        stop = max(stop, start + 1)
+
+        # After select_blocks() there may be gaps between blocks -- seek past big gaps instead of reading them.
+        gaps = self.block_index['offset'][start + 1:stop] - self.block_ends[start:stop - 1]
+        big_gaps = np.flatnonzero(gaps > self.max_gap_bytes)
+        if big_gaps.size:
+            stop = start + big_gaps[0] + 1
+
+        data_end = self.block_ends[stop - 1]
+
+        self.seek(data_offset)
+        data = self.read_bytes(data_end - data_offset)
+        self.block_position = stop
+        return {
+            "index": self.block_index[start:stop],
+            "data": np.frombuffer(data, dtype='uint8'),
+            "data_offset": data_offset
+        }
+
+    def index_headers(self, headers: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Summarize an array of DataBlockHeader as a BlockIndex array."""
+        index = np.empty(headers.shape, dtype=BlockIndex)
+        index['offset'] = offsets
+        index['type'] = headers['Type']
+        index['channel'] = headers['Channel']
+        index['unit'] = headers['Unit']
+        index['timestamp'] = headers['UpperByteOf5ByteTimestamp'].astype('int64') * 2 ** 32 + headers['TimeStamp']
+        index['waveform_count'] = headers['NumberOfWaveforms']
+        index['words_per_waveform'] = headers['NumberOfWordsInWaveform']
+        return index
+
+    def block_times(self, index: np.ndarray) -> np.ndarray:
+        """Convert block timestamps from a BlockIndex array to seconds."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return index['timestamp'] / self.timestamp_frequency
+
+    def block_end_times(self, index: np.ndarray) -> np.ndarray:
+        """Compute the time in seconds of the last sample of each block from a BlockIndex array.
+
+        For event and spike blocks this is just the block time.
+        For slow channel blocks this is the time of the last sample in the block's waveform.
+        """
+        end_times = self.block_times(index)
+        slow_blocks = index['type'] == 5
+        if slow_blocks.any():
+            sample_counts = index['waveform_count'].astype('int64') * index['words_per_waveform']
+            frequencies = np.zeros(index.shape)
+            for channel, frequency in self.frequency_per_slow_channel.items():
+                frequencies[slow_blocks & (index['channel'] == channel)] = frequency
+            with np.errstate(divide='ignore', invalid='ignore'):
+                end_times[slow_blocks] += (sample_counts[slow_blocks] - 1) / frequencies[slow_blocks]
+        return end_times
+
+    def block_words(self, blocks: dict[str, Any], rows: np.ndarray) -> np.ndarray:
+        """Gather waveform words from the indexed rows of a next_blocks() result, concatenated into one int16 array."""
+        index = blocks["index"][rows]
+        word_counts = index['waveform_count'].astype('int64') * index['words_per_waveform']
+        first_words = (index['offset'] - blocks["data_offset"] + DataBlockHeader.itemsize) // 2
+        preceding_counts = np.cumsum(word_counts) - word_counts
+        word_positions = np.repeat(first_words - preceding_counts, word_counts) + np.arange(word_counts.sum())
+        words = blocks["data"].view('<i2')
+        return words[word_positions]
+
     #@profile
     def next_block(self) -> dict[str, Any]:
-        """Consume the next block header and any waveform data, as a friendly dict."""
+        """Consume the next block header and any waveform data, as a friendly dict.
+
+        Waveforms are raw int16 words, along with the channel "gain" to convert them to mV, as in words * gain.
+        This lets callers skip the conversion and copy for waveforms they don't use, like spike waveforms.
+        """
         block_header = self.consume_type(DataBlockHeader)
         if not block_header:
             return None
 
         self.block_count += 1
 
-        file_offset = self.plx_stream.tell()
+        file_offset = self.tell()
         timestamp = int(block_header['UpperByteOf5ByteTimestamp']) * 2 ** 32 + int(block_header['TimeStamp'])
         block_type = block_header['Type']
         if block_type == 4:
@@ -316,12 +664,11 @@ class PlexonPlxRawReader(ContextManager):
 
     #@profile
     def consume_block_waveforms(self, block_header: np.ndarray) -> np.ndarray:
+        """Consume the block's waveform words -- with use_mmap this is a view into the mapped file, not a copy."""
         n = int(block_header["NumberOfWaveforms"])
         m = int(block_header["NumberOfWordsInWaveform"])
-        bytes = self.plx_stream.read(n * m * 2)
-        waveforms = np.frombuffer(bytes, dtype='int16')
-        waveforms.reshape([n, m])
-        return waveforms
+        bytes = self.read_bytes(n * m * 2)
+        return np.frombuffer(bytes, dtype='int16')
 
     #@profile
     def block_dsp_data(
@@ -333,7 +680,6 @@ class PlexonPlxRawReader(ContextManager):
     ) -> dict[str, Any]:
         waveforms = self.consume_block_waveforms(block_header)
         channel = block_header['Channel']
-        gain = self.gain_per_dsp_channel[channel]
         return {
             "type": block_type,
             "file_offset": file_offset,
@@ -342,7 +688,8 @@ class PlexonPlxRawReader(ContextManager):
             "channel": channel,
             "unit": block_header['Unit'],
             "frequency": self.dsp_frequency,
-            "waveforms": waveforms * gain
+            "waveforms": waveforms,
+            "gain": self.gain_per_dsp_channel[channel]
         }
 
     #@profile
@@ -355,7 +702,6 @@ class PlexonPlxRawReader(ContextManager):
     ) -> dict[str, Any]:
         waveforms = self.consume_block_waveforms(block_header)
         channel = block_header['Channel']
-        gain = self.gain_per_slow_channel[channel]
         channel_frequency = self.frequency_per_slow_channel[channel]
         return {
             "type": block_type,
@@ -365,7 +711,8 @@ class PlexonPlxRawReader(ContextManager):
             "channel": channel,
             "unit": block_header['Unit'],
             "frequency": channel_frequency,
-            "waveforms": waveforms * gain
+            "waveforms": waveforms,
+            "gain": self.gain_per_slow_channel[channel]
         }
 
 
@@ -382,7 +729,14 @@ class PlexonPlxReader(Reader):
         seconds_per_read: float = 1.0,
         spikes_prefix: str = "spike_",
         events_prefix: str = "event_",
-        signals_prefix: str = "signal_"
+        signals_prefix: str = "signal_",
+        bulk_decode: bool = False,
+        bytes_per_read: int = 16 * 1024 * 1024,
+        cache_block_index: bool = False,
+        block_index_dir: str = None,
+        use_mmap: bool = False,
+        start_time: float = None,
+        end_time: float = None
     ) -> None:
         """Create a new PlexonPlxReader.
 
@@ -406,6 +760,20 @@ class PlexonPlxReader(Reader):
             spikes_prefix:      Default prefix for spike channels when spikes="all", to avoid naming collisions.
             events_prefix:      Default prefix for event channels when events="all", to avoid naming collisions.
             signals_prefix:     Default prefix for signals channels when signals="all", to avoid naming collisions.
+            bulk_decode:        Whether to decode many blocks at once with NumPy, instead of one block at a time.
+                                Bulk decoding gives the same results per read_next() as reading block by block,
+                                but batches results per channel and is much faster for large files.
+            bytes_per_read:     When bulk_decode is True, how many bytes to read from the file at once.
+            cache_block_index:  Whether to use a block index file so that bulk_decode doesn't have to walk block headers.
+                                The first run scans the .plx file and writes the index, later runs reuse it.
+            block_index_dir:    Where to write the block index file.  By default, next to the .plx file.
+            use_mmap:           Whether to memory-map the .plx file instead of reading through a buffered stream.
+                                This avoids a system call and a new bytes object per read, especially with bulk_decode.
+            start_time:         Optional time in seconds of the earliest data to read.
+            end_time:           Optional time in seconds to stop reading data (exclusive).
+                                With start_time or end_time, or with only some channels selected, bulk_decode
+                                uses a block index to seek past unselected blocks instead of reading them.
+                                Setting start_time or end_time implies bulk_decode.
         """
         self.plx_file = file_finder.find(plx_file)
         self.spikes = spikes
@@ -415,12 +783,25 @@ class PlexonPlxReader(Reader):
         self.spikes_prefix = spikes_prefix
         self.events_prefix = events_prefix
         self.signals_prefix = signals_prefix
-
-        self.raw_reader = PlexonPlxRawReader(self.plx_file)
+        self.bulk_decode = bulk_decode
+        self.bytes_per_read = bytes_per_read
+        self.cache_block_index = cache_block_index
+        self.block_index_dir = block_index_dir
+        self.use_mmap = use_mmap
+        self.start_time = start_time
+        self.end_time = end_time
+        if start_time is not None or end_time is not None:
+            self.bulk_decode = True
+
+        self.raw_reader = PlexonPlxRawReader(self.plx_file, cache_block_index, block_index_dir, use_mmap)
         self.spike_channel_names = None
         self.event_channel_names = None
         self.signal_channel_names = None
 
+        self.pending_blocks = None
+        self.pending_position = 0
+        self.reached_time = None
+
     def __enter__(self) -> Any:
         self.raw_reader.__enter__()
 
@@ -442,8 +823,23 @@ class PlexonPlxReader(Reader):
             self.signals_prefix
         )
 
+        if self.bulk_decode:
+            selecting_channels = self.spikes != "all" or self.events != "all" or self.signals != "all"
+            selecting_time = self.start_time is not None or self.end_time is not None
+            if selecting_channels or selecting_time:
+                self.select_blocks()
+
         return self
 
+    def select_blocks(self) -> None:
+        """Restrict bulk decoding to blocks for the chosen channels, overlapping [start_time, end_time)."""
+        channels_per_type = {
+            1: self.spike_channel_names.keys(),
+            4: self.event_channel_names.keys(),
+            5: self.signal_channel_names.keys(),
+        }
+        self.raw_reader.select_blocks(channels_per_type, self.start_time, self.end_time)
+
     def choose_channel_names(
         self,
         channel_headers: list[dict[str, Any]],
@@ -471,6 +867,72 @@ class PlexonPlxReader(Reader):
 
     #@profile
     def read_next(self) -> dict[str, BufferData]:
+        if self.bulk_decode:
+            return self.read_next_bulk()
+        return self.read_blocks()
+
+    def can_read_until(self) -> bool:
+        """Implementing can_read_until() from superclass.
+
+        Since .plx files are only raggedly ordered in time, read_until() reads past the given time by a margin of
+        seconds_per_read, taking blocks up to and including the first block that reaches the given time plus
+        seconds_per_read.  As for read_next(), choose seconds_per_read to be greater than raggedness between channels,
+        so that all data before the given time have been read when read_until() returns.
+        """
+        return True
+
+    def read_until(self, time: float) -> dict[str, BufferData]:
+        if self.reached_time is not None and self.reached_time >= time:
+            # Already read up to the given time, plus the margin.
+            return None
+
+        if self.bulk_decode:
+            results = self.read_next_bulk(time, self.seconds_per_read)
+        else:
+            results = self.read_blocks(time, self.seconds_per_read)
+        self.reached_time = time
+        return results
+
+    def can_seek(self) -> bool:
+        """Implementing can_seek() from superclass.
+
+        seek() uses the same block index as start_time, to skip blocks that end before the given time.
+        Like start_time, this implies bulk_decode.
+        """
+        return True
+
+    def seek(self, time: float) -> None:
+        """Skip blocks that end before the given time, in seconds."""
+        if self.start_time is None or self.start_time < time:
+            self.start_time = time
+        self.bulk_decode = True
+        self.select_blocks()
+
+    def get_seek_index(self) -> np.ndarray:
+        """Implementing get_seek_index() from superclass.
+
+        This is the .plx block index, which seek() uses to find blocks without walking the file.
+        This uses an existing block index file when still valid, even without cache_block_index, since parallel
+        conversion calls this on every run.  With cache_block_index, this also writes a new block index file.
+        """
+        with self.raw_reader:
+            if self.raw_reader.block_index is None:
+                block_index = self.raw_reader.load_or_build_block_index(save=self.cache_block_index)
+                self.raw_reader.set_block_index(block_index)
+            return self.raw_reader.block_index
+
+    def set_seek_index(self, seek_index: np.ndarray) -> None:
+        """Implementing set_seek_index() from superclass."""
+        self.raw_reader.set_block_index(seek_index)
+
+    def read_blocks(self, reference_time: float = None, seconds: float = None) -> dict[str, BufferData]:
+        """Read blocks one at a time, up to and including the first that spans seconds past reference_time.
+
+        By default this reads seconds_per_read from the first block's time, as for read_next().
+        """
+        if seconds is None:
+            seconds = self.seconds_per_read
+
         (name, data) = self.read_one_block()
         if name is None:
             # If there's nothing at all to read, the .plx file is done.
@@ -480,10 +942,13 @@ class PlexonPlxReader(Reader):
         results = {}
         if name != "skip":
             results[name] = data
-        first_data_time = data.get_end_time()
-        while name is not None and data.get_end_time() - first_data_time < self.seconds_per_read:
+        if reference_time is None:
+            reference_time = data.get_end_time()
+        while name is not None and data.get_end_time() - reference_time < seconds:
             (name, data) = self.read_one_block()
-            if name == "skip":
+            if name is None:
+                break
+            elif name == "skip":
                 continue
             elif name in results:
                 results[name].append(data)
@@ -492,6 +957,146 @@ class PlexonPlxReader(Reader):
 
         return results
 
+    def read_next_bulk(self, reference_time: float = None, seconds: float = None) -> dict[str, BufferData]:
+        """Consume the same blocks as read_blocks() would, but decode them in batches instead of one at a time."""
+        if seconds is None:
+            seconds = self.seconds_per_read
+
+        results = {}
+        first_data_time = None
+        while True:
+            if self.pending_blocks is None or self.pending_position >= self.pending_blocks["index"].size:
+                self.pending_blocks = self.raw_reader.next_blocks(self.bytes_per_read)
+                self.pending_position = 0
+                if self.pending_blocks is None:
+                    break
+                self.pending_blocks["end_times"] = self.raw_reader.block_end_times(self.pending_blocks["index"])
+
+            end_times = self.pending_blocks["end_times"]
+            if first_data_time is None:
+                first_data_time = end_times[self.pending_position]
+                if reference_time is None:
+                    reference_time = first_data_time
+
+            # Like read_blocks(), take blocks up to and including the first that spans seconds past the reference time.
+            window_end = self.find_window_end(end_times, self.pending_position, reference_time, seconds)
+            if window_end is None:
+                stop = end_times.size
+            else:
+                stop = window_end + 1
+
+            self.append_results(results, self.decode_blocks(self.pending_blocks, self.pending_position, stop))
+            self.raw_reader.block_count += stop - self.pending_position
+            self.pending_position = stop
+
+            if window_end is not None:
+                break
+
+        if first_data_time is None:
+            # If there's nothing at all to read, the .plx file is done.
+            raise StopIteration
+
+        return results
+
+    def find_window_end(self, end_times: np.ndarray, start: int, reference_time: float, seconds: float) -> int:
+        """Find the index of the first block at or after start that spans seconds past reference_time, or None.
+
+        This searches in steps of increasing size, so the cost is proportional to the window, not the whole batch.
+        """
+        step = 64
+        while start < end_times.size:
+            stop = start + step
+            with np.errstate(invalid='ignore'):
+                spanning = np.flatnonzero(~(end_times[start:stop] - reference_time < seconds))
+            if spanning.size:
+                return start + int(spanning[0])
+            start = stop
+            step *= 2
+        return None
+
+    def append_results(self, results: dict[str, BufferData], more_results: dict[str, BufferData]) -> None:
+        for name, data in more_results.items():
+            if name in results:
+                results[name].append(data)
+            else:
+                results[name] = data
+
+    def decode_blocks(self, blocks: dict[str, Any], start: int, stop: int) -> dict[str, BufferData]:
+        """Decode a range of blocks from a raw reader next_blocks() result, batched by block type and result name.
+
+        Several channels may share the same result name, for example when aliasing all spike channels to one name.
+        Blocks for all these channels are decoded together, in file order, the same as read_blocks() appends them.
+        """
+        index = blocks["index"][start:stop]
+
+        # Group blocks by type and channel, keeping blocks in file order within each group.
+        group_keys = index['type'].astype('int64') * 2 ** 16 + index['channel']
+        order = np.argsort(group_keys, kind='stable')
+        group_starts = np.flatnonzero(np.diff(group_keys[order])) + 1
+        groups = np.split(order, group_starts)
+
+        # Merge groups of channels that share the same result name.
+        names_per_type = {
+            1: self.spike_channel_names,
+            4: self.event_channel_names,
+            5: self.signal_channel_names,
+        }
+        rows_per_name = {}
+        for rows in groups:
+            if not rows.size:
+                continue
+
+            block_type = int(index['type'][rows[0]])
+            channel_names = names_per_type.get(block_type, None)
+            if channel_names is None:  # pragma: no cover
+                logging.warning(f"Ignoring {rows.size} blocks of unknown type {block_type}.")
+                continue
+
+            name = channel_names.get(index['channel'][rows[0]], None)
+            if name is not None:
+                rows_per_name.setdefault((block_type, name), []).append(rows)
+
+        results = {}
+        times = self.raw_reader.block_times(index)
+        for (block_type, name), name_groups in rows_per_name.items():
+            if len(name_groups) == 1:
+                rows = name_groups[0]
+            else:
+                # Blocks from several channels, back in file order.
+                rows = np.sort(np.concatenate(name_groups))
+
+            if block_type == 1:
+                # Spike events with timestamp, channel, and unit.
+                event_data = np.column_stack([times[rows], index['channel'][rows], index['unit'][rows]])
+                data = NumericEventList(event_data.astype(np.float64))
+            elif block_type == 4:
+                # Other events with timestamp, value.
+                event_data = np.column_stack([times[rows], index['unit'][rows]])
+                data = NumericEventList(event_data.astype(np.float64))
+            else:
+                # Waveform signal chunks, concatenated.
+                channel_ids = index['channel'][rows]
+                channel_id = channel_ids[0]
+                words = self.raw_reader.block_words(blocks, start + rows)
+                if len(name_groups) == 1:
+                    gain = self.raw_reader.gain_per_slow_channel[channel_id]
+                else:
+                    # Each channel has its own gain, for each of its words.
+                    gain_per_block = [self.raw_reader.gain_per_slow_channel[channel] for channel in channel_ids]
+                    word_counts = index['waveform_count'][rows].astype('int64') * index['words_per_waveform'][rows]
+                    gain = np.repeat(gain_per_block, word_counts)
+                data = SignalChunk(
+                    sample_data=(words * gain).reshape([-1, 1]),
+                    sample_frequency=float(self.raw_reader.frequency_per_slow_channel[channel_id]),
+                    first_sample_time=float(times[rows[0]]),
+                    channel_ids=[int(channel_id)]
+                )
+
+            # Names shared between block types are appended, as in read_blocks().
+            self.append_results(results, {name: data})
+
+        return results
+
     #@profile
     def read_one_block(self) -> tuple[str, BufferData]:
         block = self.raw_reader.next_block()
@@ -531,7 +1136,7 @@ class PlexonPlxReader(Reader):
         channel_id = block['channel']
         name = self.signal_channel_names.get(channel_id, "skip")
         signal_chunk = SignalChunk(
-            sample_data=block['waveforms'].reshape([-1, 1]),
+            sample_data=(block['waveforms'] * block['gain']).reshape([-1, 1]),
             sample_frequency=float(block['frequency']),
             first_sample_time=float(block['timestamp_seconds']),
             channel_ids=[int(channel_id)]
@@ -0,0 +1,250 @@
+from types import TracebackType
+from typing import Any, Self
+import logging
+import threading
+import queue
+import time
+
+from pyramid.neutral_zone.readers.readers import Reader
+from pyramid.model.model import BufferData
+
+
+class PrefetchReader(Reader):
+    """Call another reader's read_next() on a background thread, so slow reads overlap with other work.
+
+    Results from the other reader go into a bounded queue, which read_next() takes from.
+    When the queue is full, the background thread waits, so a fast reader can't get too far ahead (backpressure).
+
+    If the other reader raises StopIteration or any other exception, the background thread stops and read_next()
+    raises the same exception, in order, after any results already in the queue.
+    This way ReaderRouter sees reader errors and end-of-data the same as without prefetching.
+
+    When the queue is empty, read_next() waits for a read that's in progress on the background thread,
+    as if it had made the read itself.  It only returns None right away if the other reader's last read came
+    back empty, as from an idle socket.  Otherwise, it waits up to read_timeout seconds.
+
+    The reader keeps some stats about queue depth seen by read_next(): result_count, queue_depth_total, and
+    queue_depth_max, and wait_count for how often read_next() had to wait for the background thread.
+
+    Optional methods like seek() and read_until() go to the other reader, with the background thread stopped.
+    Since seek() moves the other reader, it also drains the queue of results prefetched from the old position.
+    """
+
+    def __init__(
+        self,
+        reader: Reader,
+        max_queue_size: int = 10,
+        read_timeout: float = 1.0,
+        empty_read_sleep: float = 0.001
+    ) -> None:
+        self.reader = reader
+        self.max_queue_size = max_queue_size
+        self.read_timeout = read_timeout
+        self.empty_read_sleep = empty_read_sleep
+
+        self.result_queue = None
+        self.thread = None
+        self.stop_event = None
+        self.last_read_empty = False
+        self.queue_active = True
+        self.unqueued_item = None
+
+        self.result_count = 0
+        self.queue_depth_total = 0
+        self.queue_depth_max = 0
+        self.wait_count = 0
+
+    def __eq__(self, other: object) -> bool:
+        """Compare readers field-wise, to support use of this class in tests."""
+        if isinstance(other, self.__class__):
+            return (
+                self.reader == other.reader
+                and self.max_queue_size == other.max_queue_size
+                and self.read_timeout == other.read_timeout
+                and self.empty_read_sleep == other.empty_read_sleep
+            )
+        else:  # pragma: no cover
+            return False
+
+    def __enter__(self) -> Self:
+        self.reader.__enter__()
+        self.result_queue = queue.Queue(maxsize=self.max_queue_size)
+        self.start_prefetch()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None
+    ) -> bool | None:
+        self.stop_prefetch()
+
+        if self.result_count:
+            logging.info(
+                f"Prefetch for {self.reader.__class__.__name__} had {self.result_count} results, "
+                + f"average queue depth {self.queue_depth_total / self.result_count:.2f}, "
+                + f"max queue depth {self.queue_depth_max}, waited {self.wait_count} times."
+            )
+
+        return self.reader.__exit__(__exc_type, __exc_value, __traceback)
+
+    def start_prefetch(self) -> None:
+        """Start reading from the other reader into the queue, on a background thread."""
+        self.stop_event = threading.Event()
+        self.last_read_empty = False
+        self.queue_active = True
+        self.thread = threading.Thread(
+            target=self.prefetch,
+            name=f"Prefetch {self.reader.__class__.__name__}",
+            daemon=True
+        )
+        self.thread.start()
+
+    def stop_prefetch(self) -> None:
+        """Stop the background thread, if any, leaving any results it already put in the queue."""
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+
+    def prefetch(self) -> None:
+        """Read from the other reader into the queue, until stopped or until the reader raises an exception."""
+        if self.unqueued_item is not None:
+            # Pick up where the last thread left off.
+            item = self.unqueued_item
+            self.unqueued_item = None
+            self.put(item)
+            if isinstance(item, Exception):
+                return
+
+        while not self.stop_event.is_set():
+            try:
+                next_result = self.reader.read_next()
+            except Exception as exception:
+                # This includes StopIteration, to be re-raised from read_next().
+                self.put(exception)
+                return
+
+            if next_result:
+                self.last_read_empty = False
+                self.put(next_result)
+            else:
+                self.last_read_empty = True
+                time.sleep(self.empty_read_sleep)
+
+    def put(self, item: dict[str, BufferData] | Exception) -> None:
+        """Put an item in the queue, waiting as long as the queue is full, or hold the item if stopped."""
+        while not self.stop_event.is_set():
+            try:
+                self.result_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        self.unqueued_item = item
+
+    def read_next(self) -> dict[str, BufferData]:
+        if self.thread is None:
+            # Resume prefetching after read_until().
+            self.start_prefetch()
+
+        queue_depth = self.result_queue.qsize()
+        try:
+            item = self.result_queue.get_nowait()
+        except queue.Empty:
+            if self.last_read_empty or not self.thread.is_alive():
+                return None
+
+            # Wait for the read in progress, like we would without prefetching.
+            self.wait_count += 1
+            try:
+                item = self.result_queue.get(timeout=self.read_timeout)
+            except queue.Empty:
+                return None
+
+        if isinstance(item, Exception):
+            raise item
+
+        self.result_count += 1
+        self.queue_depth_total += queue_depth
+        self.queue_depth_max = max(self.queue_depth_max, queue_depth)
+        return item
+
+    def can_read_until(self) -> bool:
+        """Implementing can_read_until() from superclass.
+
+        This reports False while the queue is active, which is from construction until a call to read_until().
+        Routers check this at configuration time, so by default they read through the queue with read_next().
+        """
+        return not self.queue_active and self.reader.can_read_until()
+
+    def read_until(self, time: float) -> dict[str, BufferData]:
+        """Stop prefetching and return any queued results, along with the other reader's read_until().
+
+        Prefetching resumes with the next read_next().
+        """
+        self.stop_prefetch()
+        self.queue_active = False
+
+        items = []
+        while not self.result_queue.empty():
+            items.append(self.result_queue.get_nowait())
+        if self.unqueued_item is not None:
+            items.append(self.unqueued_item)
+            self.unqueued_item = None
+
+        results = {}
+        for item in items:
+            if isinstance(item, Exception):
+                if results:
+                    # The exception came after these results, so raise it next time.
+                    self.unqueued_item = item
+                    return results
+                raise item
+
+            for name, data in item.items():
+                if name in results:
+                    results[name].append(data)
+                else:
+                    results[name] = data
+
+        try:
+            until_results = self.reader.read_until(time)
+        except StopIteration as stop_iteration:
+            if results:
+                self.unqueued_item = stop_iteration
+                return results
+            raise
+
+        if until_results:
+            for name, data in until_results.items():
+                if name in results:
+                    results[name].append(data)
+                else:
+                    results[name] = data
+
+        return results or None
+
+    def can_seek(self) -> bool:
+        """Implementing can_seek() from superclass."""
+        return self.reader.can_seek()
+
+    def seek(self, time: float) -> None:
+        """Stop prefetching, drain the queue, let the other reader seek, then restart prefetching from there."""
+        self.stop_prefetch()
+        while not self.result_queue.empty():
+            self.result_queue.get_nowait()
+        self.unqueued_item = None
+        self.reader.seek(time)
+        self.start_prefetch()
+
+    def get_seek_index(self) -> Any:
+        """Implementing get_seek_index() from superclass."""
+        return self.reader.get_seek_index()
+
+    def set_seek_index(self, seek_index: Any) -> None:
+        """Implementing set_seek_index() from superclass."""
+        self.reader.set_seek_index(seek_index)
+
+    def get_initial(self) -> dict[str, BufferData]:
+        return self.reader.get_initial()
@@ -2,6 +2,8 @@ from types import TracebackType
 from typing import Any, ContextManager
 from dataclasses import dataclass, field
 import logging
+import asyncio
+import time
 
 from pyramid.model.model import DynamicImport, BufferData, Buffer
 from pyramid.model.events import NumericEventList
@@ -63,6 +65,101 @@ class Reader(DynamicImport, ContextManager):
         """
         raise NotImplementedError  # pragma: no cover
 
+    async def read_next_async(self) -> dict[str, BufferData]:
+        """Like read_next(), but as an awaitable for use with asyncio.
+
+        By default this calls read_next() in the event loop's default thread executor,
+        so that slow reads, like decoding big files, don't hold up other tasks like GUI updates.
+        Readers that can wait on their data source without blocking, like sockets, can override this
+        to await data as it arrives, instead of polling.
+
+        Since StopIteration can't pass through asyncio futures, this raises StopAsyncIteration instead,
+        when the reader has no more data.
+        """
+        return await self.read_in_executor(self.read_next)
+
+    async def read_in_executor(self, read_method, *args) -> dict[str, BufferData]:
+        """Await the given blocking read method, like read_next or read_until, in the default thread executor.
+
+        If the awaiting task is cancelled, this lets the read in progress finish before giving up,
+        so that the reader is never used from two threads at once, for example as the reader's __exit__() runs.
+        """
+        def read_in_thread():
+            try:
+                return read_method(*args)
+            except StopIteration as stop_iteration:
+                raise StopAsyncIteration from stop_iteration
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, read_in_thread)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    def can_read_until(self) -> bool:
+        """Report whether this reader implements read_until(), to read data up to a given time.
+
+        ReaderRouter uses this to decide, at configuration time, how to catch the reader up to a target time.
+        The default is False, and the router will call read_next() repeatedly until the target time is reached.
+        Readers that can seek or search within their data, like file readers, can override this to return True
+        and implement read_until().
+        """
+        return False
+
+    def read_until(self, time: float) -> dict[str, BufferData]:
+        """Read exactly the data up to and including the given time, in one call.
+
+        This is an optional alternative to read_next(), for readers that return True from can_read_until().
+        Reading up to a target time avoids over-reading or under-reading with fixed read increments.
+
+        Return a dicitonary of any data consumed up to the given time, or None if there's no new data up to that time.
+        Raise StopIteration when the reader has no more data, same as read_next().
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    async def read_until_async(self, time: float) -> dict[str, BufferData]:
+        """Like read_until(), but as an awaitable for use with asyncio -- see read_next_async()."""
+        return await self.read_in_executor(self.read_until, time)
+
+    def can_seek(self) -> bool:
+        """Report whether this reader implements seek(), to skip data before a given time without reading it.
+
+        ReaderRouter uses this to decide, at configuration time, how to skip ahead to a target time.
+        The default is False, and the router will read and discard data until the target time is reached.
+        Readers that can seek or search within their data, like file readers, can override this to return True
+        and implement seek().
+        """
+        return False
+
+    def seek(self, time: float) -> None:
+        """Skip data before the given time, so that the next read starts at or a little before that time.
+
+        This is an optional alternative to reading and discarding data, for readers that return True from can_seek().
+        It's called after __enter__() and before the first read, for example so that parallel workers can start
+        reading partway through a session.  Implementations may be conservative and still return some data from
+        before the given time, but must not skip any data at or after the given time.
+        """
+        raise NotImplementedError  # pragma: no cover
+
+    def get_seek_index(self) -> Any:
+        """Prepare any index that seek() needs, like an index of file contents, and return it for sharing.
+
+        This is called before __enter__(), for readers that return True from can_seek().
+        run_without_plots_in_parallel() uses this to prepare an index once and share it with worker processes,
+        via set_seek_index(), so that each worker doesn't have to prepare its own.
+        The default is None, for readers that can seek without an index.
+        """
+        return None
+
+    def set_seek_index(self, seek_index: Any) -> None:
+        """Use an index from another instance's get_seek_index(), instead of preparing one.
+
+        This is called before __enter__().  The default does nothing.
+        """
+        pass  # pragma: no cover
+
     def get_initial(self) -> dict[str, BufferData]:
         """Create an initial dictionary of names and BufferData sub-types that Reader expects to produce.
 
@@ -205,6 +302,20 @@ class ReaderRouter():
 
     If the reader throws an exception, it will be ignored going forward.
     This would apply equally to errors and orderly end-of-data situations.
+
+    When the reader can_read_until(), route_until() asks the reader for exactly the data up to the target time,
+    in one call.  Otherwise route_until() calls read_next() repeatedly until the reader catches up to the target time.
+    Likewise, when the reader can_seek(), seek() asks the reader to skip data before a target time without reading it.
+    Otherwise seek() reads through data up to the target time, discarding it from buffers as it goes.
+
+    Buffers copy appended data into their own storage, so most routes can pass reader results along as-is.
+    The router only copies a result before a route's transformers when the transformers might modify the
+    result in place and a later route still needs the original.  This is decided once, up front, from the
+    routes and transformers -- see route_copies_data().  The router keeps counts of the copies it does make,
+    in copy_count and bytes_copied.
+
+    The router tracks the latest timestamp routed to any buffer, in max_buffer_time.
+    It updates this from each increment of appended data, rather than rescanning buffers.
     """
 
     def __init__(
@@ -226,6 +337,13 @@ class ReaderRouter():
         self.reader_exception = None
         self.max_buffer_time = 0.0
         self.clock_drift = 0.0
+        self.last_arrival_time = None
+
+        self.copy_count = 0
+        self.bytes_copied = 0
+        self.route_copies = [self.route_copies_data(index) for index in range(len(routes))]
+        self.reads_until = reader.can_read_until()
+        self.seeks = reader.can_seek()
 
     def __eq__(self, other: object) -> bool:
         """Compare routers field-wise, to support use of this class in tests."""
@@ -243,13 +361,32 @@ class ReaderRouter():
     def still_going(self) -> bool:
         return not self.reader_exception
 
+    def route_copies_data(self, route_index: int) -> bool:
+        """Decide whether the indexed route needs its own copy of reader results, before applying its transformers.
+
+        A route needs a copy when one of its transformers might modify data in place, and a later route
+        consumes the same reader result.  Otherwise the route can use the reader result as-is:
+        a route with no transformers, or with transformers that only return new data, leaves the result untouched,
+        and a result consumed by only one route (or by the last of several routes) isn't needed afterwards.
+        """
+        route = self.routes[route_index]
+        if not any(transformer.transforms_in_place() for transformer in route.transformers):
+            return False
+
+        later_routes = self.routes[route_index + 1:]
+        return any(later.reader_result_name == route.reader_result_name for later in later_routes)
+
     def route_next(self) -> bool:
         """Ask the reader to consume an increment of data, unconditoinally, and deal results into connected buffers."""
+        return self.route_read(self.reader.read_next)
+
+    def route_read(self, read_method, *args) -> bool:
+        """Call the given reader method, like read_next or read_until, and deal results into connected buffers."""
         if self.reader_exception:
             return False
 
         try:
-            read_result = self.reader.read_next()
+            read_result = read_method(*args)
         except StopIteration as stop_iteration:
             self.reader_exception = stop_iteration
             logging.info(f"Reader {self.reader.__class__.__name__} is done (it raised StopIteration).")
@@ -262,9 +399,41 @@ class ReaderRouter():
             )
             return False
 
+        return self.route_results(read_result)
+
+    async def route_next_async(self) -> bool:
+        """Like route_next(), but await the reader's read_next_async() instead of calling read_next()."""
+        return await self.route_read_async(self.reader.read_next_async)
+
+    async def route_read_async(self, read_method, *args) -> bool:
+        """Like route_read(), but await the given async reader method, like read_next_async or read_until_async."""
+        if self.reader_exception:
+            return False
+
+        try:
+            read_result = await read_method(*args)
+        except StopAsyncIteration as stop_iteration:
+            self.reader_exception = stop_iteration
+            logging.info(f"Reader {self.reader.__class__.__name__} is done (it raised StopAsyncIteration).")
+            return False
+        except Exception as exception:
+            self.reader_exception = exception
+            logging.warning(
+                f"Reader {self.reader.__class__.__name__} is disabled (it raised an unexpected error):",
+                exc_info=True
+            )
+            return False
+
+        return self.route_results(read_result)
+
+    def route_results(self, read_result: dict[str, BufferData]) -> bool:
+        """Deal results from the reader into connected buffers."""
         if not read_result:
             return False
 
+        # Note when these results arrived, before spending any time routing them.
+        self.last_arrival_time = time.perf_counter()
+
         if self.sync_config is not None and self.sync_registry is not None:
             # Add any new sync events to the sync registry.
             event_data = read_result.get(self.sync_config.reader_result_name, None)
@@ -276,7 +445,7 @@ class ReaderRouter():
                 for event_time in sync_event_times:
                     self.sync_registry.record_event(self.sync_config.reader_name, event_time)
 
-        for route in self.routes:
+        for route, route_copies in zip(self.routes, self.route_copies):
             buffer = self.named_buffers.get(route.buffer_name, None)
             if not buffer:
                 continue
@@ -285,7 +454,13 @@ class ReaderRouter():
             if not data:
                 continue
 
-            data_copy = data.copy()
+            if route_copies:
+                data_copy = data.copy()
+                self.copy_count += 1
+                self.bytes_copied += data_copy.byte_count()
+            else:
+                data_copy = data
+
             if route.transformers:
                 try:
                     for transformer in route.transformers:
@@ -297,6 +472,8 @@ class ReaderRouter():
                     )
                     continue
 
+            # Note the latest timestamp in the data to append, before the buffer takes it.
+            appended_end_time = data_copy.get_end_time()
             try:
                 buffer.data.append(data_copy)
             except Exception as exception:
@@ -306,18 +483,22 @@ class ReaderRouter():
                 )
                 continue
 
-        # Update the high water mark for the reader -- the latest timestamp seen so far.
-        for buffer in self.named_buffers.values():
-            buffer_end_time = buffer.data.get_end_time()
-            if buffer_end_time and buffer_end_time > self.max_buffer_time:
-                self.max_buffer_time = buffer_end_time
+            # Update the high water mark for the reader -- the latest timestamp seen so far.
+            # This only looks at the appended data, not everything in the buffer.
+            if appended_end_time is not None and appended_end_time > self.max_buffer_time:
+                self.max_buffer_time = appended_end_time
 
         return True
 
     def route_until(self, target_reference_time: float) -> float:
         """Ask the reader to read data 0 or more times until catching up to a target time."""
-        empty_reads = 0
         target_reader_time = target_reference_time + self.clock_drift
+        if self.reads_until:
+            # The reader can read exactly up to the target time, in one call.
+            self.route_read(self.reader.read_until, target_reader_time)
+            return self.max_buffer_time
+
+        empty_reads = 0
         while self.max_buffer_time < target_reader_time and empty_reads <= self.empty_reads_allowed:
             got_data = self.route_next()
             if got_data:
@@ -327,6 +508,57 @@ class ReaderRouter():
 
         return self.max_buffer_time
 
+    async def route_until_async(self, target_reference_time: float) -> float:
+        """Like route_until(), but await the reader's read_next_async() instead of calling read_next()."""
+        target_reader_time = target_reference_time + self.clock_drift
+        if self.reads_until:
+            # The reader can read exactly up to the target time, in one call.
+            await self.route_read_async(self.reader.read_until_async, target_reader_time)
+            return self.max_buffer_time
+
+        empty_reads = 0
+        while self.max_buffer_time < target_reader_time and empty_reads <= self.empty_reads_allowed:
+            got_data = await self.route_next_async()
+            if got_data:
+                empty_reads = 0
+            else:
+                empty_reads += 1
+
+        return self.max_buffer_time
+
+    def seek(self, target_reference_time: float) -> None:
+        """Skip reader data before a target time, without keeping it in buffers.
+
+        When the reader can_seek(), this asks the reader to skip ahead directly.  Otherwise this reads data
+        0 or more times until catching up to the target time, as in route_until(), and after each read discards
+        buffered data before the target time.  This way buffers hold at most one read of data from before the
+        target time, instead of everything from the start of the reader.
+        """
+        target_reader_time = target_reference_time + self.clock_drift
+        if self.seeks:
+            if self.reader_exception:
+                return
+
+            try:
+                self.reader.seek(target_reader_time)
+            except Exception as exception:
+                self.reader_exception = exception
+                logging.warning(
+                    f"Reader {self.reader.__class__.__name__} is disabled (it raised an unexpected error):",
+                    exc_info=True
+                )
+            return
+
+        empty_reads = 0
+        while self.max_buffer_time < target_reader_time and empty_reads <= self.empty_reads_allowed:
+            got_data = self.route_next()
+            if got_data:
+                empty_reads = 0
+                for buffer in self.named_buffers.values():
+                    buffer.data.discard_before(buffer.reference_time_to_raw(target_reference_time))
+            else:
+                empty_reads += 1
+
     def update_drift_estimate(self, reference_end_time: float = None) -> float:
         """Get a reader clock drift estimate from the sync registry and propagate it to all buffers."""
         if self.sync_config is None or self.sync_registry is None:
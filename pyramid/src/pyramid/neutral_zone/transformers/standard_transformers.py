@@ -34,6 +34,9 @@ class OffsetThenGain(Transformer):
             logging.warning(f"OffsetThenGain doesn't know how to apply to {data.__class__.__name__}")
         return data
 
+    def transforms_in_place(self) -> bool:
+        return True
+
 
 class FilterRange(Transformer):
     """Filter values, taking only those in the half open interval [min, max), from a Pyramid type like NumericEventList."""
@@ -49,3 +52,6 @@ class FilterRange(Transformer):
         else:  # pragma: no cover
             logging.warning(f"FilterRange doesn't know how to apply to {data.__class__.__name__}")
             return data
+
+    def transforms_in_place(self) -> bool:
+        return False
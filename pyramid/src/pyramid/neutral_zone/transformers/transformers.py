@@ -6,3 +6,13 @@ class Transformer(DynamicImport):
 
     def transform(self, data: BufferData) -> BufferData:
         raise NotImplementedError  # pragma: no cover
+
+    def transforms_in_place(self) -> bool:
+        """Report whether transform() may modify the given data in place, as opposed to returning new data.
+
+        ReaderRouter uses this to decide, at configuration time, which reader results it needs to copy.
+        Data shared by several routes must be copied before an in-place transformer gets it.
+        The default is True, which is always safe.
+        Transformers that only return new data can override this to return False and avoid copying.
+        """
+        return True
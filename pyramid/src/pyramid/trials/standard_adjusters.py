@@ -39,6 +39,7 @@ class SignalSmoother(TrialEnhancer):
             channel_index = signal.channel_ids.index(self.channel_id)
 
         # Smooth the signal data in place, keeping it's size the "same".
+        signal.ensure_writable()
         signal.sample_data[:, channel_index] = np.convolve(
             signal.sample_data[:, channel_index],
             self.kernel,
@@ -1,9 +1,11 @@
 import logging
+import time
 from types import TracebackType
-from typing import Self, ContextManager
+from typing import Any, Self, ContextManager
 from collections.abc import Iterator
 from pathlib import Path
 
+import base64
 import json
 import h5py
 import numpy as np
@@ -13,6 +15,48 @@ from pyramid.model.signals import SignalChunk
 from pyramid.trials.trials import Trial
 
 
+class TrialSelection():
+    """Choose which trial fields, buffers, and enhancements to read from a trial file.
+
+    None means "all" for each of fields, buffers, and enhancements.
+    Trial times are always read.  Unselected data are skipped, and left empty in the trials that are read.
+    """
+
+    field_names = ["numeric_events", "signals", "enhancements", "enhancement_categories"]
+
+    def __init__(
+        self,
+        fields: list[str] = None,
+        buffers: list[str] = None,
+        enhancements: list[str] = None
+    ) -> None:
+        """Create a new TrialSelection.
+
+        Args:
+            fields:         Names of Trial fields to read, from "numeric_events", "signals", "enhancements",
+                            and "enhancement_categories".  Default is None, read all fields.
+            buffers:        Names of numeric event and signal buffers to read.  Default is None, read all buffers.
+            enhancements:   Names of enhancements to read.  Default is None, read all enhancements.
+        """
+        if fields is not None:
+            unknown_fields = set(fields).difference(self.field_names)
+            if unknown_fields:
+                raise ValueError(f"Unknown trial fields {sorted(unknown_fields)}, expected some of {self.field_names}")
+            fields = set(fields)
+        self.fields = fields
+        self.buffers = None if buffers is None else set(buffers)
+        self.enhancements = None if enhancements is None else set(enhancements)
+
+    def includes_field(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def includes_buffer(self, name: str) -> bool:
+        return self.buffers is None or name in self.buffers
+
+    def includes_enhancement(self, name: str) -> bool:
+        return self.enhancements is None or name in self.enhancements
+
+
 class TrialFile(ContextManager):
     """Write and read Pyramid Trials to and from a file.
 
@@ -46,26 +90,91 @@ class TrialFile(ContextManager):
 
         For example, the file could be opened and closed during each append_trial(),
         as opposed to being opened once during __enter__() and held open until __exit__().
+        Or, a file held open until __exit__() could be flushed regularly, and read_trials() could read through
+        the same open file.
         """
         raise NotImplementedError  # pragma: no cover
 
-    def read_trials(self) -> Iterator[Trial]:
+    def read_trials(
+        self,
+        start: int = 0,
+        stop: int = None,
+        fields: list[str] = None,
+        buffers: list[str] = None,
+        enhancements: list[str] = None
+    ) -> Iterator[Trial]:
         """Yield a sequence of trials from the file on disk, one at a time, in order.
 
         Implementations should implement this as a Python generator, using the yield keyword.
         https://wiki.python.org/moin/Generators
 
+        By default this yields all trials.  Given start and/or stop, this yields the range of trials
+        from index start up to but not including stop, with the same meaning as a Python slice [start:stop].
+        Implementations should seek directly to trial start, instead of reading and discarding earlier trials.
+
+        By default this reads all trial data.  Given fields, buffers, and/or enhancements, this reads only the
+        selected data, as described in TrialSelection.  Implementations should avoid reading or converting
+        unselected data, instead of reading everything and discarding the rest.
+
         It's OK to only return trials that were written to disk as of when read_trials() was first called.
         The generator doesn't need to check if new trials were written concurrently during iteration.
         """
         raise NotImplementedError  # pragma: no cover
 
+    def read_trial(
+        self,
+        index: int,
+        fields: list[str] = None,
+        buffers: list[str] = None,
+        enhancements: list[str] = None
+    ) -> Trial:
+        """Read one trial from the file on disk, at the given index, with the same meaning as a Python list [index].
+
+        Given fields, buffers, and/or enhancements, this reads only the selected data, like read_trials().
+
+        Raises IndexError if the file doesn't have a trial at the given index.
+        """
+        if index == -1:
+            stop = None
+        else:
+            stop = index + 1
+        for trial in self.read_trials(index, stop, fields, buffers, enhancements):
+            return trial
+        raise IndexError(f"Trial index {index} out of range for {self.file_name}")
+
+    def delete(self) -> None:
+        """Delete the file on disk, along with any other files the implementation keeps next to it."""
+        Path(self.file_name).unlink(missing_ok=True)
+
     @classmethod
-    def for_file_suffix(cls, file_name: str) -> Self:
-        suffix = Path(file_name).suffix.lower()
+    def for_file_suffix(cls, file_name: str, format: str = None) -> Self:
+        """Choose a TrialFile implementation based on the file name suffix, or an explicit format.
+
+        Suffixes ".json" and ".jsonl" choose JsonTrialFile.
+        Suffixes ".hdf", ".h5", ".hdf5", and ".he5" choose Hdf5TrialFile, or PackedHdf5TrialFile when
+        preceeded by ".packed", as in "trials.packed.hdf5".
+        Explicit formats "json", "hdf5", and "packed_hdf5" choose the same, regardless of suffix.
+        Explicit format "json_base64" chooses JsonTrialFile with compact, base64 array encoding.
+        """
+        if format is not None:
+            if format == "json":
+                return JsonTrialFile(file_name)
+            elif format == "json_base64":
+                return JsonTrialFile(file_name, array_encoding="base64")
+            elif format == "hdf5":
+                return Hdf5TrialFile(file_name)
+            elif format == "packed_hdf5":
+                return PackedHdf5TrialFile(file_name)
+            else:
+                raise NotImplementedError(f"Unsupported trial file format: {format}")
+
+        suffixes = [suffix.lower() for suffix in Path(file_name).suffixes]
+        suffix = suffixes[-1] if suffixes else ""
         if suffix in {".json", ".jsonl"}:
             return JsonTrialFile(file_name)
         elif suffix in {".hdf", ".h5", ".hdf5", ".he5"}:
+            if len(suffixes) > 1 and suffixes[-2] == ".packed":
+                return PackedHdf5TrialFile(file_name)
             return Hdf5TrialFile(file_name)
         else:
             raise NotImplementedError(f"Unsupported trial file suffix: {suffix}")
@@ -76,14 +185,48 @@ class JsonTrialFile(TrialFile):
 
     This trial file implementation uses the concept of "JSON Lines" to support large, streamable JSON files.
     https://jsonlines.org/
+
+    To support read_trial() and read_trials() from the middle of the file, this keeps an index of byte offsets
+    for each line, in a file next to the trial file, named like "trial_file.json.index".
+
+    By default, numeric arrays are written as JSON lists of numbers, which are human-readable but large and slow.
+    With array_encoding "base64", arrays are written as objects with the base64 of the array's little-endian bytes,
+    plus its "dtype" and "shape".  These lines have the extra field "array_encoding": "base64", so that readers
+    can handle lines written either way.
     """
 
-    def __init__(self, file_name: str) -> None:
+    array_encodings = ["text", "base64"]
+
+    def __init__(self, file_name: str, write_index: bool = False, array_encoding: str = "text") -> None:
+        """Create a new JsonTrialFile.
+
+        Args:
+            file_name:      Path to the JSON Lines file to write and/or read.
+            write_index:    Whether to write the byte-offset index file next to file_name, during append_trial().
+                            Default is False, build the index later, on the first read of a trial or range of trials.
+            array_encoding: How to write numeric arrays, "text" for JSON lists of numbers, or "base64" for compact
+                            binary.  Default is "text".  Either way, this can read lines written either way.
+        """
+        if array_encoding not in self.array_encodings:
+            raise ValueError(f"Unsupported array encoding {array_encoding}, expected one of {self.array_encodings}")
+
         self.file_name = file_name
+        self.write_index = write_index
+        self.index_file_name = f"{file_name}.index"
+        self.array_encoding = array_encoding
+
+        self.line_ends = None
 
     def __enter__(self) -> Self:
         with open(self.file_name, "w", encoding="utf-8"):
             logging.info(f"Creating empty JSON trial file: {self.file_name}")
+        if self.write_index:
+            with open(self.index_file_name, "wb"):
+                pass
+            self.line_ends = np.empty([0], dtype="<i8")
+        else:
+            Path(self.index_file_name).unlink(missing_ok=True)
+            self.line_ends = None
         return self
 
     def append_trial(self, trial: Trial) -> None:
@@ -92,29 +235,121 @@ class JsonTrialFile(TrialFile):
         with open(self.file_name, 'a', encoding="utf-8") as f:
             f.write(trial_json + "\n")
 
-    def read_trials(self) -> Iterator[Trial]:
-        with open(self.file_name, 'r', encoding="utf-8") as f:
-            for json_line in f:
-                trial_dict = json.loads(json_line)
-                yield self.load_trial(trial_dict)
+        if self.write_index and self.line_ends is not None:
+            line_end = np.array([Path(self.file_name).stat().st_size], dtype="<i8")
+            with open(self.index_file_name, "ab") as f:
+                f.write(line_end.tobytes())
+            self.line_ends = np.concatenate([self.line_ends, line_end])
+
+    def read_trials(
+        self,
+        start: int = 0,
+        stop: int = None,
+        fields: list[str] = None,
+        buffers: list[str] = None,
+        enhancements: list[str] = None
+    ) -> Iterator[Trial]:
+        selection = TrialSelection(fields, buffers, enhancements)
+        if start == 0 and stop is None:
+            # Reading all trials, no need for the index.
+            with open(self.file_name, 'r', encoding="utf-8") as f:
+                for json_line in f:
+                    trial_dict = json.loads(json_line)
+                    yield self.load_trial(trial_dict, selection)
+            return
+
+        line_ends = self.load_index()
+        start, stop, _ = slice(start, stop).indices(line_ends.size)
+        if start >= stop:
+            return
+
+        with open(self.file_name, 'rb') as f:
+            f.seek(line_ends[start - 1] if start > 0 else 0)
+            for _ in range(stop - start):
+                trial_dict = json.loads(f.readline())
+                yield self.load_trial(trial_dict, selection)
+
+    def delete(self) -> None:
+        Path(self.file_name).unlink(missing_ok=True)
+        Path(self.index_file_name).unlink(missing_ok=True)
+
+    def load_index(self) -> np.ndarray:
+        """Get the byte offset where each line / trial ends, from memory, from the index file, or by scanning the file.
+
+        The index file is a sequence of little-endian int64 byte offsets, one per line, stored next to the trial file.
+        When the index is missing or behind the trial file, this scans the unindexed lines and updates the index file.
+        """
+        file_size = Path(self.file_name).stat().st_size
+        if self.line_ends is not None and self.line_ends.size and self.line_ends[-1] == file_size:
+            return self.line_ends
+
+        index_path = Path(self.index_file_name)
+        if index_path.exists():
+            line_ends = np.fromfile(index_path, dtype="<i8")
+        else:
+            line_ends = np.empty([0], dtype="<i8")
+
+        with open(self.file_name, 'rb') as f:
+            if line_ends.size:
+                # Check that the index agrees with the file, as far as the index goes.
+                indexed_size = line_ends[-1]
+                f.seek(max(0, indexed_size - 1))
+                if indexed_size > file_size or f.read(1) != b"\n":
+                    logging.warning(f"Rebuilding stale JSON trial file index: {self.index_file_name}")
+                    line_ends = np.empty([0], dtype="<i8")
+            indexed_size = line_ends[-1] if line_ends.size else 0
 
-    def dump_numeric_event_list(self, numeric_event_list: NumericEventList) -> list:
-        return numeric_event_list.event_data.tolist()
+            if indexed_size < file_size:
+                f.seek(indexed_size)
+                new_line_ends = []
+                line_end = indexed_size
+                for line in f:
+                    line_end += len(line)
+                    if line.endswith(b"\n"):
+                        new_line_ends.append(line_end)
+                line_ends = np.concatenate([line_ends, np.array(new_line_ends, dtype="<i8")])
+                try:
+                    line_ends.tofile(index_path)
+                except OSError:
+                    logging.warning(f"Unable to write JSON trial file index: {self.index_file_name}", exc_info=True)
+
+        self.line_ends = line_ends
+        return line_ends
+
+    def dump_array(self, array: np.ndarray) -> list | dict:
+        if self.array_encoding == "base64":
+            little_endian = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+            return {
+                "dtype": little_endian.dtype.str,
+                "shape": list(little_endian.shape),
+                "data": base64.b64encode(little_endian).decode("ascii")
+            }
+        return array.tolist()
 
-    def load_numeric_event_list(self, raw_list: list) -> NumericEventList:
-        return NumericEventList(np.array(raw_list))
+    def load_array(self, raw_array: list | dict, array_encoding: str = "text") -> np.ndarray:
+        if array_encoding == "base64":
+            array_bytes = base64.b64decode(raw_array["data"])
+            # Copy out of the read-only bytes, so that transformers can modify loaded data in place.
+            return np.frombuffer(array_bytes, dtype=raw_array["dtype"]).reshape(raw_array["shape"]).copy()
+        return np.array(raw_array)
+
+    def dump_numeric_event_list(self, numeric_event_list: NumericEventList) -> list | dict:
+        return self.dump_array(numeric_event_list.get_event_data())
+
+    def load_numeric_event_list(self, raw_list: list | dict, array_encoding: str = "text") -> NumericEventList:
+        return NumericEventList(self.load_array(raw_list, array_encoding))
 
     def dump_signal_chunk(self, signal_chunk: SignalChunk) -> dict:
         return {
-            "signal_data": signal_chunk.sample_data.tolist(),
+            "signal_data": self.dump_array(signal_chunk.sample_data),
             "sample_frequency": signal_chunk.sample_frequency,
             "first_sample_time": signal_chunk.first_sample_time,
             "channel_ids": signal_chunk.channel_ids
         }
 
-    def load_signal_chunk(self, raw_dict: dict) -> SignalChunk:
+    def load_signal_chunk(self, raw_dict: dict, array_encoding: str = "text") -> SignalChunk:
         return SignalChunk(
-            sample_data=np.array(raw_dict["signal_data"]),
+            sample_data=self.load_array(raw_dict["signal_data"], array_encoding),
             sample_frequency=raw_dict["sample_frequency"],
             first_sample_time=raw_dict["first_sample_time"],
             channel_ids=raw_dict["channel_ids"]
@@ -127,6 +362,9 @@ class JsonTrialFile(TrialFile):
             "wrt_time": trial.wrt_time
         }
 
+        if self.array_encoding != "text":
+            raw_dict["array_encoding"] = self.array_encoding
+
         if trial.numeric_events:
             raw_dict["numeric_events"] = {
                 name: self.dump_numeric_event_list(event_list) for name, event_list in trial.numeric_events.items()
@@ -145,16 +383,36 @@ class JsonTrialFile(TrialFile):
 
         return raw_dict
 
-    def load_trial(self, raw_dict) -> Trial:
-        numeric_events = {
-            name: self.load_numeric_event_list(event_data)
-            for name, event_data in raw_dict.get("numeric_events", {}).items()
-        }
+    def load_trial(self, raw_dict, selection: TrialSelection = TrialSelection()) -> Trial:
+        # Lines without an array_encoding flag were written before base64 encoding was an option.
+        array_encoding = raw_dict.get("array_encoding", "text")
+        if array_encoding not in self.array_encodings:
+            raise ValueError(f"Unsupported array encoding {array_encoding}, expected one of {self.array_encodings}")
 
-        signals = {
-            name: self.load_signal_chunk(signal_data)
-            for name, signal_data in raw_dict.get("signals", {}).items()
-        }
+        # Each whole line gets parsed as JSON, but unselected data don't get converted to NumPy.
+        numeric_events = {}
+        if selection.includes_field("numeric_events"):
+            for name, event_data in raw_dict.get("numeric_events", {}).items():
+                if selection.includes_buffer(name):
+                    numeric_events[name] = self.load_numeric_event_list(event_data, array_encoding)
+
+        signals = {}
+        if selection.includes_field("signals"):
+            for name, signal_data in raw_dict.get("signals", {}).items():
+                if selection.includes_buffer(name):
+                    signals[name] = self.load_signal_chunk(signal_data, array_encoding)
+
+        enhancements = {}
+        if selection.includes_field("enhancements"):
+            enhancements = {
+                name: value
+                for name, value in raw_dict.get("enhancements", {}).items()
+                if selection.includes_enhancement(name)
+            }
+
+        enhancement_categories = {}
+        if selection.includes_field("enhancement_categories"):
+            enhancement_categories = raw_dict.get("enhancement_categories", {})
 
         trial = Trial(
             start_time=raw_dict["start_time"],
@@ -162,8 +420,8 @@ class JsonTrialFile(TrialFile):
             wrt_time=raw_dict["wrt_time"],
             numeric_events=numeric_events,
             signals=signals,
-            enhancements=raw_dict.get("enhancements", {}),
-            enhancement_categories=raw_dict.get("enhancement_categories", {})
+            enhancements=enhancements,
+            enhancement_categories=enhancement_categories
         )
         return trial
 
@@ -174,26 +432,126 @@ class Hdf5TrialFile(TrialFile):
     The trial file should be loadable from many environments, including:
      - Python: https://docs.h5py.org/en/latest/quick.html
      - Matlab: https://www.mathworks.com/help/matlab/ref/h5read.html
+
+    By default, this opens and closes the file for each append_trial(), so that other processes like Matlab,
+    h5py, or another Pyramid instance can open the trial file between appends, during a run.
+
+    With hold_open=True, this holds the file open for writing from __enter__() until __exit__(), and counts trials
+    in memory, instead of opening the file and counting its groups for each append_trial().
+    To limit what's lost if Pyramid crashes, this flushes the file to disk every flush_interval seconds or
+    every flush_trial_count trials, whichever comes first.
+    HDF5 file locking prevents other processes from opening a held-open file until __exit__().
+    While the file is held open it can only be read through the same instance: read_trials() reads through
+    the same open file.
     """
 
-    def __init__(self, file_name: str) -> None:
+    def __init__(
+        self,
+        file_name: str,
+        hold_open: bool = False,
+        flush_interval: float = 1.0,
+        flush_trial_count: int = 100
+    ) -> None:
+        """Create a new Hdf5TrialFile.
+
+        Args:
+            file_name:          Path to the HDF5 file to write and/or read.
+            hold_open:          Whether to hold the file open for writing from __enter__() until __exit__().
+                                Default is False, to open and close the file for each append_trial().
+            flush_interval:     When holding the file open, the most seconds to wait between flushes to disk.
+                                Default is 1.0 seconds.
+            flush_trial_count:  When holding the file open, the most trials to append between flushes to disk.
+                                Default is 100 trials.
+        """
         self.file_name = file_name
+        self.hold_open = hold_open
+        self.flush_interval = flush_interval
+        self.flush_trial_count = flush_trial_count
+
+        self.h5_file = None
+        self.trial_count = 0
+        self.unflushed_count = 0
+        self.last_flush_time = None
 
     def __enter__(self) -> Self:
-        with h5py.File(self.file_name, "w"):
-            logging.info(f"Creating empty HDF5 trial file: {self.file_name}")
+        logging.info(f"Creating empty HDF5 trial file: {self.file_name}")
+        if self.hold_open:
+            self.h5_file = h5py.File(self.file_name, "w")
+            self.last_flush_time = time.monotonic()
+        else:
+            with h5py.File(self.file_name, "w"):
+                pass
+        self.trial_count = 0
+        self.unflushed_count = 0
         return self
 
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None
+    ) -> bool | None:
+        if self.h5_file is not None:
+            self.h5_file.close()
+            self.h5_file = None
+
     def append_trial(self, trial: Trial) -> None:
-        with h5py.File(self.file_name, "a") as f:
-            group_name = f"trial_{len(f.keys()):04d}"
-            trial_group = f.create_group(group_name, track_order=True)
-            self.dump_trial(trial, trial_group)
+        if self.h5_file is None:
+            with h5py.File(self.file_name, "a") as f:
+                group_name = f"trial_{len(f.keys()):04d}"
+                trial_group = f.create_group(group_name, track_order=True)
+                self.dump_trial(trial, trial_group)
+            return
+
+        group_name = f"trial_{self.trial_count:04d}"
+        trial_group = self.h5_file.create_group(group_name, track_order=True)
+        self.dump_trial(trial, trial_group)
+        self.trial_count += 1
+        self.unflushed_count += 1
+
+        if (self.unflushed_count >= self.flush_trial_count
+                or time.monotonic() - self.last_flush_time >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Flush trials appended so far from the held-open file to disk."""
+        if self.h5_file is not None:
+            self.h5_file.flush()
+            self.unflushed_count = 0
+            self.last_flush_time = time.monotonic()
+
+    def read_trials(
+        self,
+        start: int = 0,
+        stop: int = None,
+        fields: list[str] = None,
+        buffers: list[str] = None,
+        enhancements: list[str] = None
+    ) -> Iterator[Trial]:
+        selection = TrialSelection(fields, buffers, enhancements)
+        if self.h5_file is not None:
+            # Read through the file we're holding open for writing.
+            yield from self.load_trials(self.h5_file, start, stop, selection)
+            return
 
-    def read_trials(self) -> Iterator[Trial]:
         with h5py.File(self.file_name, "r") as f:
-            for trial_group in f.values():
-                yield self.load_trial(trial_group)
+            yield from self.load_trials(f, start, stop, selection)
+
+    def load_trials(
+        self,
+        h5_file: h5py.File,
+        start: int = 0,
+        stop: int = None,
+        selection: TrialSelection = TrialSelection()
+    ) -> Iterator[Trial]:
+        """Yield trials from an open file, looking up each trial group directly by name.
+
+        Looking up groups by trial index, instead of iterating over all groups, keeps trials in numeric order
+        even past trial_9999, and lets a range of trials start anywhere in the file without reading earlier trials.
+        """
+        start, stop, _ = slice(start, stop).indices(len(h5_file))
+        for index in range(start, stop):
+            yield self.load_trial(h5_file[f"trial_{index:04d}"], selection)
 
     def dump_numeric_event_list(
         self,
@@ -201,10 +559,11 @@ class Hdf5TrialFile(TrialFile):
         name: str,
         numeric_events_group: h5py.Group
     ) -> None:
-        if numeric_event_list.event_data.size > 1:
-            numeric_events_group.create_dataset(name, data=numeric_event_list.event_data, compression="gzip")
+        event_data = numeric_event_list.get_event_data()
+        if event_data.size > 1:
+            numeric_events_group.create_dataset(name, data=event_data, compression="gzip")
         else:
-            numeric_events_group.create_dataset(name, data=numeric_event_list.event_data)
+            numeric_events_group.create_dataset(name, data=event_data)
 
     def load_numeric_event_list(self, dataset: h5py.Dataset) -> NumericEventList:
         return NumericEventList(np.array(dataset[()]))
@@ -270,30 +629,36 @@ class Hdf5TrialFile(TrialFile):
             categories_json = json.dumps(trial.enhancement_categories)
             trial_group.attrs["enhancement_categories"] = categories_json
 
-    def load_trial(self, trial_group: h5py.Group) -> Trial:
+    def load_trial(self, trial_group: h5py.Group, selection: TrialSelection = TrialSelection()) -> Trial:
+        # Unselected datasets don't get read from disk.
         numeric_events = {}
         numeric_events_group = trial_group.get("numeric_events", None)
-        if numeric_events_group:
+        if numeric_events_group and selection.includes_field("numeric_events"):
             for name, dataset in numeric_events_group.items():
-                numeric_events[name] = self.load_numeric_event_list(dataset)
+                if selection.includes_buffer(name):
+                    numeric_events[name] = self.load_numeric_event_list(dataset)
 
         signals = {}
         signals_group = trial_group.get("signals", None)
-        if signals_group:
+        if signals_group and selection.includes_field("signals"):
             for name, dataset in signals_group.items():
-                signals[name] = self.load_signal_chunk(dataset)
+                if selection.includes_buffer(name):
+                    signals[name] = self.load_signal_chunk(dataset)
 
+        # Enhancements are stored together as one JSON attribute, so select them after parsing.
+        enhancements = {}
         enhancements_json = trial_group.attrs.get("enhancements", None)
-        if enhancements_json:
-            enhancements = json.loads(enhancements_json)
-        else:
-            enhancements = {}
+        if enhancements_json and selection.includes_field("enhancements"):
+            enhancements = {
+                name: value
+                for name, value in json.loads(enhancements_json).items()
+                if selection.includes_enhancement(name)
+            }
 
+        enhancement_categories = {}
         categories_json = trial_group.attrs.get("enhancement_categories", None)
-        if categories_json:
+        if categories_json and selection.includes_field("enhancement_categories"):
             enhancement_categories = json.loads(categories_json)
-        else:
-            enhancement_categories = {}
 
         if trial_group.attrs["end_time"].size < 1:
             end_time = None
@@ -309,3 +674,442 @@ class Hdf5TrialFile(TrialFile):
             enhancement_categories=enhancement_categories
         )
         return trial
+
+
+class PackedHdf5TrialFile(TrialFile):
+    """HDF5-based trial file using one concatenated dataset per named buffer, plus per-trial offsets.
+
+    Compared to Hdf5TrialFile, with one group per trial and one small dataset per buffer per trial,
+    this "packed" layout has a fixed number of datasets that grow as trials are appended.
+    This is faster to write and much faster to read for sessions with many trials and many buffers.
+
+    The layout is columnar, with one row per trial in each per-trial column:
+     - /trials/start_time, /trials/end_time, /trials/wrt_time: trial times, with NaN for None
+     - /trials/enhancement_categories: JSON string per trial
+     - /numeric_events/<name>/data: event data for all trials, concatenated by rows
+     - /numeric_events/<name>/offsets and counts: rows of data for each trial, with count -1 when the trial omits <name>
+     - /signals/<name>/data, offsets, and counts: sample data for all trials, the same way
+     - /signals/<name>/sample_frequency and first_sample_time: per-trial columns, with NaN for None
+     - /signals/<name> attribute "channel_ids": channel ids shared by all trials
+     - /enhancements/<name>/values: int64 column when all values are ints, float64 when all values are numbers,
+       otherwise a JSON string column
+     - /enhancements/<name>/present: bool column, False when the trial omits <name>
+
+    Numeric event and signal data are stored as float64.
+    Enhancements come back as the same type as stored, so ints stay ints, and NaN values stay distinct from absent.
+
+    This holds the file open for writing from __enter__() until __exit__().
+    It collects appended trials in memory and writes them in batches, every flush_interval seconds or
+    every flush_trial_count trials, whichever comes first.
+    """
+
+    # Enhancement column types, from narrowest to widest, with filler values for absent enhancements.
+    enhancement_dtypes = [np.dtype(np.int64), np.dtype(np.float64), h5py.string_dtype()]
+    enhancement_fill_values = [0, np.nan, ""]
+
+    def __init__(
+        self,
+        file_name: str,
+        flush_interval: float = 1.0,
+        flush_trial_count: int = 100,
+        compression: str = "gzip"
+    ) -> None:
+        """Create a new PackedHdf5TrialFile.
+
+        Args:
+            file_name:          Path to the HDF5 file to write and/or read.
+            flush_interval:     The most seconds to wait between writing batches of trials to disk.
+                                Default is 1.0 seconds.
+            flush_trial_count:  The most trials to collect between writing batches of trials to disk.
+                                Default is 100 trials.
+            compression:        HDF5 compression to use for concatenated data, like "gzip" or "lzf".
+                                Default is "gzip".  Use None for no compression.
+        """
+        self.file_name = file_name
+        self.flush_interval = flush_interval
+        self.flush_trial_count = flush_trial_count
+        self.compression = compression
+
+        self.h5_file = None
+        self.pending_trials = []
+        self.flushed_count = 0
+        self.last_flush_time = None
+
+    def __enter__(self) -> Self:
+        logging.info(f"Creating empty packed HDF5 trial file: {self.file_name}")
+        self.h5_file = h5py.File(self.file_name, "w")
+        self.h5_file.attrs["format"] = "packed"
+        trials_group = self.h5_file.create_group("trials")
+        for name in ["start_time", "end_time", "wrt_time"]:
+            self.create_column(trials_group, name, [], np.float64)
+        self.create_column(trials_group, "enhancement_categories", [], h5py.string_dtype())
+        self.h5_file.create_group("numeric_events")
+        self.h5_file.create_group("signals")
+        self.h5_file.create_group("enhancements")
+
+        self.pending_trials = []
+        self.flushed_count = 0
+        self.last_flush_time = time.monotonic()
+        return self
+
+    def __exit__(
+        self,
+        __exc_type: type[BaseException] | None,
+        __exc_value: BaseException | None,
+        __traceback: TracebackType | None
+    ) -> bool | None:
+        if self.h5_file is not None:
+            self.flush()
+            self.h5_file.close()
+            self.h5_file = None
+
+    def append_trial(self, trial: Trial) -> None:
+        self.pending_trials.append(trial)
+        if (len(self.pending_trials) >= self.flush_trial_count
+                or time.monotonic() - self.last_flush_time >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write any pending trials to the held-open file, as one batch, and flush the file to disk."""
+        if self.h5_file is None:
+            return
+
+        if self.pending_trials:
+            self.dump_trials(self.pending_trials)
+            self.flushed_count += len(self.pending_trials)
+            self.pending_trials = []
+        self.h5_file.flush()
+        self.last_flush_time = time.monotonic()
+
+    def read_trials(
+        self,
+        start: int = 0,
+        stop: int = None,
+        fields: list[str] = None,
+        buffers: list[str] = None,
+        enhancements: list[str] = None
+    ) -> Iterator[Trial]:
+        selection = TrialSelection(fields, buffers, enhancements)
+        if self.h5_file is not None:
+            # Read through the file we're holding open for writing, including any pending trials.
+            self.flush()
+            yield from self.load_trials(self.h5_file, start, stop, selection)
+            return
+
+        with h5py.File(self.file_name, "r") as f:
+            yield from self.load_trials(f, start, stop, selection)
+
+    def create_column(self, group: h5py.Group, name: str, values: list, dtype: Any) -> h5py.Dataset:
+        """Create a resizable, per-trial column with the given initial values."""
+        return group.create_dataset(
+            name,
+            data=np.array(values, dtype=object if dtype == h5py.string_dtype() else dtype),
+            maxshape=(None,),
+            dtype=dtype,
+            chunks=True,
+            compression=self.compression
+        )
+
+    def append_column(self, group: h5py.Group, name: str, values: np.ndarray, fill_value: Any = None) -> h5py.Dataset:
+        """Append values to the named, resizable dataset, creating it as needed.
+
+        When creating a per-trial column, fill_value is used for trials already written, before values.
+        """
+        dataset = group.get(name, None)
+        if dataset is None:
+            if fill_value is None:
+                fill_rows = 0
+            else:
+                fill_rows = self.flushed_count
+            dataset = group.create_dataset(
+                name,
+                shape=(fill_rows, *values.shape[1:]),
+                maxshape=(None, *values.shape[1:]),
+                dtype=values.dtype,
+                chunks=True,
+                compression=self.compression
+            )
+            if fill_rows:
+                dataset[:] = fill_value
+
+        start = dataset.shape[0]
+        dataset.resize(start + values.shape[0], axis=0)
+        dataset[start:] = values
+        return dataset
+
+    def pack_data(
+        self,
+        group: h5py.Group,
+        data_per_trial: list[np.ndarray],
+        kind: str,
+        name: str
+    ) -> None:
+        """Concatenate data for one buffer across a batch of trials, and append the data, offsets, and counts."""
+        # Choose the column count for the concatenated data.
+        data = group.get("data", None)
+        widths = {trial_data.shape[1] for trial_data in data_per_trial if trial_data is not None and trial_data.ndim > 1}
+        if data is not None and (data.shape[0] > 0 or not widths):
+            widths.add(data.shape[1])
+        if len(widths) > 1:
+            raise ValueError(f"Can't pack {kind} {name} with different column counts: {widths}")
+        width = widths.pop() if widths else 0
+        if data is not None and data.shape[1] != width:
+            # The data so far are empty with a placeholder column count, replace it with the actual count.
+            del group["data"]
+            data = None
+
+        next_offset = 0 if data is None else data.shape[0]
+        rows = []
+        offsets = []
+        counts = []
+        for trial_data in data_per_trial:
+            offsets.append(next_offset)
+            if trial_data is None:
+                counts.append(-1)
+            else:
+                trial_rows = trial_data.reshape([-1, width])
+                rows.append(trial_rows)
+                counts.append(trial_rows.shape[0])
+                next_offset += trial_rows.shape[0]
+
+        if rows:
+            packed_rows = np.concatenate(rows).astype(np.float64)
+        else:
+            packed_rows = np.empty([0, width], dtype=np.float64)
+        self.append_column(group, "data", packed_rows)
+        self.append_column(group, "offsets", np.array(offsets, dtype=np.int64), fill_value=0)
+        self.append_column(group, "counts", np.array(counts, dtype=np.int64), fill_value=-1)
+
+    def dump_trials(self, trials: list[Trial]) -> None:
+        """Append a batch of trials to the per-trial columns and concatenated buffer data."""
+        trials_group = self.h5_file["trials"]
+        for name in ["start_time", "end_time", "wrt_time"]:
+            times = [getattr(trial, name) for trial in trials]
+            values = np.array([np.nan if value is None else value for value in times], dtype=np.float64)
+            self.append_column(trials_group, name, values)
+
+        categories = [json.dumps(trial.enhancement_categories) if trial.enhancement_categories else "" for trial in trials]
+        self.append_column(trials_group, "enhancement_categories", np.array(categories, dtype=object))
+
+        # Numeric events, including names already in the file that these trials omit.
+        numeric_events_group = self.h5_file["numeric_events"]
+        names = set(numeric_events_group.keys())
+        for trial in trials:
+            names.update(trial.numeric_events.keys())
+        for name in names:
+            data_per_trial = []
+            for trial in trials:
+                event_list = trial.numeric_events.get(name, None)
+                data_per_trial.append(None if event_list is None else event_list.get_event_data())
+            self.pack_data(numeric_events_group.require_group(name), data_per_trial, "numeric events", name)
+
+        # Signals, same as numeric events, plus per-trial sample_frequency and first_sample_time.
+        signals_group = self.h5_file["signals"]
+        names = set(signals_group.keys())
+        for trial in trials:
+            names.update(trial.signals.keys())
+        for name in names:
+            signal_group = signals_group.require_group(name)
+            data_per_trial = []
+            sample_frequencies = []
+            first_sample_times = []
+            for trial in trials:
+                signal_chunk = trial.signals.get(name, None)
+                if signal_chunk is None:
+                    data_per_trial.append(None)
+                    sample_frequencies.append(np.nan)
+                    first_sample_times.append(np.nan)
+                    continue
+
+                if "channel_ids" not in signal_group.attrs:
+                    signal_group.attrs["channel_ids"] = signal_chunk.channel_ids
+                elif signal_group.attrs["channel_ids"].tolist() != signal_chunk.channel_ids:
+                    raise ValueError(f"Can't pack signal {name} with different channel ids: {signal_chunk.channel_ids}")
+
+                data_per_trial.append(signal_chunk.sample_data)
+                sample_frequencies.append(np.nan if signal_chunk.sample_frequency is None else signal_chunk.sample_frequency)
+                first_sample_times.append(np.nan if signal_chunk.first_sample_time is None else signal_chunk.first_sample_time)
+
+            self.pack_data(signal_group, data_per_trial, "signal", name)
+            self.append_column(signal_group, "sample_frequency", np.array(sample_frequencies, dtype=np.float64), np.nan)
+            self.append_column(signal_group, "first_sample_time", np.array(first_sample_times, dtype=np.float64), np.nan)
+
+        # Enhancements, as typed columns.
+        enhancements_group = self.h5_file["enhancements"]
+        names = set(enhancements_group.keys())
+        for trial in trials:
+            names.update(trial.enhancements.keys())
+        for name in names:
+            self.dump_enhancement_column(enhancements_group, name, trials)
+
+    def dump_enhancement_column(self, enhancements_group: h5py.Group, name: str, trials: list[Trial]) -> None:
+        """Append one named enhancement for a batch of trials, as a typed values column plus a presence column."""
+        missing = object()
+        values = [trial.enhancements.get(name, missing) for trial in trials]
+        present = np.array([value is not missing for value in values], dtype=bool)
+        dtype_rank = max([self.enhancement_dtype_rank(value) for value in values if value is not missing], default=0)
+
+        group = enhancements_group.get(name, None)
+        if group is None:
+            group = enhancements_group.create_group(name)
+            dtype = self.enhancement_dtypes[dtype_rank]
+            self.create_column(group, "values", [self.enhancement_fill_values[dtype_rank]] * self.flushed_count, dtype)
+            self.create_column(group, "present", [False] * self.flushed_count, bool)
+        else:
+            previous_rank = self.enhancement_dtypes.index(group["values"].dtype)
+            if dtype_rank > previous_rank:
+                # The column needs a wider type for these values, like float for int, or JSON strings for numbers.
+                previous = [
+                    self.convert_enhancement_value(value.item(), dtype_rank)
+                    for value in group["values"][()]
+                ]
+                del group["values"]
+                self.create_column(group, "values", previous, self.enhancement_dtypes[dtype_rank])
+            dtype_rank = max(dtype_rank, previous_rank)
+
+        column = [
+            self.enhancement_fill_values[dtype_rank] if value is missing else self.convert_enhancement_value(value, dtype_rank)
+            for value in values
+        ]
+        dtype = self.enhancement_dtypes[dtype_rank]
+        self.append_column(group, "values", np.array(column, dtype=object if dtype_rank == 2 else dtype))
+        self.append_column(group, "present", present)
+
+    def enhancement_dtype_rank(self, value: Any) -> int:
+        """Choose the narrowest enhancement column type for the given value, as an index into enhancement_dtypes."""
+        if isinstance(value, bool):
+            return 2
+        if isinstance(value, int):
+            return 0 if -2 ** 63 <= value < 2 ** 63 else 2
+        if isinstance(value, float):
+            return 1
+        return 2
+
+    def convert_enhancement_value(self, value: Any, dtype_rank: int) -> Any:
+        """Convert an enhancement value for storage in a column of the given type."""
+        if dtype_rank == 2:
+            return json.dumps(value)
+        return value
+
+    def load_trials(
+        self,
+        h5_file: h5py.File,
+        start: int = 0,
+        stop: int = None,
+        selection: TrialSelection = TrialSelection(),
+        batch_size: int = 100
+    ) -> Iterator[Trial]:
+        """Yield a range of trials from an open, packed file, reading concatenated data in batches of trials.
+
+        Only the per-trial columns and concatenated data rows for trials start up to stop are read from disk,
+        and only for the selected buffers and enhancements.
+        """
+        trials_group = h5_file["trials"]
+        start, stop, _ = slice(start, stop).indices(trials_group["start_time"].shape[0])
+        stop = max(start, stop)
+        start_times = trials_group["start_time"][start:stop]
+        end_times = trials_group["end_time"][start:stop]
+        wrt_times = trials_group["wrt_time"][start:stop]
+        if selection.includes_field("enhancement_categories"):
+            categories = trials_group["enhancement_categories"].asstr()[start:stop]
+        else:
+            categories = [""] * (stop - start)
+
+        numeric_events = {}
+        if selection.includes_field("numeric_events"):
+            for name, group in h5_file["numeric_events"].items():
+                if selection.includes_buffer(name):
+                    numeric_events[name] = self.load_packed_index(group, start, stop)
+
+        signals = {}
+        if selection.includes_field("signals"):
+            for name, group in h5_file["signals"].items():
+                if selection.includes_buffer(name):
+                    signals[name] = {
+                        **self.load_packed_index(group, start, stop),
+                        "sample_frequency": group["sample_frequency"][start:stop],
+                        "first_sample_time": group["first_sample_time"][start:stop],
+                        "channel_ids": group.attrs["channel_ids"].tolist() if "channel_ids" in group.attrs else []
+                    }
+
+        enhancements = {}
+        if selection.includes_field("enhancements"):
+            for name, group in h5_file["enhancements"].items():
+                if not selection.includes_enhancement(name):
+                    continue
+                values = group["values"]
+                if h5py.check_string_dtype(values.dtype):
+                    enhancements[name] = (values.asstr()[start:stop], group["present"][start:stop])
+                else:
+                    enhancements[name] = (values[start:stop], group["present"][start:stop])
+
+        # From here on, trial indexes are relative to start.
+        trial_count = stop - start
+        for batch_start in range(0, trial_count, batch_size):
+            batch_stop = min(trial_count, batch_start + batch_size)
+            numeric_batches = {name: self.load_packed_batch(info, batch_start, batch_stop) for name, info in numeric_events.items()}
+            signal_batches = {name: self.load_packed_batch(info, batch_start, batch_stop) for name, info in signals.items()}
+
+            for index in range(batch_start, batch_stop):
+                trial_numeric_events = {}
+                for name, info in numeric_events.items():
+                    event_data = self.slice_packed_batch(info, numeric_batches[name], batch_start, index)
+                    if event_data is not None:
+                        trial_numeric_events[name] = NumericEventList(event_data)
+
+                trial_signals = {}
+                for name, info in signals.items():
+                    sample_data = self.slice_packed_batch(info, signal_batches[name], batch_start, index)
+                    if sample_data is not None:
+                        sample_frequency = info["sample_frequency"][index]
+                        first_sample_time = info["first_sample_time"][index]
+                        trial_signals[name] = SignalChunk(
+                            sample_data=sample_data,
+                            sample_frequency=None if np.isnan(sample_frequency) else float(sample_frequency),
+                            first_sample_time=None if np.isnan(first_sample_time) else float(first_sample_time),
+                            channel_ids=info["channel_ids"]
+                        )
+
+                trial_enhancements = {}
+                for name, (values, present) in enhancements.items():
+                    if present[index]:
+                        value = values[index]
+                        if isinstance(value, str):
+                            trial_enhancements[name] = json.loads(value)
+                        else:
+                            # Convert numpy int64 or float64 to Python int or float.
+                            trial_enhancements[name] = value.item()
+
+                end_time = end_times[index]
+                yield Trial(
+                    start_time=float(start_times[index]),
+                    end_time=None if np.isnan(end_time) else float(end_time),
+                    wrt_time=float(wrt_times[index]),
+                    numeric_events=trial_numeric_events,
+                    signals=trial_signals,
+                    enhancements=trial_enhancements,
+                    enhancement_categories=json.loads(categories[index]) if categories[index] else {}
+                )
+
+    def load_packed_index(self, group: h5py.Group, start: int, stop: int) -> dict[str, Any]:
+        """Read the offsets and counts for one buffer and a range of trials, leaving the concatenated data on disk for now."""
+        return {
+            "data": group["data"],
+            "offsets": group["offsets"][start:stop],
+            "counts": group["counts"][start:stop]
+        }
+
+    def load_packed_batch(self, info: dict[str, Any], batch_start: int, batch_stop: int) -> np.ndarray:
+        """Read the concatenated data rows for one buffer, for a batch of trials, with one read from disk."""
+        first_row = info["offsets"][batch_start]
+        counts = info["counts"][batch_start:batch_stop]
+        last_row = info["offsets"][batch_stop - 1] + max(counts[-1], 0)
+        return info["data"][first_row:last_row]
+
+    def slice_packed_batch(self, info: dict[str, Any], batch_data: np.ndarray, batch_start: int, index: int) -> np.ndarray:
+        """Take one trial's rows out of a batch of data, or None when the trial omits the buffer."""
+        count = info["counts"][index]
+        if count < 0:
+            return None
+        start = info["offsets"][index] - info["offsets"][batch_start]
+        return batch_data[start:start + count]
@@ -231,7 +231,15 @@ class TrialExpression():
 
 
 class TrialExtractor():
-    """Populate trials with WRT-aligned data from named buffers."""
+    """Populate trials with WRT-aligned data from named buffers.
+
+    By default each trial gets its own copy of data from each buffer.
+    With use_views=True, trials get read-only views into buffer data instead, where possible, to avoid copying.
+    Aligning views to the trial's wrt time doesn't copy them: signal views shift their first_sample_time and
+    event views keep the shift pending, applying it as event times are accessed and when trials are written.
+    Views are copied on write if an enhancer modifies trial data in place, like SignalSmoother does.
+    Views stay valid until buffers discard the viewed data, as in discard_before().
+    """
 
     def __init__(
         self,
@@ -239,13 +247,15 @@ class TrialExtractor():
         wrt_value: float,
         wrt_value_index: int = 0,
         named_buffers: dict[str, Buffer] = {},
-        enhancers: dict[TrialEnhancer, TrialExpression] = {}
+        enhancers: dict[TrialEnhancer, TrialExpression] = {},
+        use_views: bool = False
     ) -> None:
         self.wrt_buffer = wrt_buffer
         self.wrt_value = wrt_value
         self.wrt_value_index = wrt_value_index
         self.named_buffers = named_buffers
         self.enhancers = enhancers
+        self.use_views = use_views
 
     def __eq__(self, other: object) -> bool:
         """Compare extractors field-wise, to support use of this class in tests."""
@@ -256,6 +266,7 @@ class TrialExtractor():
                 and self.wrt_value_index == other.wrt_value_index
                 and self.named_buffers == other.named_buffers
                 and self.enhancers == other.enhancers
+                and self.use_views == other.use_views
             )
         else:  # pragma: no cover
             return False
@@ -281,10 +292,16 @@ class TrialExtractor():
             trial.wrt_time = 0.0
 
         for name, buffer in self.named_buffers.items():
-            data = buffer.data.copy_time_range(
-                buffer.reference_time_to_raw(trial.start_time),
-                buffer.reference_time_to_raw(trial.end_time)
-            )
+            if self.use_views:
+                data = buffer.data.view_time_range(
+                    buffer.reference_time_to_raw(trial.start_time),
+                    buffer.reference_time_to_raw(trial.end_time)
+                )
+            else:
+                data = buffer.data.copy_time_range(
+                    buffer.reference_time_to_raw(trial.start_time),
+                    buffer.reference_time_to_raw(trial.end_time)
+                )
             raw_wrt_time = buffer.reference_time_to_raw(trial.wrt_time)
             data.shift_times(-raw_wrt_time)
             trial.add_buffer_data(name, data)
@@ -47,6 +47,41 @@ def test_numeric_list_append():
     assert np.array_equal(event_list_a.get_values(), 10*np.array(range(event_count)))
 
 
+def test_numeric_list_append_many():
+    event_list = NumericEventList(np.empty([0, 2]))
+    event_count = 1000
+    for t in range(event_count):
+        event_list.append(NumericEventList(np.array([[t, 10*t]])))
+
+    assert event_list.event_count() == event_count
+    assert np.array_equal(event_list.get_times(), np.array(range(event_count)))
+    assert np.array_equal(event_list.get_values(), 10*np.array(range(event_count)))
+    assert event_list.get_end_time() == event_count - 1
+
+    # Appending should reuse spare capacity rather than reallocate every time.
+    assert event_list.event_buffer.shape[0] >= event_count
+    assert event_list.event_buffer.shape[0] < 4 * event_count
+
+
+def test_numeric_list_append_promotes_dtype():
+    event_list = NumericEventList(np.array([[0, 0], [1, 10]]))
+    event_list.append(NumericEventList(np.array([[2, 20.5]])))
+    assert np.array_equal(event_list.get_values(), np.array([0, 10, 20.5]))
+
+
+def test_numeric_list_append_after_discard():
+    event_list = NumericEventList(np.empty([0, 2]))
+    for t in range(100):
+        event_list.append(NumericEventList(np.array([[t, 10*t]])))
+        event_list.discard_before(t - 10)
+
+    assert np.array_equal(event_list.get_times(), np.array(range(89, 100)))
+    assert np.array_equal(event_list.get_values(), 10*np.array(range(89, 100)))
+
+    # With a sliding window, the backing array should stay small.
+    assert event_list.event_buffer.shape[0] < 100
+
+
 def test_numeric_list_discard_before():
     event_count = 100
     half_count = int(event_count / 2)
@@ -59,6 +94,18 @@ def test_numeric_list_discard_before():
     assert np.array_equal(event_list.get_values(), 10*np.array(range(half_count, event_count)))
 
 
+def test_numeric_list_discard_before_unordered():
+    event_list = NumericEventList(np.array([[3, 30], [1, 10], [4, 40], [0, 0], [5, 50]]))
+
+    event_list.discard_before(2)
+    assert np.array_equal(event_list.get_times(), np.array([3, 4, 5]))
+    assert np.array_equal(event_list.get_values(), np.array([30, 40, 50]))
+
+    event_list.discard_before(10)
+    assert event_list.event_count() == 0
+    assert event_list.get_end_time() is None
+
+
 def test_numeric_list_shift_times():
     event_count = 100
     raw_data = [[t, 10*t] for t in range(event_count)]
@@ -146,6 +193,46 @@ def test_numeric_list_copy_time_range():
     assert np.array_equal(event_list.get_values(), 10*np.array(range(100)))
 
 
+def test_numeric_list_sorted_tracking():
+    event_list = NumericEventList(np.array([[0, 0], [1, 10], [1, 11], [2, 20]]))
+    assert event_list.is_sorted()
+
+    # Sorted queries should select a slice / view of the event data.
+    assert event_list.get_time_selector(1, 2) == slice(1, 3)
+    assert np.shares_memory(event_list.get_values(1, 2), event_list.event_data)
+
+    event_list.append(NumericEventList(np.array([[3, 30], [4, 40]])))
+    assert event_list.is_sorted()
+
+    event_list.append(NumericEventList(np.array([[3.5, 35]])))
+    assert not event_list.is_sorted()
+
+    event_list.discard_before(3.5)
+    assert not event_list.is_sorted()
+    assert np.array_equal(event_list.get_times(), np.array([4, 3.5]))
+
+    event_list.discard_before(4)
+    assert event_list.is_sorted()
+    assert np.array_equal(event_list.get_times(), np.array([4]))
+
+
+def test_numeric_list_unsorted_queries():
+    raw_data = [[t % 10 + t / 100, t] for t in range(100)]
+    event_list = NumericEventList(np.array(raw_data))
+    assert not event_list.is_sorted()
+
+    expected_times = np.array([t[0] for t in raw_data if t[0] >= 4 and t[0] < 6])
+    expected_values = np.array([t[1] for t in raw_data if t[0] >= 4 and t[0] < 6])
+
+    range_event_list = event_list.copy_time_range(4, 6)
+    assert np.array_equal(range_event_list.get_times(), expected_times)
+    assert np.array_equal(range_event_list.get_values(), expected_values)
+    assert np.array_equal(event_list.get_values(start_time=4, end_time=6), expected_values)
+    assert event_list.get_times_of(42, start_time=4, end_time=6).size == 0
+    assert np.array_equal(event_list.get_times_of(45, start_time=4, end_time=6), np.array([5.45]))
+    assert event_list.get_end_time() == 9.99
+
+
 def test_numeric_list_equality():
     foo_events = NumericEventList(np.array([[t, 10*t] for t in range(100)]))
     bar_events = NumericEventList(np.array([[t/10, 2*t] for t in range(1000)]))
@@ -165,3 +252,51 @@ def test_numeric_list_equality():
     assert foo_events != "wrong type"
     assert bar_events != "wrong type"
     assert baz_events != "wrong type"
+
+
+def test_numeric_list_view_shift_times_is_lazy():
+    event_list = NumericEventList(np.array([[0, 0], [1, 10], [2, 20], [3, 30]], dtype=np.float64))
+    view = event_list.view_time_range(1, 3)
+    assert np.shares_memory(view.event_data, event_list.event_data)
+
+    # Shifting a view should keep the shift pending, without copying or modifying the original.
+    view.shift_times(-1.5)
+    assert np.shares_memory(view.event_data, event_list.event_data)
+    assert view.time_offset == -1.5
+    assert np.array_equal(event_list.get_times(), [0, 1, 2, 3])
+
+    # Time accessors should apply the pending shift.
+    assert np.array_equal(view.get_times(), [-0.5, 0.5])
+    assert view.get_end_time() == 0.5
+    assert np.array_equal(view.get_times_of(20), [0.5])
+    assert np.array_equal(view.get_values(start_time=0), [20])
+    assert view.copy_time_range(0, 1) == NumericEventList(np.array([[0.5, 20]]))
+    assert view.get_event_data().tolist() == [[-0.5, 10], [0.5, 20]]
+    assert view == NumericEventList(np.array([[-0.5, 10], [0.5, 20]]))
+
+    # Modifying the view's values should copy it, with the pending shift applied.
+    view.apply_offset_then_gain(gain=2)
+    assert not np.shares_memory(view.event_data, event_list.event_data)
+    assert view.time_offset == 0
+    assert view.event_data.tolist() == [[-0.5, 20], [0.5, 40]]
+    assert np.array_equal(event_list.get_values(), [0, 10, 20, 30])
+
+
+def test_numeric_list_views_lent_until_discarded():
+    event_list = NumericEventList(np.empty([0, 2]))
+    event_list.append(NumericEventList(np.array([[t, t] for t in range(10)], dtype=np.float64)))
+    backing = event_list.event_buffer
+
+    # Lending out a view should prevent overwriting the viewed rows.
+    view = event_list.view_time_range(2, 4)
+    assert event_list.views_lent
+    event_list.discard_before(3)
+    assert event_list.views_lent
+
+    # Once the viewed rows are discarded, the backing array can be reused.
+    event_list.discard_before(4)
+    assert not event_list.views_lent
+    event_list.discard_before(8)
+    event_list.append(NumericEventList(np.array([[10, 10]], dtype=np.float64)))
+    assert event_list.event_buffer is backing
+    assert np.array_equal(event_list.get_times(), [8, 9, 10])
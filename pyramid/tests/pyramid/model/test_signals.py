@@ -105,6 +105,60 @@ def test_signal_chunk_discard_before():
     assert signal_chunk.get_end_time() == None
 
 
+def test_signal_chunk_append_many():
+    signal_chunk = SignalChunk(np.empty([0, 2]), 10, 0, ["a", "b"])
+    sample_count = 1000
+    for v in range(sample_count):
+        signal_chunk.append(SignalChunk(np.array([[v, 10 * v]]), 10, v / 10, ["a", "b"]))
+
+    assert signal_chunk.sample_count() == sample_count
+    assert np.array_equal(signal_chunk.get_channel_values("a"), np.array(range(sample_count)))
+    assert np.array_equal(signal_chunk.get_channel_values("b"), 10 * np.array(range(sample_count)))
+    assert signal_chunk.get_end_time() == (sample_count - 1) / 10
+
+    # Appending should reuse spare capacity rather than reallocate every time.
+    assert signal_chunk.sample_buffer.shape[0] >= sample_count
+    assert signal_chunk.sample_buffer.shape[0] < 4 * sample_count
+
+
+def test_signal_chunk_append_after_discard():
+    signal_chunk = SignalChunk(np.empty([0, 1]), 10, None, ["a"])
+    for v in range(100):
+        signal_chunk.append(SignalChunk(np.array([[v]]), 10, v / 10, ["a"]))
+        signal_chunk.discard_before((v - 10) / 10)
+
+    assert np.array_equal(signal_chunk.get_channel_values("a"), np.array(range(90, 100)))
+    assert np.allclose(signal_chunk.get_times(), np.array(range(90, 100)) / 10)
+
+    # With a sliding window, the backing array should stay small.
+    assert signal_chunk.sample_buffer.shape[0] < 100
+
+
+def test_signal_chunk_discard_before_between_samples():
+    signal_chunk = SignalChunk(np.arange(100).reshape([-1, 1]), 10, 0.05, ["a"])
+
+    # Discard should keep the first sample at or after the given time, same as comparing with get_times().
+    signal_chunk.discard_before(1.0)
+    assert signal_chunk.first_sample_time == 0.05 + 10 / 10
+    assert np.array_equal(signal_chunk.get_channel_values("a"), np.array(range(10, 100)))
+
+    signal_chunk.discard_before(signal_chunk.get_times()[5])
+    assert np.array_equal(signal_chunk.get_channel_values("a"), np.array(range(15, 100)))
+
+
+def test_signal_chunk_max_duration():
+    signal_chunk = SignalChunk(np.empty([0, 1]), 10, 0, ["a"], max_duration=2.0)
+    for v in range(100):
+        signal_chunk.append(SignalChunk(np.array([[v]]), 10, v / 10, ["a"]))
+        assert signal_chunk.get_end_time() - signal_chunk.first_sample_time <= 2.0
+
+    assert np.array_equal(signal_chunk.get_channel_values("a"), np.array(range(79, 100)))
+    assert np.isclose(signal_chunk.get_end_time(), 9.9)
+
+    # Copies should keep the same limit.
+    assert signal_chunk.copy().max_duration == 2.0
+
+
 def test_signal_chunk_shift_times():
     sample_count = 100
     raw_data = [[v, 10 + v, 10 * v] for v in range(sample_count)]
@@ -206,6 +260,21 @@ def test_signal_chunk_copy_time_range():
     assert np.array_equal(signal_chunk.get_channel_values("a"), np.array(range(100)))
 
 
+def test_signal_chunk_copy_time_range_between_samples():
+    signal_chunk = SignalChunk(np.arange(1000).reshape([-1, 1]), 1000, 0.0003, ["a"])
+    sample_times = signal_chunk.get_times()
+
+    # Arithmetic sample ranges should agree with comparing against all the sample times.
+    for (start_time, end_time) in [(0.1, 0.2), (0.1003, 0.2003), (0.0, 0.0003), (0.5, 0.5), (0.9, 2.0), (-1, 0.1)]:
+        in_range = (sample_times >= start_time) & (sample_times < end_time)
+        range_chunk = signal_chunk.copy_time_range(start_time, end_time)
+        assert np.array_equal(range_chunk.get_channel_values("a"), signal_chunk.get_channel_values("a")[in_range])
+        if range_chunk.sample_count():
+            assert range_chunk.first_sample_time == sample_times[in_range][0]
+        else:
+            assert range_chunk.first_sample_time is None
+
+
 def test_signal_chunk_equality():
     foo_chunk = SignalChunk(
         np.array([[v, 10 + v, 10 * v] for v in range(100)]),
@@ -238,3 +307,23 @@ def test_signal_chunk_equality():
     assert foo_chunk != "wrong type"
     assert bar_chunk != "wrong type"
     assert baz_chunk != "wrong type"
+
+
+def test_signal_chunk_views_lent_until_discarded():
+    signal_chunk = SignalChunk(np.empty([0, 1]), 10, None, ["a"])
+    signal_chunk.append(SignalChunk(np.arange(10).reshape([-1, 1]), 10, 0.0, ["a"]))
+    backing = signal_chunk.sample_buffer
+
+    # Lending out a view should prevent overwriting the viewed samples.
+    view = signal_chunk.view_time_range(0.2, 0.4)
+    assert signal_chunk.views_lent
+    signal_chunk.discard_before(0.3)
+    assert signal_chunk.views_lent
+
+    # Once the viewed samples are discarded, the backing array can be reused.
+    signal_chunk.discard_before(0.4)
+    assert not signal_chunk.views_lent
+    signal_chunk.discard_before(0.8)
+    signal_chunk.append(SignalChunk(np.array([[10]]), 10, 1.0, ["a"]))
+    assert signal_chunk.sample_buffer is backing
+    assert np.array_equal(signal_chunk.get_channel_values("a"), [8, 9, 10])
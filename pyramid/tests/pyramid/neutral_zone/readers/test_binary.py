@@ -0,0 +1,159 @@
+import numpy as np
+
+from pathlib import Path
+from pytest import raises
+
+from pyramid.model.events import NumericEventList
+from pyramid.model.signals import SignalChunk
+from pyramid.neutral_zone.readers.binary import NpyNumericEventReader, BinarySignalReader
+
+
+def test_npy_numeric_events(tmp_path):
+    npy_file = Path(tmp_path, "events.npy").as_posix()
+    event_data = np.array([[t, t + 100, t + 1000] for t in range(25)], dtype=np.int64)
+    np.save(npy_file, event_data)
+
+    with NpyNumericEventReader(npy_file, rows_per_read=10) as reader:
+        initial = reader.get_initial()
+        assert initial == {reader.result_name: NumericEventList(np.empty([0, 3]))}
+
+        # Read 25 rows, 10 at a time...
+        for first_row in [0, 10, 20]:
+            result = reader.read_next()
+            expected_data = event_data[first_row:first_row + 10].astype(np.float64)
+            assert result == {reader.result_name: NumericEventList(expected_data)}
+
+        # ...then be done.
+        with raises(StopIteration):
+            reader.read_next()
+
+    assert reader.event_array is None
+
+
+def test_npy_numeric_events_sample_frequency_offset_and_gain(tmp_path):
+    npy_file = Path(tmp_path, "events.npy").as_posix()
+    event_data = np.array([[t * 1000, t, t + 100] for t in range(10)], dtype=np.int64)
+    np.save(npy_file, event_data)
+
+    with NpyNumericEventReader(npy_file, sample_frequency=1000, offset=-100, gain=2, value_index=1) as reader:
+        result = reader.read_next()
+
+    # Times are converted from samples to seconds, and the second value is offset then scaled.
+    expected_data = np.array([[t, t, t * 2] for t in range(10)], dtype=np.float64)
+    assert result == {reader.result_name: NumericEventList(expected_data)}
+
+    # Original file is unchanged.
+    assert np.array_equal(np.load(npy_file), event_data)
+
+
+def test_binary_signal_interleaved_int16(tmp_path):
+    # Like a Kilosort .bin file with 4 channels of int16 samples, interleaved.
+    bin_file = Path(tmp_path, "recording.bin").as_posix()
+    sample_data = np.arange(100 * 4, dtype=np.int16).reshape([100, 4])
+    sample_data.tofile(bin_file)
+
+    with BinarySignalReader(
+        bin_file,
+        channel_count=4,
+        sample_frequency=1000,
+        first_sample_time=10.0,
+        samples_per_read=30,
+        offset=-1,
+        gain=0.5,
+        channel_ids=["a", "b", "c", "d"]
+    ) as reader:
+        initial = reader.get_initial()
+        assert initial == {
+            reader.result_name: SignalChunk(np.empty([0, 4]), 1000, 10.0, ["a", "b", "c", "d"])
+        }
+
+        # Read 100 samples, 30 at a time...
+        for first_sample in [0, 30, 60, 90]:
+            result = reader.read_next()
+            expected_data = (sample_data[first_sample:first_sample + 30].astype(np.float64) - 1) * 0.5
+            expected_chunk = SignalChunk(expected_data, 1000, 10.0 + first_sample / 1000, ["a", "b", "c", "d"])
+            assert result == {reader.result_name: expected_chunk}
+
+        # ...then be done.
+        with raises(StopIteration):
+            reader.read_next()
+
+    assert reader.sample_array is None
+
+
+def test_binary_signal_header_and_partial_last_sample(tmp_path):
+    bin_file = Path(tmp_path, "recording.bin").as_posix()
+    sample_data = np.arange(10 * 2, dtype=np.int16).reshape([10, 2])
+    with open(bin_file, "wb") as f:
+        f.write(b"header!!")
+        f.write(sample_data.tobytes())
+        # A partial sample at the end, for one channel but not the other.
+        f.write(np.array([42], dtype=np.int16).tobytes())
+
+    with BinarySignalReader(bin_file, channel_count=2, header_bytes=8, samples_per_read=100) as reader:
+        initial = reader.get_initial()
+        assert initial[reader.result_name].channel_ids == [0, 1]
+
+        result = reader.read_next()
+        assert result == {reader.result_name: SignalChunk(sample_data.astype(np.float64), 1.0, 0.0, [0, 1])}
+
+        with raises(StopIteration):
+            reader.read_next()
+
+
+def test_binary_signal_empty_file(tmp_path):
+    bin_file = Path(tmp_path, "empty.bin").as_posix()
+    Path(bin_file).touch()
+    with BinarySignalReader(bin_file, channel_count=2) as reader:
+        with raises(StopIteration):
+            reader.read_next()
+
+
+def test_npy_numeric_events_seek(tmp_path):
+    npy_file = Path(tmp_path, "events.npy").as_posix()
+    event_data = np.array([[t * 1000, t] for t in range(10)], dtype=np.int64)
+    np.save(npy_file, event_data)
+
+    with NpyNumericEventReader(npy_file, sample_frequency=1000) as reader:
+        assert reader.can_seek()
+
+        # Seek to the first event at or after 3.5 seconds, then read from there.
+        reader.seek(3.5)
+        assert reader.current_row == 4
+        result = reader.read_next()
+        expected_data = np.array([[t, t] for t in range(4, 10)], dtype=np.float64)
+        assert result == {reader.result_name: NumericEventList(expected_data)}
+
+        # Seeking never goes backwards.
+        reader.seek(0.0)
+        assert reader.current_row == 10
+
+
+def test_binary_signal_seek(tmp_path):
+    bin_file = Path(tmp_path, "recording.bin").as_posix()
+    sample_data = np.arange(100 * 2, dtype=np.int16).reshape([100, 2])
+    sample_data.tofile(bin_file)
+
+    with BinarySignalReader(
+        bin_file,
+        channel_count=2,
+        sample_frequency=10,
+        first_sample_time=1.0,
+        samples_per_read=100
+    ) as reader:
+        assert reader.can_seek()
+
+        # Seek to the first sample at or after 3.55 seconds, which is sample 25 at 3.5 seconds.
+        reader.seek(3.55)
+        assert reader.current_sample == 25
+        result = reader.read_next()
+        assert result == {reader.result_name: SignalChunk(sample_data[25:].astype(np.float64), 10, 3.5, [0, 1])}
+
+    with BinarySignalReader(bin_file, channel_count=2, sample_frequency=10, first_sample_time=1.0) as reader:
+        # Seeking before the first sample is a no-op, seeking past the last sample leaves nothing to read.
+        reader.seek(0.0)
+        assert reader.current_sample == 0
+        reader.seek(100.0)
+        assert reader.current_sample == 100
+        with raises(StopIteration):
+            reader.read_next()
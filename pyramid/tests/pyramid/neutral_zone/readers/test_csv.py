@@ -1,3 +1,4 @@
+import logging
 import numpy as np
 
 from pathlib import Path
@@ -119,6 +120,48 @@ def test_numeric_events_skip_nonnumeric_lines(fixture_path):
     assert reader.file_stream is None
 
 
+def test_numeric_events_rows_per_read(fixture_path, caplog):
+    caplog.set_level(logging.INFO)
+    csv_file = Path(fixture_path, 'numeric_events', 'nonnumeric_lines.csv').as_posix()
+    nonnumeric_lines = [1, 11, 15, 21, 28]
+    with CsvNumericEventReader(csv_file, rows_per_read=10) as reader:
+        # Read 32 lines, 10 at a time, skipping the nonnumeric lines in each block...
+        for first_line in range(0, 32, 10):
+            result = reader.read_next()
+            event_list = result[reader.result_name]
+            expected_times = [t for t in range(first_line, min(first_line + 10, 32)) if t not in nonnumeric_lines]
+            expected_event_list = NumericEventList(np.array([[t, t + 100, t + 1000] for t in expected_times]))
+            assert event_list == expected_event_list
+
+        # ...then be done.
+        with raises(StopIteration) as exception_info:
+            reader.read_next()
+        assert exception_info.errisinstance(StopIteration)
+
+    assert reader.file_stream is None
+
+    # Skipped lines should be logged with their line numbers, same as when reading one row at a time.
+    skipped_messages = [record.message for record in caplog.records if record.message.startswith("Skipping CSV")]
+    assert len(skipped_messages) == len(nonnumeric_lines)
+    for line_num, message in zip(nonnumeric_lines, skipped_messages):
+        assert f" line {line_num} " in message
+
+
+def test_numeric_events_rows_per_read_quoted_fields(tmp_path):
+    # Quoted numbers are OK, and a quoted field can span lines, even across reads.
+    csv_file = Path(tmp_path, 'quoted.csv')
+    csv_file.write_text('"0",100\n1,"101"\n2,"note\n3,103\nspanning lines"\n4,104\n"5",105\n', newline='')
+    with CsvNumericEventReader(csv_file.as_posix(), rows_per_read=3) as reader:
+        first_result = reader.read_next()
+        assert first_result[reader.result_name] == NumericEventList(np.array([[0, 100], [1, 101]]))
+
+        second_result = reader.read_next()
+        assert second_result[reader.result_name] == NumericEventList(np.array([[4, 104], [5, 105]]))
+
+        with raises(StopIteration):
+            reader.read_next()
+
+
 def test_signals_safe_to_spam_exit(fixture_path):
     csv_file = Path(fixture_path, 'signals', 'empty.csv').as_posix()
     reader = CsvSignalReader(csv_file)
@@ -267,3 +310,32 @@ def test_signals_skip_nonnumeric_lines(fixture_path):
         assert exception_info.errisinstance(StopIteration)
 
     assert reader.file_stream is None
+
+
+def test_signals_read_until(fixture_path):
+    csv_file = Path(fixture_path, 'signals', 'header_line.csv').as_posix()
+    with CsvSignalReader(csv_file, lines_per_chunk=10) as reader:
+        reader.get_initial()
+        assert reader.can_read_until()
+
+        # Nothing before the first sample.
+        assert reader.read_until(-1.0) is None
+
+        # Read whole chunks, up to and including the target time.
+        result = reader.read_until(14.0)
+        signal_chunk = result[reader.result_name]
+        assert np.array_equal(signal_chunk.get_times(), np.array(range(0, 20)))
+        assert reader.next_sample_time == 20
+
+        # Nothing new up to the same time.
+        assert reader.read_until(19.0) is None
+
+        # Read through the end of the file in one call, with a last partial chunk.
+        result = reader.read_until(1000.0)
+        signal_chunk = result[reader.result_name]
+        assert np.array_equal(signal_chunk.get_times(), np.array(range(20, 150)))
+        assert np.array_equal(signal_chunk.get_channel_values("c"), signal_chunk.get_times() * 2 - 1000)
+
+        with raises(StopIteration) as exception_info:
+            reader.read_until(2000.0)
+        assert exception_info.errisinstance(StopIteration)
@@ -1,7 +1,10 @@
+import asyncio
 import uuid
+import json
 import time
 
 import numpy as np
+import zmq
 
 from pyramid.model.events import NumericEventList
 from pyramid.model.signals import SignalChunk
@@ -16,6 +19,7 @@ from pyramid.neutral_zone.readers.open_ephys_zmq import (
     parse_event,
     format_spike,
     parse_spike,
+    parse_header,
     OpenEphysZmqClient,
     OpenEphysZmqServer,
     OpenEphysZmqReader
@@ -64,6 +68,21 @@ def test_continuous_data_format():
     assert np.array_equal(data_2, data)
 
 
+def test_continuous_data_format_zero_copy_frames():
+    data = np.arange(1000, dtype=np.float32)
+    parts = format_continuous_data(data, "Test", 41, 42, 1000, 42, 424242)
+    frames = [zmq.Frame(part) for part in parts]
+
+    # Parsing frames should give the same results as parsing bytes, with data as a view of the frame buffer.
+    header_info = parse_header(frames[1])
+    assert header_info == json.loads(parts[1].decode())
+    (envelope, header, data_2) = parse_continuous_data(frames, header_info=header_info)
+    assert envelope == "DATA"
+    assert header is header_info
+    assert np.array_equal(data_2, data)
+    assert not data_2.flags.owndata
+
+
 def test_event_format_with_data():
     event_line = 7
     event_state = 1
@@ -529,7 +548,8 @@ def test_open_ephys_zmq_reader_all_events_and_spikes():
             events="events",
             spikes="spikes",
             event_sample_frequency=event_sample_frequency,
-            timeout_ms=timeout_ms
+            timeout_ms=timeout_ms,
+            max_messages_per_read=1
         ) as reader:
             initial = reader.get_initial()
             assert initial.keys() == {"events", "spikes"}
@@ -606,7 +626,8 @@ def test_open_ephys_zmq_reader_selected_data_and_spikes():
             event_sample_frequency=event_sample_frequency,
             continuous_data=continuous_data,
             spikes=spikes,
-            timeout_ms=timeout_ms
+            timeout_ms=timeout_ms,
+            max_messages_per_read=1
         ) as reader:
             # Expect reader to set up for explicitly named buffers, and no "events".
             initial = reader.get_initial()
@@ -718,6 +739,60 @@ def test_open_ephys_zmq_reader_selected_data_and_spikes():
             assert not reader.read_next()
 
 
+def test_open_ephys_zmq_reader_drains_and_coalesces_messages():
+    host = "127.0.0.1"
+    data_port = 10001
+    event_sample_frequency = 1000
+    timeout_ms = 100
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms) as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            event_sample_frequency=event_sample_frequency,
+            continuous_data={0: "zero", 1: "one"},
+            events="events",
+            spikes="spikes",
+            timeout_ms=timeout_ms,
+            max_seconds_per_read=1.0
+        ) as reader:
+            # It should be safe to read when there's no data available yet.
+            assert not reader.read_next()
+
+            # Send several messages of each kind, interleaved.
+            zero_data = np.random.rand(50).astype(np.float32)
+            one_data = np.random.rand(50).astype(np.float32)
+            for index in range(5):
+                server.send_continuous_data(zero_data[index * 10:(index + 1) * 10], "test_stream", 0, index * 10, 1000)
+                server.send_continuous_data(one_data[index * 10:(index + 1) * 10], "test_stream", 1, index * 10, 1000)
+                server.send_ttl_event(index, 1, index * 100, "test_stream", 42, index)
+                server.send_spike(np.random.rand(1, 10).astype(np.float32), "test_stream", 42, "e", index, index, [1])
+
+            # Give the messages time to arrive, then expect them all from one read by default, coalesced per result name.
+            time.sleep(0.1)
+            results = reader.read_next()
+            assert results == {
+                "zero": SignalChunk(zero_data.reshape([-1, 1]), 1000, 0.0, [0]),
+                "one": SignalChunk(one_data.reshape([-1, 1]), 1000, 0.0, [1]),
+                "events": NumericEventList(np.array([
+                    [index / event_sample_frequency, index * 100, index, 1] for index in range(5)
+                ])),
+                "spikes": NumericEventList(np.array([
+                    [index / event_sample_frequency, index] for index in range(5)
+                ])),
+            }
+
+            # Nothing left over.
+            assert not reader.read_next()
+
+            # Messages beyond the per-read count should wait for the next read.
+            reader.max_messages_per_read = 3
+            for index in range(5):
+                server.send_ttl_event(index, 1, index * 100, "test_stream", 42, index)
+            time.sleep(0.1)
+            assert reader.read_next()["events"].event_count() == 3
+            assert reader.read_next()["events"].event_count() == 2
+
+
 def test_open_ephys_zmq_no_linger_for_unsent_messages():
     host = "127.0.0.1"
     data_port = 10001
@@ -731,3 +806,134 @@ def test_open_ephys_zmq_no_linger_for_unsent_messages():
 
         # This test should exit immediately after a short timeout
         # It should not "zmq.LINGER", waiting indefinitely for the send to complete.
+
+
+def test_open_ephys_zmq_reader_async():
+    host = "127.0.0.1"
+    data_port = 10001
+    event_sample_frequency = 1000
+    timeout_ms = 100
+
+    async def read_events(reader: OpenEphysZmqReader, server: OpenEphysZmqServer):
+        # It should be safe to await reads when there's no data available yet.
+        assert not await reader.read_next_async()
+
+        # Data sent while a read is pending should wake the read up, rather than waiting for the timeout.
+        pending_read = asyncio.create_task(reader.read_next_async())
+        await asyncio.sleep(0.01)
+        send_time = time.perf_counter()
+        server.send_ttl_event(
+            event_line=123,
+            event_state=1,
+            ttl_word=123456789,
+            stream_name="test_stream",
+            source_node=42,
+            sample_num=0
+        )
+        result = await pending_read
+        assert time.perf_counter() - send_time < timeout_ms / 1000
+
+        # Pending reads should keep waiting past timeout_ms, rather than returning empty for the caller to poll again.
+        pending_read = asyncio.create_task(reader.read_next_async())
+        await asyncio.sleep(2 * timeout_ms / 1000)
+        assert not pending_read.done()
+        server.send_ttl_event(
+            event_line=123,
+            event_state=0,
+            ttl_word=987654321,
+            stream_name="test_stream",
+            source_node=42,
+            sample_num=1
+        )
+        assert await pending_read == {
+            "events": NumericEventList(np.array([[1 / event_sample_frequency, 987654321, 123, 0]]))
+        }
+        return result
+
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms) as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            events="events",
+            event_sample_frequency=event_sample_frequency,
+            timeout_ms=timeout_ms
+        ) as reader:
+            result = asyncio.run(read_events(reader, server))
+
+            # [timestamp, ttl_word, event_line, event_state]
+            assert result == {
+                "events": NumericEventList(np.array([[0 / event_sample_frequency, 123456789, 123, 1]]))
+            }
+
+
+def test_open_ephys_zmq_reader_assembles_multiple_channels():
+    host = "127.0.0.1"
+    data_port = 10001
+    timeout_ms = 100
+    sample_rate = 1000
+    with OpenEphysZmqServer(host=host, data_port=data_port, timeout_ms=timeout_ms) as server:
+        with OpenEphysZmqReader(
+            host=host,
+            data_port=data_port,
+            continuous_data={2: "probe", 0: "probe", 1: "probe", 7: "other"},
+            timeout_ms=timeout_ms,
+            max_pending_blocks=2
+        ) as reader:
+            # Channels mapped to the same buffer go in one multi-channel buffer, in the order listed.
+            initial = reader.get_initial()
+            assert initial.keys() == {"probe", "other"}
+            assert initial["probe"].channel_ids == [2, 0, 1]
+            assert initial["probe"].sample_data.shape == (0, 3)
+            assert initial["other"].channel_ids == [7]
+
+            # It should be safe to read when there's no data available yet.
+            assert not reader.read_next()
+
+            # Nothing to show until all channels of a block arrive, in any order.
+            block_0 = np.random.rand(10, 3).astype(np.float32)
+            server.send_continuous_data(block_0[:, 1], "test_stream", 0, 0, sample_rate)
+            assert not reader.read_next()
+            server.send_continuous_data(block_0[:, 0], "test_stream", 2, 0, sample_rate)
+            assert not reader.read_next()
+            server.send_continuous_data(block_0[:, 2], "test_stream", 1, 0, sample_rate)
+            assert reader.read_next() == {"probe": SignalChunk(block_0, sample_rate, 0.0, [2, 0, 1])}
+
+            # A block missing a channel gets filled in with NaN once the next block completes.
+            block_1 = np.random.rand(10, 3).astype(np.float32)
+            block_2 = np.random.rand(10, 3).astype(np.float32)
+            server.send_continuous_data(block_1[:, 0], "test_stream", 2, 10, sample_rate)
+            assert not reader.read_next()
+            server.send_continuous_data(block_1[:, 1], "test_stream", 0, 10, sample_rate)
+            assert not reader.read_next()
+            for column, channel_num in enumerate([2, 0, 1]):
+                server.send_continuous_data(block_2[:, column], "test_stream", channel_num, 20, sample_rate)
+                results = reader.read_next()
+
+            block_1[:, 2] = np.nan
+            expected_data = np.concatenate([block_1, block_2])
+            assert np.array_equal(results["probe"].sample_data, expected_data, equal_nan=True)
+            assert results["probe"].first_sample_time == 10 / sample_rate
+            assert reader.missing_channel_count == 1
+
+            # The missing channel arriving late gets dropped.
+            server.send_continuous_data(block_1[:, 2], "test_stream", 1, 10, sample_rate)
+            assert not reader.read_next()
+            assert reader.late_channel_count == 1
+
+            # Too many incomplete blocks pending, and the oldest gets assembled anyway.
+            block_3 = np.random.rand(10, 3).astype(np.float32)
+            server.send_continuous_data(block_3[:, 0], "test_stream", 2, 30, sample_rate)
+            assert not reader.read_next()
+            server.send_continuous_data(block_3[:, 0], "test_stream", 2, 40, sample_rate)
+            assert not reader.read_next()
+            server.send_continuous_data(block_3[:, 0], "test_stream", 2, 50, sample_rate)
+            results = reader.read_next()
+            assert results["probe"].first_sample_time == 30 / sample_rate
+            assert results["probe"].sample_data.shape == (10, 3)
+            assert np.array_equal(results["probe"].sample_data[:, 0], block_3[:, 0])
+            assert np.all(np.isnan(results["probe"].sample_data[:, 1:]))
+
+            # Single-channel buffers work as before.
+            other_data = np.random.rand(10).astype(np.float32)
+            server.send_continuous_data(other_data, "test_stream", 7, 0, sample_rate)
+            assert reader.read_next() == {"other": SignalChunk(other_data.reshape([-1, 1]), sample_rate, 0.0, [7])}
@@ -147,3 +147,64 @@ def test_phy_data_master_invalid_filter(fixture_path):
         while reader.current_row < reader.spikes_times.size:
             result = reader.read_next()
             assert result is None
+
+
+def test_gold_phy_read_until(fixture_path):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    filter_expression = "Amplitude > 5000"
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression, preload=True) as reader:
+        # Read exactly the spikes up to each target time, in steps of 100 seconds.
+        spike_count = 0
+        previous_time = -1
+        for target_time in range(0, 3100, 100):
+            result = reader.read_until(target_time)
+            if result:
+                spikes = result["spikes"]
+                assert spikes.get_times().min() > previous_time
+                assert spikes.get_end_time() <= target_time
+                assert set(spikes.get_values()).issubset({5, 6})
+                spike_count += spikes.event_count()
+            previous_time = target_time
+        assert reader.current_row == 510863
+        assert spike_count == 31220
+
+        with raises(StopIteration) as exception_info:
+            reader.read_until(3100)
+        assert exception_info.errisinstance(StopIteration)
+
+
+def test_phy_data_master_read_until_matches_read_next(fixture_path):
+    params_file = Path(fixture_path, 'phy', 'phy-data-master', 'template', 'params.py')
+    filter_expression = "group == 'good'"
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression) as reader:
+        # Cluster id 51 appears in the spikes but is beyond any kept cluster id.
+        assert reader.cluster_lookup.size == 6
+        expected = NumericEventList(np.empty([0, 2]))
+        while reader.current_row < reader.spikes_times.size:
+            result = reader.read_next()
+            if result:
+                expected.append(result["spikes"])
+
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression) as reader:
+        # Nothing before the first spike, then everything at once.
+        assert reader.read_until(0.0) is None
+        assert reader.current_row == 0
+        result = reader.read_until(1000.0)
+        assert reader.current_row == 314
+        assert result == {"spikes": expected}
+        assert expected.event_count() == 6
+
+
+def test_gold_phy_seek(fixture_path):
+    params_file = Path(fixture_path, 'phy', 'gold-phy', 'params.py')
+    filter_expression = "Amplitude > 5000"
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression, preload=True) as reader:
+        expected = reader.read_until(3100)["spikes"]
+
+    with PhyClusterEventReader(params_file, FileFinder(), cluster_filter=filter_expression, preload=True) as reader:
+        # Seek past the first half of the spikes, then read the rest.
+        assert reader.can_seek()
+        reader.seek(1500)
+        result = reader.read_until(3100)["spikes"]
+        assert result.get_times().min() >= 1500
+        assert result == expected.copy_time_range(start_time=1500)
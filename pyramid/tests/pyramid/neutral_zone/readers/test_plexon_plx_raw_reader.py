@@ -5,7 +5,7 @@ import numpy as np
 
 from pytest import fixture
 
-from pyramid.neutral_zone.readers.plexon import PlexonPlxRawReader
+from pyramid.neutral_zone.readers.plexon import PlexonPlxRawReader, DataBlockHeader
 
 
 
@@ -158,7 +158,7 @@ def assert_slow_waveforms(all_blocks: dict[int, dict[int, list]], expected: dict
 
         expected_sample_count = expected["ad_v"]["nad"][channel_id + 1]
         expected_waveform = expected["ad_v"]["val"][channel_id + 1]
-        block_waveforms = [block["waveforms"] for block in blocks]
+        block_waveforms = [block["waveforms"] * block["gain"] for block in blocks]
         channel_waveform = np.concatenate(block_waveforms)
         assert channel_waveform.shape[0] == expected_sample_count
         assert np.array_equal(channel_waveform, expected_waveform)
@@ -212,7 +212,7 @@ def assert_dsp_waveforms(all_blocks: dict[int, dict[int, list]], expected: dict)
             )
             expected_unit_samples = expected_waveforms[channel_id + 1, unit_id + 1]
 
-            unit_samples_per_block = [block["waveforms"] for block in unit_blocks]
+            unit_samples_per_block = [block["waveforms"] * block["gain"] for block in unit_blocks]
             unit_samples = np.stack(unit_samples_per_block)
             assert unit_samples.shape == expected_unit_shape
             assert np.array_equal(unit_samples, expected_unit_samples)
@@ -304,3 +304,139 @@ def test_waveform_freq_zero(fixture_path):
         assert raw_reader.global_header["WaveformFreq"] == 0
         all_blocks = read_all_blocks(raw_reader)
         assert_sequential_block_timestamps(all_blocks)
+
+
+def test_next_blocks_same_as_next_block(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        expected_blocks = []
+        block = raw_reader.next_block()
+        while block:
+            expected_blocks.append(block)
+            block = raw_reader.next_block()
+
+    # Read in small byte ranges to exercise blocks that span reads.
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        all_blocks = []
+        blocks = raw_reader.next_blocks(max_bytes=1000)
+        while blocks:
+            all_blocks.append(blocks)
+            blocks = raw_reader.next_blocks(max_bytes=1000)
+
+        index = np.concatenate([blocks["index"] for blocks in all_blocks])
+        assert index.size == len(expected_blocks)
+        assert np.array_equal(index["offset"] + 16, [block["file_offset"] for block in expected_blocks])
+        assert np.array_equal(index["type"], [block["type"] for block in expected_blocks])
+        assert np.array_equal(index["channel"], [block["channel"] for block in expected_blocks])
+        assert np.array_equal(index["unit"], [block["unit"] for block in expected_blocks])
+        assert np.array_equal(index["timestamp"], [block["timestamp"] for block in expected_blocks])
+        assert np.array_equal(
+            raw_reader.block_times(index),
+            [block["timestamp_seconds"] for block in expected_blocks]
+        )
+
+        # Waveforms for all the slow channel blocks should match too.
+        slow_words = np.concatenate([
+            raw_reader.block_words(blocks, np.flatnonzero(blocks["index"]["type"] == 5))
+            for blocks in all_blocks
+        ])
+        expected_slow_words = np.concatenate([
+            block["waveforms"]
+            for block in expected_blocks
+            if block["type"] == 5
+        ])
+        assert np.array_equal(slow_words, expected_slow_words)
+
+
+def test_block_index_file(fixture_path, tmp_path):
+    original_plx_file = Path(fixture_path, "plexon", "opx141spkOnly004.plx")
+    plx_file = Path(tmp_path, "opx141spkOnly004.plx")
+    plx_file.write_bytes(original_plx_file.read_bytes())
+
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        expected_index = raw_reader.build_block_index()
+        assert expected_index.size > 0
+
+    # The first run should build the index and write it next to the .plx file.
+    index_file = Path(tmp_path, "opx141spkOnly004.plx.pyramid-index")
+    assert not index_file.exists()
+    with PlexonPlxRawReader(plx_file, cache_block_index=True) as raw_reader:
+        assert np.array_equal(raw_reader.block_index, expected_index)
+    assert index_file.exists()
+
+    # The next run should load the same index from the file.
+    with PlexonPlxRawReader(plx_file, cache_block_index=True) as raw_reader:
+        assert raw_reader.load_block_index(index_file) is not None
+        assert np.array_equal(raw_reader.block_index, expected_index)
+
+        # Reading with the index should give the same blocks as walking the headers.
+        blocks = raw_reader.next_blocks(max_bytes=1000)
+        indexed = []
+        while blocks:
+            assert blocks["data"].size <= 1000 or blocks["index"].size == 1
+            indexed.append(blocks["index"])
+            blocks = raw_reader.next_blocks(max_bytes=1000)
+        assert np.array_equal(np.concatenate(indexed), expected_index)
+
+    # A copy of the file with a new modification time should still match the index, by hash.
+    copy_dir = Path(tmp_path, "copy")
+    copy_dir.mkdir()
+    plx_copy = Path(copy_dir, "opx141spkOnly004.plx")
+    plx_copy.write_bytes(plx_file.read_bytes())
+    with PlexonPlxRawReader(plx_copy, block_index_dir=tmp_path) as raw_reader:
+        assert raw_reader.load_block_index(index_file) is not None
+
+    # A changed file should not match the index.
+    with open(plx_file, 'ab') as f:
+        f.write(b'0')
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        assert raw_reader.load_block_index(index_file) is None
+
+
+def test_block_index_dir(fixture_path, tmp_path):
+    plx_file = Path(fixture_path, "plexon", "opx141spkOnly004.plx")
+    with PlexonPlxRawReader(plx_file, cache_block_index=True, block_index_dir=tmp_path) as raw_reader:
+        assert raw_reader.block_index.size > 0
+    assert Path(tmp_path, "opx141spkOnly004.plx.pyramid-index").exists()
+
+
+def test_mmap_same_as_stream(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "opx141ch1to3analogOnly003.plx")
+    with PlexonPlxRawReader(plx_file) as raw_reader:
+        expected_blocks = read_all_blocks(raw_reader)
+
+    with PlexonPlxRawReader(plx_file, use_mmap=True) as raw_reader:
+        assert raw_reader.plx_stream is None
+        all_blocks = read_all_blocks(raw_reader)
+    assert raw_reader.plx_map is None
+
+    for block_type, channel_blocks in expected_blocks.items():
+        assert channel_blocks.keys() == all_blocks[block_type].keys()
+        for channel, blocks in channel_blocks.items():
+            for expected_block, block in zip(blocks, all_blocks[block_type][channel], strict=True):
+                for key, value in expected_block.items():
+                    assert np.array_equal(block[key], value)
+
+
+def test_mmap_waveforms_are_views(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "opx141ch1to3analogOnly003.plx")
+    with PlexonPlxRawReader(plx_file, use_mmap=True) as raw_reader:
+        block_header = raw_reader.consume_type(DataBlockHeader)
+        while block_header["NumberOfWaveforms"] == 0:
+            block_header = raw_reader.consume_type(DataBlockHeader)
+        waveforms = raw_reader.consume_block_waveforms(block_header)
+        assert waveforms.size > 0
+        assert not waveforms.flags.owndata
+        assert not waveforms.flags.writeable
+
+        # Blocks from next_block() should also keep the mapped words, along with the gain to apply.
+        block = raw_reader.next_block()
+        while block["type"] == 4:
+            block = raw_reader.next_block()
+        assert block["waveforms"].dtype == np.int16
+        assert not block["waveforms"].flags.owndata
+        assert block["gain"] == raw_reader.gain_per_slow_channel[block["channel"]]
+
+        # Bulk reads should also be views into the mapped file.
+        blocks = raw_reader.next_blocks()
+        assert not blocks["data"].flags.owndata
@@ -261,3 +261,300 @@ def test_read_whole_plx_file_aliased_channels_only(fixture_path):
 
         # Calling read_next() and getting StopIteration should do nothing.
         assert reader.raw_reader.block_count == 52084
+
+
+def read_all_results(reader: PlexonPlxReader) -> list[tuple[dict, int]]:
+    all_results = []
+    while True:
+        try:
+            next = reader.read_next()
+            all_results.append((next, reader.raw_reader.block_count))
+        except StopIteration:
+            return all_results
+
+
+def test_bulk_decode_same_as_block_by_block(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "opx141ch1to3analogOnly003.plx")
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=0.5) as reader:
+        expected_results = read_all_results(reader)
+
+    # Bulk decoding should produce the same results for each read, including across small bulk reads from the file.
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=0.5, bulk_decode=True) as reader:
+        assert read_all_results(reader) == expected_results
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=0.5, bulk_decode=True, bytes_per_read=4096) as reader:
+        assert read_all_results(reader) == expected_results
+
+
+def test_bulk_decode_several_seconds_at_a_time(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=4.0) as reader:
+        expected_results = read_all_results(reader)
+
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=4.0, bulk_decode=True) as reader:
+        all_results = read_all_results(reader)
+
+    # Same blocks should be consumed per read, as when reading block by block.
+    block_counts = [block_count for _, block_count in all_results]
+    assert block_counts == [12692, 26623, 39860, 52084]
+    assert all_results == expected_results
+
+    # Results should be batched per channel.
+    (first_results, _) = all_results[0]
+    assert first_results["event_Start"] == NumericEventList(np.array([[0.0, 0.0]]))
+    assert first_results["spike_SPK03"].event_count() > 1
+    assert first_results["signal_FP07"].sample_count() > 1
+    (last_results, _) = all_results[-1]
+    assert last_results["event_Stop"] == NumericEventList(np.array([[16.12205, 0.0]]))
+
+
+def test_bulk_decode_with_block_index(fixture_path, tmp_path):
+    plx_file = Path(fixture_path, "plexon", "opx141ch1to3analogOnly003.plx")
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=0.5, bulk_decode=True) as reader:
+        expected_results = read_all_results(reader)
+
+    # Results should be the same when building the block index, and again when loading it.
+    for _ in range(2):
+        with PlexonPlxReader(
+            plx_file,
+            FileFinder(),
+            seconds_per_read=0.5,
+            bulk_decode=True,
+            bytes_per_read=4096,
+            cache_block_index=True,
+            block_index_dir=tmp_path
+        ) as reader:
+            assert read_all_results(reader) == expected_results
+        assert Path(tmp_path, "opx141ch1to3analogOnly003.plx.pyramid-index").exists()
+
+
+def test_bulk_decode_with_mmap(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "opx141ch1to3analogOnly003.plx")
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=0.5) as reader:
+        expected_results = read_all_results(reader)
+
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=0.5, bulk_decode=True, use_mmap=True) as reader:
+        assert read_all_results(reader) == expected_results
+    assert reader.raw_reader.plx_map is None
+
+
+def merge_results(all_results: list[tuple[dict, int]]) -> dict:
+    merged = {}
+    for results, _ in all_results:
+        for name, data in results.items():
+            if name in merged:
+                merged[name].append(data)
+            else:
+                merged[name] = data.copy()
+    return merged
+
+
+def test_bulk_decode_selected_channels_only(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=4.0) as reader:
+        expected = merge_results(read_all_results(reader))
+
+    spikes = {"SPK03": "my_spikes"}
+    events = {
+        "Start": "my_start_event",
+        "Stop": "my_stop_event"
+    }
+    signals = {"FP07": "my_signal"}
+    with PlexonPlxReader(
+        plx_file,
+        FileFinder(),
+        spikes=spikes,
+        events=events,
+        signals=signals,
+        seconds_per_read=4.0,
+        bulk_decode=True
+    ) as reader:
+        all_results = read_all_results(reader)
+
+    # Only blocks for the selected channels should be consumed.
+    selected_block_count = all_results[-1][1]
+    assert selected_block_count < 52084
+
+    merged = merge_results(all_results)
+    assert merged.keys() == {"my_spikes", "my_start_event", "my_stop_event", "my_signal"}
+    assert merged["my_spikes"] == expected["spike_SPK03"]
+    assert merged["my_start_event"] == expected["event_Start"]
+    assert merged["my_stop_event"] == expected["event_Stop"]
+    assert merged["my_signal"] == expected["signal_FP07"]
+
+
+def test_bulk_decode_channels_aliased_to_one_name(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "opx141spkOnly004.plx")
+    with PlexonPlxReader(plx_file, FileFinder()) as reader:
+        spikes = {header["Name"]: "all_spikes" for header in reader.raw_reader.dsp_channel_headers}
+    assert len(spikes) > 1
+
+    with PlexonPlxReader(plx_file, FileFinder(), spikes=spikes) as reader:
+        expected_results = read_all_results(reader)
+
+    # Bulk decoding should merge blocks from all the aliased channels, not just keep the last channel.
+    with PlexonPlxReader(plx_file, FileFinder(), spikes=spikes, bulk_decode=True) as reader:
+        all_results = read_all_results(reader)
+    assert all_results == expected_results
+
+    merged = merge_results(all_results)
+    assert merged["all_spikes"].event_count() == 7664
+    assert set(merged["all_spikes"].get_values(value_index=0)) == {1, 4, 5, 6, 7, 8}
+
+
+def test_bulk_decode_time_range(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=4.0) as reader:
+        expected = merge_results(read_all_results(reader))
+
+    with PlexonPlxReader(plx_file, FileFinder(), start_time=5.0, end_time=10.0) as reader:
+        assert reader.bulk_decode
+        merged = merge_results(read_all_results(reader))
+
+    # Events should be those in the time range, only.
+    assert "event_Start" not in merged
+    assert "event_Stop" not in merged
+    assert merged["spike_SPK03"] == expected["spike_SPK03"].copy_time_range(5.0, 10.0)
+
+    # Signals should be whole blocks that overlap the time range.
+    signal = merged["signal_FP07"]
+    assert signal.first_sample_time <= 5.0
+    assert signal.get_end_time() >= 10.0 - 1 / signal.sample_frequency
+    expected_signal = expected["signal_FP07"]
+    (start, end) = expected_signal.get_sample_range(signal.first_sample_time, signal.get_end_time() + 0.0001)
+    assert np.array_equal(signal.sample_data, expected_signal.sample_data[start:end])
+
+
+def read_results_until(reader: PlexonPlxReader, times: list[float]) -> list[tuple[dict, int]]:
+    all_results = []
+    for time in times:
+        try:
+            next = reader.read_until(time)
+            all_results.append((next, reader.raw_reader.block_count))
+        except StopIteration:
+            break
+    return all_results
+
+
+def test_read_until_block_by_block_and_bulk(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    times = [0.0, 4.0, 4.0, 8.0, 12.0, 16.0, 20.0, 24.0]
+    with PlexonPlxReader(plx_file, FileFinder()) as reader:
+        assert reader.can_read_until()
+        expected_results = read_results_until(reader, times)
+
+    # Each read should stop at the first block that reaches the target time plus seconds_per_read,
+    # until the file runs out at 20.0.
+    block_counts = [block_count for _, block_count in expected_results]
+    assert block_counts == [2993, 16220, 16220, 30014, 42750, 52084]
+
+    # Reading until the same time twice should read nothing new.
+    assert expected_results[2][0] is None
+
+    # The last read should get the remaining blocks.
+    (last_results, _) = expected_results[-1]
+    assert last_results["event_Stop"] == NumericEventList(np.array([[16.12205, 0.0]]))
+
+    # Bulk decoding should consume the same blocks and produce the same results.
+    with PlexonPlxReader(plx_file, FileFinder(), bulk_decode=True, bytes_per_read=4096) as reader:
+        assert read_results_until(reader, times) == expected_results
+
+
+def append_all_results(all_results: dict, results: dict):
+    for name, data in results.items():
+        if name in all_results:
+            all_results[name].append(data)
+        else:
+            all_results[name] = data
+
+
+def test_read_until_reads_all_data_before_time(fixture_path):
+    # Blocks in this file are only raggedly ordered in time, between channels.
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxReader(plx_file, FileFinder()) as reader:
+        expected_results = {}
+        while True:
+            try:
+                append_all_results(expected_results, reader.read_next())
+            except StopIteration:
+                break
+
+    for bulk_decode in [False, True]:
+        with PlexonPlxReader(plx_file, FileFinder(), bulk_decode=bulk_decode) as reader:
+            all_results = {}
+            for time in [0.0, 4.0, 8.0, 12.0, 16.0]:
+                append_all_results(all_results, reader.read_until(time))
+
+                # After read_until(time), all data before time should be in hand, from all channels.
+                for name, expected_data in expected_results.items():
+                    expected_count = np.count_nonzero(expected_data.get_times() < time)
+                    if name in all_results:
+                        actual_count = np.count_nonzero(all_results[name].get_times() < time)
+                    else:
+                        actual_count = 0
+                    assert actual_count == expected_count
+
+
+def test_seek_same_as_start_time(fixture_path):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=4.0, start_time=5.0) as reader:
+        expected_results = read_all_results(reader)
+
+    # Seeking after entering the reader should skip the same blocks as a start_time given up front.
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=4.0) as reader:
+        assert reader.can_seek()
+        reader.seek(5.0)
+        assert reader.bulk_decode
+        assert reader.start_time == 5.0
+        assert read_all_results(reader) == expected_results
+
+    # Seeking also keeps any channel selection.
+    events = {"Stop": "my_stop_event"}
+    with PlexonPlxReader(plx_file, FileFinder(), spikes={}, events=events, signals={}, bulk_decode=True) as reader:
+        reader.seek(5.0)
+        merged = merge_results(read_all_results(reader))
+    assert merged.keys() == {"my_stop_event"}
+    assert merged["my_stop_event"] == NumericEventList(np.array([[16.12205, 0.0]]))
+
+
+def test_seek_with_shared_block_index(fixture_path, monkeypatch):
+    plx_file = Path(fixture_path, "plexon", "16sp_lfp_with_2coords.plx")
+    with PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=4.0, start_time=5.0) as reader:
+        expected_results = read_all_results(reader)
+
+    # One reader can prepare the block index...
+    seek_index = PlexonPlxReader(plx_file, FileFinder()).get_seek_index()
+    assert seek_index.size == 52084
+
+    # ...and other readers can seek with it, without scanning the file again.
+    reader = PlexonPlxReader(plx_file, FileFinder(), seconds_per_read=4.0)
+    reader.set_seek_index(seek_index)
+
+    def no_scanning():
+        raise AssertionError("Should use the shared block index instead of scanning.")
+    monkeypatch.setattr(reader.raw_reader, "build_block_index", no_scanning)
+    with reader:
+        reader.seek(5.0)
+        assert read_all_results(reader) == expected_results
+
+
+def test_shared_block_index_uses_block_index_file(fixture_path, tmp_path, monkeypatch):
+    original_plx_file = Path(fixture_path, "plexon", "opx141ch1to3analogOnly003.plx")
+    plx_file = Path(tmp_path, "opx141ch1to3analogOnly003.plx")
+    plx_file.write_bytes(original_plx_file.read_bytes())
+    index_file = Path(tmp_path, "opx141ch1to3analogOnly003.plx.pyramid-index")
+
+    # Without cache_block_index, preparing the shared index doesn't write a block index file.
+    expected_index = PlexonPlxReader(plx_file, FileFinder()).get_seek_index()
+    assert not index_file.exists()
+
+    # With cache_block_index, it does.
+    assert np.array_equal(PlexonPlxReader(plx_file, FileFinder(), cache_block_index=True).get_seek_index(), expected_index)
+    assert index_file.exists()
+
+    # Then any reader can use the block index file to prepare the shared index, without scanning the file again.
+    reader = PlexonPlxReader(plx_file, FileFinder())
+
+    def no_scanning():
+        raise AssertionError("Should use the block index file instead of scanning.")
+    monkeypatch.setattr(reader.raw_reader, "build_block_index", no_scanning)
+    assert np.array_equal(reader.get_seek_index(), expected_index)
@@ -0,0 +1,214 @@
+import time
+import numpy as np
+
+from pyramid.model.events import NumericEventList
+from pyramid.model.model import Buffer, BufferData
+from pyramid.neutral_zone.readers.readers import Reader, ReaderRoute, ReaderRouter
+from pyramid.neutral_zone.readers.prefetch import PrefetchReader
+
+
+class ScriptedReader(Reader):
+
+    def __init__(self, script=[], result_name="events", delay=0.0) -> None:
+        self.index = -1
+        self.script = script
+        self.result_name = result_name
+        self.delay = delay
+        self.entered = False
+        self.exited = False
+
+    def __enter__(self):
+        self.entered = True
+        return self
+
+    def __exit__(self, __exc_type, __exc_value, __traceback):
+        self.exited = True
+
+    def read_next(self) -> dict[str, NumericEventList]:
+        time.sleep(self.delay)
+        self.index += 1
+        if self.index >= len(self.script):
+            raise StopIteration
+
+        next = self.script[self.index]
+        if next is None:
+            return None
+        if not isinstance(next, list):
+            raise ValueError("Scripted reader needs a list of numbers!")
+        return {
+            self.result_name: NumericEventList(np.array(next))
+        }
+
+    def get_initial(self) -> dict[str, BufferData]:
+        return {
+            self.result_name: NumericEventList(np.empty([0, 2]))
+        }
+
+
+def router_for_reader(reader: Reader):
+    initial_results = reader.get_initial()
+    return ReaderRouter(
+        reader=reader,
+        routes=[ReaderRoute("events", "events")],
+        named_buffers={"events": Buffer(initial_results["events"].copy())}
+    )
+
+
+def test_prefetch_same_results_as_reader():
+    script = [[[0, 0]], [[1, 10]], None, [[2, 20]], [[3, 30]]]
+    expected_results = [
+        {"events": NumericEventList(np.array([[0, 0]]))},
+        {"events": NumericEventList(np.array([[1, 10]]))},
+        {"events": NumericEventList(np.array([[2, 20]]))},
+        {"events": NumericEventList(np.array([[3, 30]]))},
+    ]
+
+    inner_reader = ScriptedReader(script)
+    with PrefetchReader(inner_reader) as reader:
+        assert inner_reader.entered
+        assert reader.get_initial() == inner_reader.get_initial()
+
+        results = []
+        while True:
+            try:
+                next_result = reader.read_next()
+                if next_result:
+                    results.append(next_result)
+            except StopIteration:
+                break
+
+    assert inner_reader.exited
+    assert results == expected_results
+    assert reader.result_count == 4
+
+
+def test_prefetch_applies_backpressure():
+    script = [[[index, index]] for index in range(100)]
+    inner_reader = ScriptedReader(script)
+    with PrefetchReader(inner_reader, max_queue_size=5) as reader:
+        # Give the background thread time to fill the queue, then it should wait.
+        time.sleep(0.1)
+        assert inner_reader.index <= 6
+        assert reader.result_queue.qsize() == 5
+
+        assert reader.read_next() == {"events": NumericEventList(np.array([[0, 0]]))}
+        time.sleep(0.1)
+        assert reader.result_queue.qsize() == 5
+
+    assert reader.queue_depth_max == 5
+
+
+def test_prefetch_stops_on_exit():
+    # Read forever, until stopped.
+    inner_reader = ScriptedReader([[[0, 0]]] * 1000, delay=0.001)
+    with PrefetchReader(inner_reader) as reader:
+        reader.read_next()
+
+    assert not reader.thread
+    assert inner_reader.exited
+    assert inner_reader.index < 1000
+
+
+def test_prefetch_waits_for_read_in_progress():
+    inner_reader = ScriptedReader([[[0, 0]], [[1, 10]]], delay=0.05)
+    with PrefetchReader(inner_reader) as reader:
+        assert reader.read_next() == {"events": NumericEventList(np.array([[0, 0]]))}
+        assert reader.read_next() == {"events": NumericEventList(np.array([[1, 10]]))}
+        assert reader.wait_count == 2
+
+
+def test_prefetch_empty_reads_return_none():
+    inner_reader = ScriptedReader([None] * 1000, delay=0.001)
+    with PrefetchReader(inner_reader) as reader:
+        time.sleep(0.05)
+        assert reader.read_next() is None
+        assert reader.wait_count == 0
+
+
+def test_router_gets_prefetch_stop_iteration():
+    script = [[[0, 0]], [[1, 10]], [[2, 20]]]
+    with PrefetchReader(ScriptedReader(script)) as reader:
+        router = router_for_reader(reader)
+        assert router.route_until(10.0) == 2.0
+        assert router.named_buffers["events"].data == NumericEventList(np.array([[0, 0], [1, 10], [2, 20]]))
+        assert isinstance(router.reader_exception, StopIteration)
+
+
+def test_router_gets_prefetch_reader_errors():
+    script = [[[0, 0]], [[1, 10]], "error!", [[2, 20]]]
+    with PrefetchReader(ScriptedReader(script)) as reader:
+        router = router_for_reader(reader)
+        assert router.route_next() == True
+        assert router.route_next() == True
+
+        # The background thread hit an error, which the router should see in turn.
+        assert router.route_next() == False
+        assert isinstance(router.reader_exception, ValueError)
+        assert router.named_buffers["events"].data == NumericEventList(np.array([[0, 0], [1, 10]]))
+
+
+class SeekableScriptedReader(ScriptedReader):
+
+    def can_read_until(self) -> bool:
+        return True
+
+    def read_until(self, time: float) -> dict[str, NumericEventList]:
+        rows = []
+        while self.index + 1 < len(self.script) and self.script[self.index + 1][0][0] <= time:
+            self.index += 1
+            rows.extend(self.script[self.index])
+        if self.index + 1 >= len(self.script) and not rows:
+            raise StopIteration
+        if not rows:
+            return None
+        return {
+            self.result_name: NumericEventList(np.array(rows))
+        }
+
+    def can_seek(self) -> bool:
+        return True
+
+    def seek(self, time: float) -> None:
+        self.index = -1
+        while self.index + 1 < len(self.script) and self.script[self.index + 1][0][0] < time:
+            self.index += 1
+
+    def get_seek_index(self):
+        return "index"
+
+
+def test_prefetch_forwards_seek():
+    script = [[[index, index]] for index in range(100)]
+    inner_reader = SeekableScriptedReader(script)
+    reader = PrefetchReader(inner_reader, max_queue_size=5)
+    assert reader.can_seek()
+    assert reader.get_seek_index() == "index"
+    with reader:
+        # Let the background thread fill the queue from the start, then seek past it.
+        time.sleep(0.1)
+        assert reader.result_queue.qsize() == 5
+
+        reader.seek(50)
+        assert reader.read_next() == {"events": NumericEventList(np.array([[50, 50]]))}
+        assert reader.read_next() == {"events": NumericEventList(np.array([[51, 51]]))}
+
+
+def test_prefetch_reads_until_through_queue():
+    script = [[[index, index]] for index in range(10)]
+    inner_reader = SeekableScriptedReader(script)
+    reader = PrefetchReader(inner_reader, max_queue_size=3)
+
+    # Routers should read through the queue, even though the other reader can read until.
+    assert not reader.can_read_until()
+    with reader:
+        time.sleep(0.1)
+        assert reader.result_queue.qsize() == 3
+
+        # Results already in the queue come first, then the other reader catches up to the target time.
+        expected_rows = [[index, index] for index in range(7)]
+        assert reader.read_until(6) == {"events": NumericEventList(np.array(expected_rows))}
+        assert reader.can_read_until()
+
+        # Prefetching resumes with read_next().
+        assert reader.read_next() == {"events": NumericEventList(np.array([[7, 7]]))}
+        assert not reader.can_read_until()
@@ -1,3 +1,5 @@
+import asyncio
+import time
 import numpy as np
 
 from pyramid.model.events import NumericEventList
@@ -38,6 +40,46 @@ class FakeNumericEventReader(Reader):
         }
 
 
+class FakeReadUntilReader(FakeNumericEventReader):
+
+    def __init__(self, script=[], result_name="events") -> None:
+        super().__init__(script, result_name)
+        self.read_until_times = []
+        self.last_time = -1
+
+    def can_read_until(self) -> bool:
+        return True
+
+    def read_until(self, time: float) -> dict[str, NumericEventList]:
+        # Return all the events from the script, up to and including the given time.
+        self.index += 1
+        self.read_until_times.append(time)
+        events = np.array([event for event in self.script if event[0] <= time and event[0] > self.last_time])
+        if events.size == 0:
+            return None
+
+        self.last_time = events[-1, 0]
+        return {
+            self.result_name: NumericEventList(events)
+        }
+
+
+class FakeSeekReader(FakeNumericEventReader):
+
+    def __init__(self, script=[], result_name="events") -> None:
+        super().__init__(script, result_name)
+        self.seek_times = []
+
+    def can_seek(self) -> bool:
+        return True
+
+    def seek(self, time: float) -> None:
+        # Skip script entries that end before the given time.
+        self.seek_times.append(time)
+        while self.index + 1 < len(self.script) and self.script[self.index + 1][-1][0] < time:
+            self.index += 1
+
+
 def buffers_for_reader_and_routes(reader: Reader, routes: list[ReaderRoute]):
     initial_results = reader.get_initial()
     named_buffers = {}
@@ -93,6 +135,36 @@ def test_router_copy_events_to_buffers():
     assert router.named_buffers["two"].data == NumericEventList(np.array([[0, 0], [1, 10], [2, 20]]))
 
 
+def test_router_tracks_end_times_from_appended_data():
+    reader = FakeNumericEventReader([[[1, 10], [0, 0]], [[3, 5]], [[2, 20]]])
+    routes = [
+        ReaderRoute("events", "all"),
+        ReaderRoute("events", "big", [FilterRange(min=10)])
+    ]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+    assert router.max_buffer_time == 0
+
+    # The end time should come from the latest appended data, even when unsorted.
+    assert router.route_next() == True
+    assert router.max_buffer_time == 1
+
+    assert router.route_next() == True
+    assert router.max_buffer_time == 3
+
+    # The end time should not go backwards when appended data are earlier.
+    assert router.route_next() == True
+    assert router.max_buffer_time == 3
+
+    # The end time should not change when buffers discard old data.
+    for buffer in router.named_buffers.values():
+        buffer.data.discard_before(10)
+    assert router.max_buffer_time == 3
+
+
 def test_router_tolerates_missing_buffer_and_results():
     reader = FakeNumericEventReader([[[0, 0]], [[1, 10]], [[2, 20]], [[3, 30]]])
 
@@ -195,6 +267,72 @@ def test_router_routes_until_target_time():
     assert router.named_buffers["one"].data == NumericEventList(np.array([[0, 0], [1, 10], [2, 20]]))
 
 
+def test_router_prefers_read_until():
+    reader = FakeReadUntilReader([[0, 0], [1, 10], [2, 20], [3, 30]])
+    routes = [ReaderRoute("events", "one")]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+
+    # Router should ask the reader for exactly the data up to the target time, in one call.
+    assert router.route_until(1.5) == 1
+    assert reader.read_until_times == [1.5]
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[0, 0], [1, 10]]))
+
+    # Router should use read_until() even when there's no new data, instead of retrying read_next().
+    assert router.route_until(1.5) == 1
+    assert reader.read_until_times == [1.5, 1.5]
+
+    # Async reads should also use read_until().
+    assert asyncio.run(router.route_until_async(3.5)) == 3
+    assert reader.read_until_times == [1.5, 1.5, 3.5]
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[0, 0], [1, 10], [2, 20], [3, 30]]))
+
+
+def test_router_seek_discards_data_while_catching_up():
+    reader = FakeNumericEventReader([[[0, 0], [1, 10]], None, [[2, 20], [3, 30]], [[4, 40]], [[5, 50]]])
+    routes = [ReaderRoute("events", "one")]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+
+    # Router should read until an event arrives at or past the target time, discarding data before the target.
+    assert not reader.can_seek()
+    router.seek(2.5)
+    assert reader.index == 2
+    assert router.max_buffer_time == 3
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[3, 30]]))
+
+    # Routing should pick up from there.
+    assert router.route_until(4.5) == 5
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[3, 30], [4, 40], [5, 50]]))
+
+
+def test_router_prefers_seek():
+    reader = FakeSeekReader([[[0, 0], [1, 10]], [[2, 20], [3, 30]], [[4, 40]], [[5, 50]]])
+    routes = [ReaderRoute("events", "one")]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+
+    # Router should ask the reader to skip ahead, without reading.
+    router.seek(3.5)
+    assert reader.seek_times == [3.5]
+    assert reader.index == 1
+    assert router.max_buffer_time == 0
+    assert router.named_buffers["one"].data.event_count() == 0
+
+    # Routing should pick up from there.
+    assert router.route_until(4.5) == 5
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[4, 40], [5, 50]]))
+
+
 def test_router_routes_until_target_time_with_retries():
     # The reader will have some gaps in the data that require retries to get passed.
     reader = FakeNumericEventReader([None, [[0, 0]], None, None, [[1, 10]], None, [[2, 20]], [[3, 30]]])
@@ -222,6 +360,108 @@ def test_router_routes_until_target_time_with_retries():
     assert router.named_buffers["one"].data == NumericEventList(np.array([[0, 0], [1, 10], [2, 20]]))
 
 
+def test_router_routes_until_target_time_async():
+    # Same as test_router_routes_until_target_time_with_retries, above, but with asyncio.
+    reader = FakeNumericEventReader([None, [[0, 0]], None, None, [[1, 10]], None, [[2, 20]], [[3, 30]]])
+    routes = [ReaderRoute("events", "one")]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes),
+        empty_reads_allowed=2
+    )
+
+    assert asyncio.run(router.route_until_async(1.5)) == 2
+    assert asyncio.run(router.route_until_async(1.5)) == 2
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[0, 0], [1, 10], [2, 20]]))
+
+
+def test_router_async_reader_errors():
+    class StoppingReader(FakeNumericEventReader):
+        def read_next(self) -> dict[str, NumericEventList]:
+            if self.index + 1 >= len(self.script):
+                raise StopIteration
+            return super().read_next()
+
+    # StopIteration from the reader should come through as StopAsyncIteration.
+    reader = StoppingReader([[[0, 0]]])
+    routes = [ReaderRoute("events", "one")]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+    assert asyncio.run(router.route_next_async()) == True
+    assert asyncio.run(router.route_next_async()) == False
+    assert isinstance(router.reader_exception, StopAsyncIteration)
+    assert not router.still_going()
+
+    # Other errors should come through as-is.
+    reader = FakeNumericEventReader([[[0, 0]], "error!"])
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+    assert asyncio.run(router.route_next_async()) == True
+    assert asyncio.run(router.route_next_async()) == False
+    assert isinstance(router.reader_exception, ValueError)
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[0, 0]]))
+
+
+def test_router_records_arrival_time():
+    reader = FakeNumericEventReader([[[0, 0]], None])
+    routes = [ReaderRoute("events", "one")]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+    assert router.last_arrival_time is None
+
+    # Arrival time is noted as results come back from the reader, before routing.
+    before_time = time.perf_counter()
+    assert asyncio.run(router.route_next_async()) == True
+    after_time = time.perf_counter()
+    assert before_time <= router.last_arrival_time <= after_time
+
+    # Empty reads don't count as arrivals.
+    arrival_time = router.last_arrival_time
+    assert router.route_next() == False
+    assert router.last_arrival_time == arrival_time
+
+
+def test_async_read_finishes_when_cancelled():
+    class SlowReader(FakeNumericEventReader):
+        def __init__(self, script=[], result_name="events") -> None:
+            super().__init__(script, result_name)
+            self.reading = False
+
+        def read_next(self) -> dict[str, NumericEventList]:
+            self.reading = True
+            time.sleep(0.1)
+            self.reading = False
+            return super().read_next()
+
+    async def cancel_read(reader: SlowReader):
+        read_task = asyncio.create_task(reader.read_next_async())
+        await asyncio.sleep(0.01)
+        assert reader.reading
+        read_task.cancel()
+        try:
+            await read_task
+        except asyncio.CancelledError:
+            pass
+        return read_task
+
+    # A read in the thread executor should finish before the cancelled task gives up on it.
+    reader = SlowReader([[[0, 0]]])
+    read_task = asyncio.run(cancel_read(reader))
+    assert read_task.cancelled()
+    assert not reader.reading
+    assert reader.index == 0
+
+
 def test_route_transforms_data():
     reader = FakeNumericEventReader([[[0, 0]], [[1, 10]], [[2, 20]]])
     route_one = ReaderRoute("events", "one")
@@ -258,6 +498,56 @@ def test_route_transforms_data():
     assert router.named_buffers["two"].data == NumericEventList(np.array([[1, -52]]))
 
 
+def test_router_copies_only_when_needed():
+    reader = FakeNumericEventReader([[[0, 0]], [[1, 10]], [[2, 20]]])
+
+    # Route one modifies data in place, and route two needs the original data, so route one needs a copy.
+    # Route two is the last to consume the data, so it can modify data in place without a copy.
+    # Route three returns new data and doesn't modify the original, so it doesn't need a copy.
+    route_one = ReaderRoute("events", "one", [OffsetThenGain(offset=42, gain=-1)])
+    route_two = ReaderRoute("events", "two", [OffsetThenGain(offset=1, gain=2)])
+    route_three = ReaderRoute("other", "three", [FilterRange(min=10)])
+    routes = [route_one, route_two, route_three]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+    assert router.route_copies == [True, False, False]
+
+    while router.route_next():
+        pass
+
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[0, -42], [1, -52], [2, -62]]))
+    assert router.named_buffers["two"].data == NumericEventList(np.array([[0, 2], [1, 22], [2, 42]]))
+
+    # Each read was copied once, for route one.
+    assert router.copy_count == 3
+    assert router.bytes_copied == 3 * np.array([[0, 0]]).nbytes
+
+
+def test_router_no_copies_for_pass_through_routes():
+    reader = FakeNumericEventReader([[[0, 0]], [[1, 10]], [[2, 20]]])
+    routes = [
+        ReaderRoute("events", "one"),
+        ReaderRoute("events", "two", [FilterRange(min=10)])
+    ]
+    router = ReaderRouter(
+        reader=reader,
+        routes=routes,
+        named_buffers=buffers_for_reader_and_routes(reader, routes)
+    )
+    assert router.route_copies == [False, False]
+
+    while router.route_next():
+        pass
+
+    assert router.named_buffers["one"].data == NumericEventList(np.array([[0, 0], [1, 10], [2, 20]]))
+    assert router.named_buffers["two"].data == NumericEventList(np.array([[1, 10], [2, 20]]))
+    assert router.copy_count == 0
+    assert router.bytes_copied == 0
+
+
 def test_router_skip_transformer_errors():
     reader = FakeNumericEventReader([[[0, 0]], [[1, 10]], [[2, 20]]])
     route_one = ReaderRoute("events", "one")
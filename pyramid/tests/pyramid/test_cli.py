@@ -6,6 +6,7 @@ import yaml
 from pytest import raises, fixture
 
 from pyramid.cli import main
+from pyramid.trials.trial_file import TrialFile
 
 
 @fixture
@@ -265,6 +266,111 @@ def test_convert(fixture_path, tmp_path):
     assert trials == expected_trials
 
 
+def test_convert_with_workers(fixture_path, tmp_path):
+    delimiter_csv = Path(fixture_path, "delimiter.csv").as_posix()
+    foo_csv = Path(fixture_path, "foo.csv").as_posix()
+    bar_csv = Path(fixture_path, "bar.csv").as_posix()
+    signal_csv = Path(fixture_path, "match_trial_signal.csv").as_posix()
+    subject_yaml = Path(fixture_path, "subject.yaml").as_posix()
+    trial_file = Path(tmp_path, "trial_file.json").as_posix()
+    experiment_yaml = Path(tmp_path, "experiment.yaml").as_posix()
+
+    with open(experiment_yaml, "w") as f:
+        yaml.safe_dump(experiment_config, f)
+
+    cli_args = [
+        "convert",
+        "--trial-file", trial_file,
+        "--experiment", experiment_yaml,
+        "--subject", subject_yaml,
+        "--workers", "3",
+        "--readers",
+        f"delimiter_reader.csv_file={delimiter_csv}",
+        f"foo_reader.csv_file={foo_csv}",
+        f"bar_reader.csv_file={bar_csv}",
+        f"match_trial_signal_reader.csv_file={signal_csv}"
+    ]
+    exit_code = main(cli_args)
+    assert exit_code == 0
+
+    # Trials should be the same as from a serial conversion, with no partition files left behind.
+    with open(trial_file) as f:
+        trials = [json.loads(trial_line) for trial_line in f]
+
+    expected_trial_list = Path(fixture_path, "expected_trial_list.json")
+    with open(expected_trial_list) as f:
+        expected_trials = json.load(f)
+
+    assert trials == expected_trials
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["experiment.yaml", "trial_file.json"]
+
+
+def test_convert_with_workers_packed_hdf5(fixture_path, tmp_path, monkeypatch):
+    delimiter_csv = Path(fixture_path, "delimiter.csv").as_posix()
+    foo_csv = Path(fixture_path, "foo.csv").as_posix()
+    bar_csv = Path(fixture_path, "bar.csv").as_posix()
+    signal_csv = Path(fixture_path, "match_trial_signal.csv").as_posix()
+    subject_yaml = Path(fixture_path, "subject.yaml").as_posix()
+    experiment_yaml = Path(tmp_path, "experiment.yaml").as_posix()
+
+    with open(experiment_yaml, "w") as f:
+        yaml.safe_dump(experiment_config, f)
+
+    reader_args = [
+        "--readers",
+        f"delimiter_reader.csv_file={delimiter_csv}",
+        f"foo_reader.csv_file={foo_csv}",
+        f"bar_reader.csv_file={bar_csv}",
+        f"match_trial_signal_reader.csv_file={signal_csv}"
+    ]
+
+    serial_file = Path(tmp_path, "serial.packed.hdf5").as_posix()
+    cli_args = ["convert", "--trial-file", serial_file, "--experiment", experiment_yaml, "--subject", subject_yaml]
+    exit_code = main(cli_args + reader_args)
+    assert exit_code == 0
+
+    # Note the trial files opened when merging and cleaning up partitions.
+    opened_files = []
+    for_file_suffix = TrialFile.for_file_suffix
+
+    def spy_for_file_suffix(file_name, format=None):
+        opened_files.append(Path(file_name).name)
+        return for_file_suffix(file_name, format)
+    monkeypatch.setattr(TrialFile, "for_file_suffix", spy_for_file_suffix)
+
+    trial_file = Path(tmp_path, "trial_file.packed.hdf5").as_posix()
+    cli_args = [
+        "convert",
+        "--trial-file", trial_file,
+        "--experiment", experiment_yaml,
+        "--subject", subject_yaml,
+        "--workers", "3"
+    ]
+    exit_code = main(cli_args + reader_args)
+    assert exit_code == 0
+
+    # Partitions should keep the ".packed" suffix, so they use the same packed format as the merged trial file.
+    assert opened_files == [
+        "trial_file.packed.hdf5",
+        "trial_file.part0.packed.hdf5",
+        "trial_file.part1.packed.hdf5",
+        "trial_file.part0.packed.hdf5",
+        "trial_file.part1.packed.hdf5"
+    ]
+
+    # Trials should be the same as from a serial conversion, with no partition files left behind.
+    with for_file_suffix(serial_file) as serial:
+        expected_trials = list(serial.read_trials())
+    with for_file_suffix(trial_file) as merged:
+        trials = list(merged.read_trials())
+    assert trials == expected_trials
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "experiment.yaml",
+        "serial.packed.hdf5",
+        "trial_file.packed.hdf5"
+    ]
+
+
 def test_convert_error(tmp_path):
     trial_file = Path(tmp_path, "trial_file.json").as_posix()
     experiment_yaml = Path(tmp_path, "experiment.yaml").as_posix()
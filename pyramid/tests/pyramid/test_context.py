@@ -1,23 +1,25 @@
 from pathlib import Path
-from pytest import fixture
+from pytest import fixture, raises
 import yaml
 import numpy as np
 
 from pyramid.model.model import Buffer
 from pyramid.model.events import NumericEventList
+from pyramid.model.signals import SignalChunk
 from pyramid.neutral_zone.readers.readers import ReaderRoute, ReaderRouter, ReaderSyncConfig, ReaderSyncRegistry
 from pyramid.neutral_zone.readers.delay_simulator import DelaySimulatorReader
 from pyramid.neutral_zone.readers.csv import CsvNumericEventReader
 from pyramid.neutral_zone.transformers.standard_transformers import OffsetThenGain
 
 from pyramid.trials.trials import TrialDelimiter, TrialExtractor, TrialExpression
+from pyramid.trials.trial_file import TrialFile
 from pyramid.trials.standard_enhancers import TrialDurationEnhancer
 
 from pyramid.plotters.plotters import PlotFigureController
 from pyramid.plotters.standard_plotters import BasicInfoPlotter, NumericEventsPlotter, SignalChunksPlotter
 
 from pyramid.file_finder import FileFinder
-from pyramid.context import PyramidContext, configure_readers, configure_trials, configure_plotters
+from pyramid.context import PyramidContext, configure_readers, configure_trials, configure_plotters, convert_partition
 
 
 @fixture
@@ -128,6 +130,25 @@ def test_configure_readers():
     assert sync_registry == expected_sync_registry
 
 
+def test_configure_readers_max_signal_duration(fixture_path):
+    readers_config = {
+        "signal_reader": {
+            "class": "pyramid.neutral_zone.readers.csv.CsvSignalReader",
+            "args": {
+                "csv_file": Path(fixture_path, "match_trial_signal.csv").as_posix(),
+                "result_name": "signal"
+            },
+            "max_signal_duration": 10.0
+        }
+    }
+    (readers, named_buffers, reader_routers, sync_registry) = configure_readers(readers_config)
+
+    expected_named_buffers = {
+        "signal": Buffer(SignalChunk(np.empty([0, 1]), 1.0, 0.0, ["match_trial"], max_duration=10.0)),
+    }
+    assert named_buffers == expected_named_buffers
+
+
 def test_configure_trials():
     trials_config = {
         "start_buffer": "start",
@@ -302,3 +323,117 @@ def test_from_yaml_and_reader_overrides(fixture_path):
         file_finder=expected_file_finder
     )
     assert context == expected_context
+
+
+def test_delimit_trials(fixture_path):
+    experiment_yaml = Path(fixture_path, "experiment.yaml").as_posix()
+    delimiter_csv = Path(fixture_path, "delimiter.csv").as_posix()
+    context = PyramidContext.from_yaml_and_reader_overrides(
+        experiment_yaml,
+        reader_overrides=[f"start_reader.csv_file={delimiter_csv}"]
+    )
+
+    # Trial 0 starts at the default trial_start_time, the rest at each "start" event, with the last trial after.
+    assert context.delimit_trials() == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_run_with_plots_records_latency(fixture_path, tmp_path):
+    experiment_yaml = Path(fixture_path, "experiment.yaml").as_posix()
+    delimiter_csv = Path(fixture_path, "delimiter.csv").as_posix()
+    foo_csv = Path(fixture_path, "foo.csv").as_posix()
+    bar_csv = Path(fixture_path, "bar.csv").as_posix()
+    trial_file = Path(tmp_path, "trial_file.json").as_posix()
+    context = PyramidContext.from_yaml_and_reader_overrides(
+        experiment_yaml,
+        reader_overrides=[
+            f"start_reader.csv_file={delimiter_csv}",
+            f"wrt_reader.csv_file={delimiter_csv}",
+            f"foo_reader.csv_file={foo_csv}",
+            f"bar_reader.csv_file={bar_csv}"
+        ]
+    )
+    context.run_with_plots(trial_file)
+
+    # Latencies are recorded for each trial delimited during the run, but not the last trial after.
+    assert len(context.plot_latencies) == 3
+    assert all([latency >= 0 for latency in context.plot_latencies])
+
+
+def drift_experiment_config(tmp_path: Path, trial_count: int, drift_per_trial: float) -> dict:
+    """Write CSV files for a reference reader and another reader whose clock drifts, with sync events every trial."""
+    start_csv = Path(tmp_path, "start.csv")
+    drift_csv = Path(tmp_path, "drift.csv")
+    with open(start_csv, "w") as start_file, open(drift_csv, "w") as drift_file:
+        start_file.write("time,value\n")
+        drift_file.write("time,value\n")
+        for trial in range(1, trial_count):
+            drift = trial * drift_per_trial
+            start_file.write(f"{trial},1010\n{trial + 0.5},42\n")
+            drift_file.write(f"{trial + 0.25 + drift},7\n{trial + 0.5 + drift},43\n")
+
+    return {
+        "readers": {
+            "start_reader": {
+                "class": "pyramid.neutral_zone.readers.csv.CsvNumericEventReader",
+                "args": {"csv_file": start_csv.as_posix(), "result_name": "start"},
+                "extra_buffers": {
+                    "wrt": {"reader_result_name": "start"},
+                },
+                "sync": {
+                    "is_reference": True,
+                    "reader_result_name": "start",
+                    "event_value": 42
+                }
+            },
+            "drift_reader": {
+                "class": "pyramid.neutral_zone.readers.csv.CsvNumericEventReader",
+                "args": {"csv_file": drift_csv.as_posix(), "result_name": "drift", "rows_per_read": 3},
+                "sync": {
+                    "reader_result_name": "drift",
+                    "event_value": 43
+                }
+            }
+        },
+        "trials": {
+            "start_buffer": "start",
+            "start_value": 1010,
+            "wrt_buffer": "wrt",
+            "wrt_value": 42
+        }
+    }
+
+
+def test_run_without_plots_in_parallel_with_clock_drift(tmp_path):
+    experiment_config = drift_experiment_config(tmp_path, trial_count=12, drift_per_trial=0.02)
+
+    serial_file = Path(tmp_path, "serial.json").as_posix()
+    PyramidContext.from_dict(experiment_config, {}).run_without_plots(serial_file)
+    expected_trials = list(TrialFile.for_file_suffix(serial_file).read_trials())
+    assert len(expected_trials) == 12
+
+    # The drifting reader's events should be aligned to the reference clock, in each trial after the first.
+    for trial in expected_trials[1:]:
+        assert np.allclose(trial.numeric_events["drift"].get_times(), [-0.25, 0.0])
+
+    parallel_file = Path(tmp_path, "parallel.json").as_posix()
+    PyramidContext.from_dict(experiment_config, {}).run_without_plots_in_parallel(parallel_file, workers=3)
+    assert list(TrialFile.for_file_suffix(parallel_file).read_trials()) == expected_trials
+
+
+def convert_partition_then_fail(*args):
+    """Stand-in for a worker that writes its partition and then fails."""
+    convert_partition(*args)
+    raise RuntimeError("Worker failed after writing its partition.")
+
+
+def test_run_without_plots_in_parallel_cleans_up_after_errors(tmp_path, monkeypatch):
+    experiment_config = drift_experiment_config(tmp_path, trial_count=6, drift_per_trial=0.0)
+    monkeypatch.setattr("pyramid.context.convert_partition", convert_partition_then_fail)
+
+    trial_file = Path(tmp_path, "trial_file.json").as_posix()
+    context = PyramidContext.from_dict(experiment_config, {})
+    with raises(RuntimeError):
+        context.run_without_plots_in_parallel(trial_file, workers=2)
+
+    # Partition files should be cleaned up, even though the workers failed.
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["drift.csv", "start.csv"]
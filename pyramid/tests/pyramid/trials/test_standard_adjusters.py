@@ -37,6 +37,35 @@ def test_signal_smoother_in_place():
     assert np.array_equal(signal.sample_data, expected_samples)
 
 
+def test_signal_smoother_copy_on_write():
+    # Set up a trial with a read-only view of signal data, as from TrialExtractor with use_views=True.
+    raw_samples = np.zeros([100, 1])
+    raw_samples[50, 0] = 1
+    buffer_signal = SignalChunk(
+        sample_data=raw_samples,
+        sample_frequency=10,
+        first_sample_time=0.0,
+        channel_ids=["chan_a"]
+    )
+    signal = buffer_signal.view_time_range()
+    trial = Trial(start_time=0.0, end_time=10.0)
+    trial.add_buffer_data("test_signal", signal)
+
+    signal_smoother = SignalSmoother(
+        buffer_name="test_signal",
+        kernel_size=3
+    )
+
+    expected_samples = np.zeros([100, 1])
+    expected_samples[49:52, 0] = 1 / 3
+
+    # The signal smoother should modify a copy of the trial data, leaving the original alone.
+    signal_smoother.enhance(trial, trial_number=0, experiment_info={}, subject_info={})
+    assert np.array_equal(trial.signals["test_signal"].sample_data, expected_samples)
+    assert np.array_equal(buffer_signal.sample_data, raw_samples)
+    assert buffer_signal.sample_data[50, 0] == 1
+
+
 def test_signal_smoother_missing():
     # It should be a safe no-op to try smoothing a signal that's not present in the trial.
     trial = Trial(start_time=0.0, end_time=10.0)
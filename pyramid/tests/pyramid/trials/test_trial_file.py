@@ -1,11 +1,13 @@
 from pathlib import Path
+import json
 import numpy as np
+import h5py
 from pytest import raises
 
 from pyramid.model.events import NumericEventList
 from pyramid.model.signals import SignalChunk
 from pyramid.trials.trials import Trial
-from pyramid.trials.trial_file import TrialFile, JsonTrialFile, Hdf5TrialFile
+from pyramid.trials.trial_file import TrialFile, JsonTrialFile, Hdf5TrialFile, PackedHdf5TrialFile
 
 
 sample_numeric_events = {
@@ -82,6 +84,54 @@ sample_trials = [
 ]
 
 
+def assert_random_access(trial_file: TrialFile):
+    for index, sample_trial in enumerate(sample_trials):
+        assert trial_file.read_trial(index) == sample_trial
+    assert trial_file.read_trial(-1) == sample_trials[-1]
+    assert trial_file.read_trial(-2) == sample_trials[-2]
+    with raises(IndexError):
+        trial_file.read_trial(len(sample_trials))
+
+    assert list(trial_file.read_trials(1, 3)) == sample_trials[1:3]
+    assert list(trial_file.read_trials(2)) == sample_trials[2:]
+    assert list(trial_file.read_trials(stop=2)) == sample_trials[:2]
+    assert list(trial_file.read_trials(-2)) == sample_trials[-2:]
+    assert list(trial_file.read_trials(3, 1)) == []
+    assert list(trial_file.read_trials(10, 20)) == []
+
+
+def assert_selection(trial_file: TrialFile):
+    full_trial = sample_trials[4]
+
+    trial = trial_file.read_trial(4, fields=["enhancements"])
+    assert trial.start_time == full_trial.start_time
+    assert trial.end_time == full_trial.end_time
+    assert trial.wrt_time == full_trial.wrt_time
+    assert trial.numeric_events == {}
+    assert trial.signals == {}
+    assert trial.enhancements == full_trial.enhancements
+    assert trial.enhancement_categories == {}
+
+    trial = trial_file.read_trial(4, buffers=["simple"], enhancements=["int", "dict"])
+    assert trial.numeric_events == {"simple": full_trial.numeric_events["simple"]}
+    assert trial.signals == {"simple": full_trial.signals["simple"]}
+    assert trial.enhancements == {"int": 42, "dict": {"a": 1, "b": 2}}
+    assert trial.enhancement_categories == full_trial.enhancement_categories
+
+    trials = list(trial_file.read_trials(fields=["signals"], buffers=["complex", "missing"]))
+    assert len(trials) == len(sample_trials)
+    for trial, sample_trial in zip(trials, sample_trials):
+        assert trial.numeric_events == {}
+        if "complex" in sample_trial.signals:
+            assert trial.signals == {"complex": sample_trial.signals["complex"]}
+        else:
+            assert trial.signals == {}
+        assert trial.enhancements == {}
+
+    with raises(ValueError):
+        trial_file.read_trial(0, fields=["not_a_field"])
+
+
 def test_for_file_suffix():
     assert isinstance(TrialFile.for_file_suffix("trial_file.json"), JsonTrialFile)
     assert isinstance(TrialFile.for_file_suffix("trial_file.jsonl"), JsonTrialFile)
@@ -89,6 +139,18 @@ def test_for_file_suffix():
     assert isinstance(TrialFile.for_file_suffix("trial_file.h5"), Hdf5TrialFile)
     assert isinstance(TrialFile.for_file_suffix("trial_file.hdf5"), Hdf5TrialFile)
     assert isinstance(TrialFile.for_file_suffix("trial_file.he5"), Hdf5TrialFile)
+    assert isinstance(TrialFile.for_file_suffix("trial_file.packed.hdf5"), PackedHdf5TrialFile)
+    assert isinstance(TrialFile.for_file_suffix("trial_file.packed.h5"), PackedHdf5TrialFile)
+    assert isinstance(TrialFile.for_file_suffix("trial_file.part0.hdf5"), Hdf5TrialFile)
+
+    assert isinstance(TrialFile.for_file_suffix("trial_file.txt", format="json"), JsonTrialFile)
+    assert isinstance(TrialFile.for_file_suffix("trial_file.txt", format="hdf5"), Hdf5TrialFile)
+    assert isinstance(TrialFile.for_file_suffix("trial_file.hdf5", format="packed_hdf5"), PackedHdf5TrialFile)
+    assert TrialFile.for_file_suffix("trial_file.json", format="json_base64").array_encoding == "base64"
+
+    with raises(NotImplementedError) as exception_info:
+        TrialFile.for_file_suffix("trial_file.json", format="noway")
+    assert "Unsupported trial file format: noway" in exception_info.value.args
 
     with raises(NotImplementedError) as exception_info:
         TrialFile.for_file_suffix("trial_file.noway")
@@ -134,6 +196,108 @@ def test_json_interleave_write_and_read(tmp_path):
             assert trials[-1] == sample_trial
 
 
+def test_json_base64_sample_trials(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.json')
+    with JsonTrialFile(file_path, array_encoding="base64") as trial_file:
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+
+        trials = [trial for trial in trial_file.read_trials()]
+
+    assert trials == sample_trials
+
+    # Arrays keep their dtype and shape, and can be modified in place after reading.
+    signal_data = trials[2].signals["simple"].sample_data
+    assert signal_data.dtype == sample_signals["simple"].sample_data.dtype
+    assert trials[1].numeric_events["empty"].event_data.shape == (0, 2)
+    signal_data += 1
+
+    with open(file_path) as f:
+        raw_trial = json.loads(f.readlines()[4])
+    assert raw_trial["array_encoding"] == "base64"
+    assert raw_trial["numeric_events"]["simple"]["dtype"] == "<f8"
+    assert raw_trial["numeric_events"]["simple"]["shape"] == [3, 2]
+
+
+def test_json_mixed_array_encodings(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.json')
+    with JsonTrialFile(file_path) as trial_file:
+        for sample_trial in sample_trials[:3]:
+            trial_file.append_trial(sample_trial)
+
+    # Append more trials to the same file, with the other encoding.
+    base64_trial_file = JsonTrialFile(file_path, array_encoding="base64")
+    for sample_trial in sample_trials[3:]:
+        base64_trial_file.append_trial(sample_trial)
+
+    with open(file_path) as f:
+        raw_trials = [json.loads(line) for line in f]
+    assert [raw_trial.get("array_encoding", "text") for raw_trial in raw_trials] == ["text"] * 3 + ["base64"] * 2
+
+    # Readers with either encoding can read lines written either way.
+    assert list(JsonTrialFile(file_path).read_trials()) == sample_trials
+    assert list(base64_trial_file.read_trials()) == sample_trials
+    assert base64_trial_file.read_trial(4) == sample_trials[4]
+
+    with raises(ValueError):
+        JsonTrialFile(file_path, array_encoding="noway")
+
+
+def test_json_random_access(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.json')
+    with JsonTrialFile(file_path, write_index=True) as trial_file:
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+        assert_random_access(trial_file)
+
+    # The index was written next to the trial file, during append_trial().
+    line_ends = np.fromfile(f"{file_path}.index", dtype="<i8")
+    assert line_ends.size == len(sample_trials)
+    assert line_ends[-1] == file_path.stat().st_size
+
+    # A new instance can use the same index.
+    assert_random_access(JsonTrialFile(file_path))
+
+
+def test_json_selection(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.json')
+    with JsonTrialFile(file_path) as trial_file:
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+        assert_selection(trial_file)
+
+    assert_selection(JsonTrialFile(file_path))
+
+def test_json_lazy_index(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.json')
+    index_path = Path(f"{file_path}.index")
+    with JsonTrialFile(file_path) as trial_file:
+        for sample_trial in sample_trials[:3]:
+            trial_file.append_trial(sample_trial)
+        assert not index_path.exists()
+
+        # The first indexed read builds the index and caches it next to the trial file.
+        assert trial_file.read_trial(2) == sample_trials[2]
+        assert index_path.exists()
+        assert np.fromfile(index_path, dtype="<i8").size == 3
+
+        # Later reads extend the index to cover new trials.
+        for sample_trial in sample_trials[3:]:
+            trial_file.append_trial(sample_trial)
+        assert_random_access(trial_file)
+        assert np.fromfile(index_path, dtype="<i8").size == len(sample_trials)
+
+    # A stale index that doesn't agree with the trial file gets rebuilt.
+    np.array([1, 2, 3], dtype="<i8").tofile(index_path)
+    assert_random_access(JsonTrialFile(file_path))
+    assert np.fromfile(index_path, dtype="<i8").size == len(sample_trials)
+
+    # Deleting the trial file also deletes the index.
+    JsonTrialFile(file_path).delete()
+    assert not file_path.exists()
+    assert not index_path.exists()
+
+
 def test_hdf5_empty_trial_file(tmp_path):
     file_path = Path(tmp_path, 'trial_file.hdf5')
     assert not file_path.exists()
@@ -170,3 +334,239 @@ def test_hdf5_interleave_write_and_read(tmp_path):
             trials = [trial for trial in trial_file.read_trials()]
             assert trials[0] == sample_trials[0]
             assert trials[-1] == sample_trial
+
+
+def test_hdf5_random_access(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.hdf5')
+    with Hdf5TrialFile(file_path) as trial_file:
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+        assert_random_access(trial_file)
+
+    assert_random_access(Hdf5TrialFile(file_path))
+
+
+def test_hdf5_selection(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.hdf5')
+    with Hdf5TrialFile(file_path) as trial_file:
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+        assert_selection(trial_file)
+
+    assert_selection(Hdf5TrialFile(file_path))
+
+def test_hdf5_reopen_per_trial(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.hdf5')
+    with Hdf5TrialFile(file_path) as trial_file:
+        assert trial_file.h5_file is None
+        for index, sample_trial in enumerate(sample_trials):
+            trial_file.append_trial(sample_trial)
+            trials = [trial for trial in trial_file.read_trials()]
+            assert trials[-1] == sample_trial
+
+            # Other readers should be able to open the file between appends.
+            with h5py.File(file_path, "r") as f:
+                assert len(f) == index + 1
+
+    assert [trial for trial in Hdf5TrialFile(file_path).read_trials()] == sample_trials
+
+
+def test_hdf5_hold_open_and_flush(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.hdf5')
+    with Hdf5TrialFile(file_path, hold_open=True, flush_interval=1000, flush_trial_count=2) as trial_file:
+        assert trial_file.h5_file is not None
+
+        # Trials should be counted in memory and flushed every flush_trial_count trials.
+        trial_file.append_trial(sample_trials[0])
+        assert trial_file.trial_count == 1
+        assert trial_file.unflushed_count == 1
+        trial_file.append_trial(sample_trials[1])
+        assert trial_file.trial_count == 2
+        assert trial_file.unflushed_count == 0
+        trial_file.append_trial(sample_trials[2])
+        assert trial_file.trial_count == 3
+        assert trial_file.unflushed_count == 1
+
+    # The file should be closed on exit, and complete.
+    assert trial_file.h5_file is None
+    trials = [trial for trial in Hdf5TrialFile(file_path).read_trials()]
+    assert trials == sample_trials[0:3]
+
+
+def test_hdf5_hold_open_flush_interval(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.hdf5')
+    with Hdf5TrialFile(file_path, hold_open=True, flush_interval=0, flush_trial_count=1000) as trial_file:
+        # With a zero interval, every trial should be flushed right away.
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+            assert trial_file.unflushed_count == 0
+
+
+def test_packed_hdf5_empty_trial_file(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    assert not file_path.exists()
+
+    with PackedHdf5TrialFile(file_path) as trial_file:
+        assert file_path.exists()
+        trials = [trial for trial in trial_file.read_trials()]
+
+    assert len(trials) == 0
+
+
+def test_packed_hdf5_sample_trials(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    assert not file_path.exists()
+
+    with PackedHdf5TrialFile(file_path) as trial_file:
+        assert file_path.exists()
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+
+        trials = [trial for trial in trial_file.read_trials()]
+
+    assert trials == sample_trials
+
+    # Trials should also be readable after closing.
+    trials = [trial for trial in PackedHdf5TrialFile(file_path).read_trials()]
+    assert trials == sample_trials
+
+
+def test_packed_hdf5_interleave_write_and_read(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    assert not file_path.exists()
+
+    with PackedHdf5TrialFile(file_path) as trial_file:
+        assert file_path.exists()
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+            trials = [trial for trial in trial_file.read_trials()]
+            assert trials[0] == sample_trials[0]
+            assert trials[-1] == sample_trial
+
+
+def test_packed_hdf5_random_access(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    with PackedHdf5TrialFile(file_path) as trial_file:
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+        assert_random_access(trial_file)
+
+    packed_trials = list(PackedHdf5TrialFile(file_path).read_trials())
+    assert list(PackedHdf5TrialFile(file_path).read_trials(1, 3)) == packed_trials[1:3]
+    assert PackedHdf5TrialFile(file_path).read_trial(-1) == packed_trials[-1]
+
+
+def test_packed_hdf5_selection(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    with PackedHdf5TrialFile(file_path) as trial_file:
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+        assert_selection(trial_file)
+
+    assert_selection(PackedHdf5TrialFile(file_path))
+
+def test_packed_hdf5_layout(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    with PackedHdf5TrialFile(file_path, flush_trial_count=2) as trial_file:
+        for sample_trial in sample_trials:
+            trial_file.append_trial(sample_trial)
+
+    with h5py.File(file_path, "r") as f:
+        assert f.attrs["format"] == "packed"
+        assert np.array_equal(f["trials/start_time"][()], [0.0, 1.0, 2.0, 3.0, 4.0])
+        assert np.array_equal(f["trials/end_time"][()], [1.0, 2.0, 3.0, 4.0, np.nan], equal_nan=True)
+
+        # Each buffer is one concatenated dataset, with per-trial offsets and counts (-1 when absent).
+        complex_events = f["numeric_events/complex"]
+        assert complex_events["data"].shape == (6, 3)
+        assert np.array_equal(complex_events["offsets"][()], [0, 0, 3, 3, 3])
+        assert np.array_equal(complex_events["counts"][()], [-1, 3, -1, -1, 3])
+
+        complex_signal = f["signals/complex"]
+        assert complex_signal["data"].shape == (12, 3)
+        assert np.array_equal(complex_signal["counts"][()], [-1, -1, 6, -1, 6])
+        assert complex_signal.attrs["channel_ids"].tolist() == ["a", "b", "c"]
+
+        # Enhancements are typed columns, with a separate column for presence.
+        assert f["enhancements/int/values"].dtype == np.int64
+        assert np.array_equal(f["enhancements/int/values"][()], [0, 0, 0, 42, 42])
+        assert np.array_equal(f["enhancements/int/present"][()], [False, False, False, True, True])
+        assert f["enhancements/float/values"].dtype == np.float64
+        assert f["enhancements/string/values"].asstr()[()].tolist() == ["", "", "", '"I\'m a string."', '"I\'m a string."']
+        assert np.array_equal(f["enhancements/string/present"][()], [False, False, False, True, True])
+
+
+def test_packed_hdf5_enhancement_column_changes_type(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    varying_trials = [
+        Trial(start_time=0.0, end_time=1.0, enhancements={"varying": 1}),
+        Trial(start_time=1.0, end_time=2.0),
+        Trial(start_time=2.0, end_time=3.0, enhancements={"varying": None}),
+        Trial(start_time=3.0, end_time=4.0, enhancements={"varying": "three"}),
+    ]
+    with PackedHdf5TrialFile(file_path, flush_trial_count=1) as trial_file:
+        for trial in varying_trials:
+            trial_file.append_trial(trial)
+
+    trials = [trial for trial in PackedHdf5TrialFile(file_path).read_trials()]
+    assert trials == varying_trials
+
+
+def test_packed_hdf5_enhancement_types_round_trip(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    typed_trials = [
+        Trial(start_time=0.0, end_time=1.0, enhancements={"int": 1, "float": np.nan, "widening": 1}),
+        Trial(start_time=1.0, end_time=2.0),
+        Trial(start_time=2.0, end_time=3.0, enhancements={"int": 2**40, "float": 2.5, "widening": 2.5}),
+    ]
+    with PackedHdf5TrialFile(file_path, flush_trial_count=1) as trial_file:
+        for trial in typed_trials:
+            trial_file.append_trial(trial)
+
+    trials = [trial for trial in PackedHdf5TrialFile(file_path).read_trials()]
+
+    # Ints should come back as ints.
+    assert trials[0].enhancements["int"] == 1
+    assert isinstance(trials[0].enhancements["int"], int)
+    assert trials[2].enhancements["int"] == 2**40
+    assert isinstance(trials[2].enhancements["int"], int)
+
+    # NaN values should come back as NaN, distinct from absent enhancements.
+    assert np.isnan(trials[0].enhancements["float"])
+    assert "float" not in trials[1].enhancements
+    assert trials[2].enhancements["float"] == 2.5
+
+    # A column can widen from int to float in a later batch.
+    assert trials[0].enhancements["widening"] == 1.0
+    assert isinstance(trials[0].enhancements["widening"], float)
+    assert trials[2].enhancements["widening"] == 2.5
+    assert trials[1].enhancements == {}
+
+
+def test_packed_hdf5_many_trials_in_batches(tmp_path):
+    file_path = Path(tmp_path, 'trial_file.packed.hdf5')
+    many_trials = []
+    for index in range(250):
+        numeric_events = {}
+        if index % 3:
+            numeric_events["spikes"] = NumericEventList(np.array([[index + 0.1 * n, n] for n in range(index % 7)]))
+        many_trials.append(
+            Trial(
+                start_time=float(index),
+                end_time=float(index + 1),
+                wrt_time=index + 0.5,
+                numeric_events=numeric_events,
+                enhancements={"index": index}
+            )
+        )
+
+    with PackedHdf5TrialFile(file_path, flush_trial_count=30) as trial_file:
+        for trial in many_trials:
+            trial_file.append_trial(trial)
+
+    trials = [trial for trial in PackedHdf5TrialFile(file_path).read_trials()]
+    assert trials == many_trials
+
+    # Ranges of trials that start and end in the middle of the file, across read batches.
+    assert list(PackedHdf5TrialFile(file_path).read_trials(95, 205)) == many_trials[95:205]
+    assert PackedHdf5TrialFile(file_path).read_trial(101) == many_trials[101]
@@ -280,6 +280,67 @@ def test_populate_trials_from_private_buffers():
     )
 
 
+def test_populate_trials_with_views():
+    # Append data to buffers so that trial views will point into backing arrays with spare capacity.
+    events_buffer = Buffer(NumericEventList(np.empty([0, 2])))
+    events_buffer.data.append(NumericEventList(np.array([[0.1, 0], [1.1, 1], [1.2, 2], [2.1, 3]])))
+    signal_buffer = Buffer(SignalChunk(np.empty([0, 1]), 10, None, ["a"]))
+    signal_buffer.data.append(SignalChunk(np.arange(30).reshape([-1, 1]), 10, 0.0, ["a"]))
+    wrt_buffer = Buffer(NumericEventList(np.array([[1.5, 42]])))
+    extractor = TrialExtractor(
+        wrt_buffer,
+        wrt_value=42,
+        named_buffers={
+            "events": events_buffer,
+            "signal": signal_buffer
+        },
+        use_views=True
+    )
+
+    trial = Trial(start_time=1.0, end_time=2.0)
+    extractor.populate_trial(trial, 1, {}, {})
+    expected_trial = Trial(
+        start_time=1.0,
+        end_time=2.0,
+        wrt_time=1.5,
+        numeric_events={
+            "events": NumericEventList(np.array([[1.1 - 1.5, 1], [1.2 - 1.5, 2]]))
+        },
+        signals={
+            "signal": SignalChunk(np.arange(10, 20).reshape([-1, 1]), 10, 1.0 - 1.5, ["a"])
+        }
+    )
+    assert trial == expected_trial
+
+    # The trial signal should be a read-only view of the buffer, with times shifted without copying.
+    trial_signal = trial.signals["signal"]
+    assert np.shares_memory(trial_signal.sample_data, signal_buffer.data.sample_data)
+    assert not trial_signal.sample_data.flags.writeable
+
+    # The trial events should be a read-only view of the buffer, too, with times shifted lazily.
+    trial_events = trial.numeric_events["events"]
+    assert np.shares_memory(trial_events.event_data, events_buffer.data.event_data)
+    assert not trial_events.event_data.flags.writeable
+    assert trial_events.time_offset == -1.5
+    assert np.allclose(trial_events.get_times(), [1.1 - 1.5, 1.2 - 1.5])
+    assert events_buffer.data.views_lent
+    assert signal_buffer.data.views_lent
+
+    # Buffers moving on should leave trial data alone, until they discard the trial's rows.
+    for t in range(100):
+        events_buffer.data.discard_before(1.0)
+        events_buffer.data.append(NumericEventList(np.array([[t + 3, 0]])))
+        signal_buffer.data.discard_before(1.0)
+        signal_buffer.data.append(SignalChunk(np.array([[t + 30]]), 10, 3.0 + t / 10, ["a"]))
+    assert trial == expected_trial
+
+    # Modifying trial data should copy-on-write and leave the original view alone.
+    original_view = trial_signal.sample_data
+    trial_signal.apply_offset_then_gain(offset=100)
+    assert np.array_equal(trial_signal.get_channel_values("a"), np.arange(110, 120))
+    assert np.array_equal(original_view, np.arange(10, 20).reshape([-1, 1]))
+
+
 def test_populate_trials_from_shared_buffers():
     # Expect trials starting at times 0, 1, 2, and 3.
     # Mix in the wrt times half way through trials 1, 2, and 3.